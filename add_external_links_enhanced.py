@@ -5,8 +5,9 @@ Links to: DBpedia, Wikidata, Schema.org
 """
 
 import os
-from rdflib import Graph, Namespace, Literal, URIRef
+from rdflib import Graph
 from rdflib.namespace import RDF, RDFS, OWL
+from rdf_terms import TERMS
 
 def add_external_links_enhanced(input_file, output_file):
     """Add owl:sameAs links to external LOD sources"""
@@ -15,11 +16,11 @@ def add_external_links_enhanced(input_file, output_file):
     g.parse(input_file, format="turtle")
     
     # Define namespaces
-    CRICKET = Namespace("http://example.org/cricket/ontology#")
-    PLAYER = Namespace("http://example.org/cricket/resource/player/")
-    TEAM = Namespace("http://example.org/cricket/resource/team/")
-    DBPEDIA = Namespace("http://dbpedia.org/resource/")
-    WIKIDATA = Namespace("http://www.wikidata.org/entity/")
+    CRICKET = TERMS.namespace("http://example.org/cricket/ontology#")
+    PLAYER = TERMS.namespace("http://example.org/cricket/resource/player/")
+    TEAM = TERMS.namespace("http://example.org/cricket/resource/team/")
+    DBPEDIA = TERMS.namespace("http://dbpedia.org/resource/")
+    WIKIDATA = TERMS.namespace("http://www.wikidata.org/entity/")
     
     g.bind("dbpedia", DBPEDIA)
     g.bind("wikidata", WIKIDATA)
@@ -55,13 +56,13 @@ def add_external_links_enhanced(input_file, output_file):
     
     # Add team links
     for team_name, links in team_mappings.items():
-        team_uri = TEAM[team_name]
+        team_uri = TERMS.resource(TEAM, team_name)
         
         if links.get("dbpedia"):
-            g.add((team_uri, OWL.sameAs, DBPEDIA[links["dbpedia"]]))
+            g.add((team_uri, OWL.sameAs, TERMS.uri(DBPEDIA, links["dbpedia"])))
         
         if links.get("wikidata"):
-            g.add((team_uri, OWL.sameAs, WIKIDATA[links["wikidata"]]))
+            g.add((team_uri, OWL.sameAs, TERMS.uri(WIKIDATA, links["wikidata"])))
     
     # Map famous players to DBpedia/Wikidata
     player_mappings = {
@@ -105,18 +106,18 @@ def add_external_links_enhanced(input_file, output_file):
     
     # Add player links
     for player_name, links in player_mappings.items():
-        player_uri = PLAYER[player_name]
+        player_uri = TERMS.resource(PLAYER, player_name)
         
         if links.get("dbpedia"):
-            g.add((player_uri, OWL.sameAs, DBPEDIA[links["dbpedia"]]))
+            g.add((player_uri, OWL.sameAs, TERMS.uri(DBPEDIA, links["dbpedia"])))
         
         if links.get("wikidata"):
-            g.add((player_uri, OWL.sameAs, WIKIDATA[links["wikidata"]]))
+            g.add((player_uri, OWL.sameAs, TERMS.uri(WIKIDATA, links["wikidata"])))
     
     # Add general cricket concept links
-    cricket_uri = URIRef("http://example.org/cricket/ontology#Cricket")
+    cricket_uri = CRICKET.Cricket
     g.add((cricket_uri, RDF.type, OWL.Class))
-    g.add((cricket_uri, RDFS.label, Literal("Cricket")))
+    g.add((cricket_uri, RDFS.label, TERMS.literal("Cricket")))
     g.add((cricket_uri, OWL.sameAs, DBPEDIA.Cricket))
     g.add((cricket_uri, OWL.sameAs, WIKIDATA.Q5375))
     
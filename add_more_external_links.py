@@ -4,8 +4,9 @@ Expands the list of players linked to DBpedia/Wikidata
 """
 
 import os
-from rdflib import Graph, Namespace, Literal, URIRef
-from rdflib.namespace import RDF, RDFS, OWL
+from rdflib import Graph
+from rdflib.namespace import OWL
+from rdf_terms import TERMS
 
 def add_extended_external_links(input_file, output_file):
     """Add owl:sameAs links for more players"""
@@ -14,11 +15,10 @@ def add_extended_external_links(input_file, output_file):
     g.parse(input_file, format="turtle")
     
     # Define namespaces
-    CRICKET = Namespace("http://example.org/cricket/ontology#")
-    PLAYER = Namespace("http://example.org/cricket/resource/player/")
-    TEAM = Namespace("http://example.org/cricket/resource/team/")
-    DBPEDIA = Namespace("http://dbpedia.org/resource/")
-    WIKIDATA = Namespace("http://www.wikidata.org/entity/")
+    PLAYER = TERMS.namespace("http://example.org/cricket/resource/player/")
+    TEAM = TERMS.namespace("http://example.org/cricket/resource/team/")
+    DBPEDIA = TERMS.namespace("http://dbpedia.org/resource/")
+    WIKIDATA = TERMS.namespace("http://www.wikidata.org/entity/")
     
     g.bind("dbpedia", DBPEDIA)
     g.bind("wikidata", WIKIDATA)
@@ -188,16 +188,16 @@ def add_extended_external_links(input_file, output_file):
     # Add player links
     added_count = 0
     for player_name, links in player_mappings.items():
-        player_uri = PLAYER[player_name]
+        player_uri = TERMS.resource(PLAYER, player_name)
         
         # Check if player exists in graph
         if (player_uri, None, None) in g:
             if links.get("dbpedia"):
-                g.add((player_uri, OWL.sameAs, DBPEDIA[links["dbpedia"]]))
+                g.add((player_uri, OWL.sameAs, TERMS.uri(DBPEDIA, links["dbpedia"])))
                 added_count += 1
             
             if links.get("wikidata"):
-                g.add((player_uri, OWL.sameAs, WIKIDATA[links["wikidata"]]))
+                g.add((player_uri, OWL.sameAs, TERMS.uri(WIKIDATA, links["wikidata"])))
                 added_count += 1
     
     # Team mappings (all 6 PSL teams)
@@ -230,13 +230,13 @@ def add_extended_external_links(input_file, output_file):
     
     # Add team links
     for team_name, links in team_mappings.items():
-        team_uri = TEAM[team_name]
+        team_uri = TERMS.resource(TEAM, team_name)
         
         if links.get("dbpedia"):
-            g.add((team_uri, OWL.sameAs, DBPEDIA[links["dbpedia"]]))
+            g.add((team_uri, OWL.sameAs, TERMS.uri(DBPEDIA, links["dbpedia"])))
         
         if links.get("wikidata"):
-            g.add((team_uri, OWL.sameAs, WIKIDATA[links["wikidata"]]))
+            g.add((team_uri, OWL.sameAs, TERMS.uri(WIKIDATA, links["wikidata"])))
     
     # Save enhanced dataset
     g.serialize(destination=output_file, format="turtle")
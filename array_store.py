@@ -0,0 +1,295 @@
+"""
+Dictionary-encoded, array-backed triple store
+An rdflib Store that maps every term to an integer ID and keeps triples in
+sorted SPO/POS/OSP uint32 arrays searched by binary search.
+
+Usage:
+    g = Graph(store=ArrayStore())     # or Graph(store="CricketArray")
+"""
+
+import numpy as np
+from rdflib import plugin
+from rdflib.store import Store
+
+def _coalesce(*values, default=None):
+    for value in values:
+        if value is not None:
+            return value
+    return default
+
+# Index name -> positions of (s, p, o) in its sort order
+_ORDERS = {
+    'spo': (0, 1, 2),
+    'pos': (1, 2, 0),
+    'osp': (2, 0, 1),
+}
+
+# Which index and key order answer each bound/unbound pattern shape
+_PATTERN_INDEX = {
+    (True, True, True): ('spo', (0, 1, 2)),
+    (True, True, False): ('spo', (0, 1)),
+    (True, False, True): ('osp', (2, 0)),
+    (True, False, False): ('spo', (0,)),
+    (False, True, True): ('pos', (1, 2)),
+    (False, True, False): ('pos', (1,)),
+    (False, False, True): ('osp', (2,)),
+    (False, False, False): ('spo', ()),
+}
+
+_EMPTY = np.empty(0, dtype=np.uint32)
+
+class ArrayStore(Store):
+    """Triple store backed by sorted integer arrays
+
+    Terms are dictionary-encoded to uint32 IDs. Each index (SPO, POS, OSP)
+    is three contiguous columns sorted lexicographically, so any triple
+    pattern is answered by at most three binary searches. Writes go to a
+    small pending set (and removals to a tombstone set) that is merged into
+    the arrays in bulk, which keeps parsing and bulk loads fast. Not
+    context-aware.
+    """
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    # Merge pending writes once they exceed this many triples (or 1/4 of the store)
+    COMPACT_THRESHOLD = 4096
+
+    def __init__(self, configuration=None, identifier=None):
+        super().__init__(configuration)
+        self.identifier = identifier
+        self._ids = {}
+        self._terms = []
+        self._indexes = {name: (_EMPTY, _EMPTY, _EMPTY) for name in _ORDERS}
+        self._pending = set()
+        self._deleted = set()
+        self._merge_at = self.COMPACT_THRESHOLD
+        self._namespace = {}
+        self._prefix = {}
+
+    # -- Term dictionary ---------------------------------------------------
+
+    def _intern(self, term):
+        term_id = self._ids.get(term)
+        if term_id is None:
+            term_id = self._ids[term] = len(self._terms)
+            self._terms.append(term)
+        return term_id
+
+    def load_ids(self, terms, triple_ids):
+        """Bulk-load an encoded graph: a term list and a flat (s, p, o) ID array
+
+        Used by graph snapshots, which already store dictionary-encoded
+        triples, to skip per-triple hashing entirely.
+        """
+        remap = np.fromiter((self._intern(term) for term in terms), dtype=np.uint32, count=len(terms))
+        self._merge(remap[np.asarray(triple_ids, dtype=np.uint32).reshape(-1, 3)])
+
+    # -- Index maintenance -------------------------------------------------
+
+    def _spo_rows(self):
+        s, p, o = self._indexes['spo']
+        return np.column_stack((s, p, o)) if len(s) else np.empty((0, 3), dtype=np.uint32)
+
+    def _merge(self, extra=None):
+        """Fold pending adds, tombstones and `extra` rows into the sorted indexes"""
+        rows = [self._spo_rows()]
+        if self._pending:
+            rows.append(np.array(list(self._pending), dtype=np.uint32).reshape(-1, 3))
+        if extra is not None and len(extra):
+            rows.append(extra)
+        rows = np.concatenate(rows) if len(rows) > 1 else rows[0]
+
+        if self._deleted:
+            deleted = np.array(list(self._deleted), dtype=np.uint32).reshape(-1, 3)
+            row_type = np.dtype((np.void, rows.itemsize * 3))
+            keys = np.ascontiguousarray(rows).view(row_type).ravel()
+            rows = rows[~np.isin(keys, deleted.view(row_type).ravel())]
+
+        for name, order in _ORDERS.items():
+            a, b, c = rows[:, order[0]], rows[:, order[1]], rows[:, order[2]]
+            perm = np.lexsort((c, b, a))
+            a, b, c = a[perm], b[perm], c[perm]
+            if name == 'spo' and len(a) > 1:
+                keep = np.ones(len(a), dtype=bool)
+                keep[1:] = (a[1:] != a[:-1]) | (b[1:] != b[:-1]) | (c[1:] != c[:-1])
+                a, b, c = a[keep], b[keep], c[keep]
+                rows = np.column_stack((a, b, c))
+            self._indexes[name] = (np.ascontiguousarray(a), np.ascontiguousarray(b),
+                                   np.ascontiguousarray(c))
+
+        self._pending.clear()
+        self._deleted.clear()
+        self._merge_at = max(self.COMPACT_THRESHOLD, len(self._indexes['spo'][0]) // 4)
+
+    def _range(self, name, key):
+        """Row range [lo, hi) of an index whose leading columns equal `key`"""
+        columns = self._indexes[name]
+        lo, hi = 0, len(columns[0])
+        for column, value in zip(columns, key):
+            if lo >= hi:
+                break
+            # A plain int would make searchsorted cast the whole segment
+            value = np.uint32(value)
+            segment = column[lo:hi]
+            lo, hi = (lo + int(np.searchsorted(segment, value, 'left')),
+                      lo + int(np.searchsorted(segment, value, 'right')))
+        return lo, hi
+
+    def _in_arrays(self, ids):
+        lo, hi = self._range('spo', ids)
+        return lo < hi
+
+    # -- Store API ---------------------------------------------------------
+
+    def add(self, triple, context, quoted=False):
+        Store.add(self, triple, context, quoted)
+        # Pending rows may duplicate rows already in the arrays; _merge() dedupes
+        ids = tuple(self._intern(term) for term in triple)
+        if ids in self._deleted:
+            self._deleted.discard(ids)
+        else:
+            self._pending.add(ids)
+            if len(self._pending) > self._merge_at:
+                self._merge()
+
+    def addN(self, quads):
+        for s, p, o, c in quads:
+            self.add((s, p, o), c)
+
+    def remove(self, triple_pattern, context=None):
+        for (s, p, o), _ in list(self.triples(triple_pattern)):
+            ids = (self._ids[s], self._ids[p], self._ids[o])
+            Store.remove(self, (s, p, o), context)
+            self._pending.discard(ids)
+            if self._in_arrays(ids):
+                self._deleted.add(ids)
+        if len(self._deleted) > self._merge_at:
+            self._merge()
+
+    def _pattern_ids(self, triple_pattern):
+        """Term IDs for a pattern (None = unbound), or False if a term is unknown"""
+        ids = []
+        for term in triple_pattern:
+            if term is None:
+                ids.append(None)
+            else:
+                term_id = self._ids.get(term)
+                if term_id is None:
+                    return False
+                ids.append(term_id)
+        return ids
+
+    def _match_ids(self, ids):
+        """Yield (s, p, o) ID tuples matching a pattern of IDs"""
+        if len(self._pending) > 256:
+            self._merge()
+
+        name, key_positions = _PATTERN_INDEX[tuple(i is not None for i in ids)]
+        lo, hi = self._range(name, [ids[pos] for pos in key_positions])
+        if lo < hi:
+            columns = self._indexes[name]
+            order = _ORDERS[name]
+            a, b, c = (column[lo:hi].tolist() for column in columns)
+            deleted = self._deleted
+            for row in zip(a, b, c):
+                triple = [0, 0, 0]
+                triple[order[0]], triple[order[1]], triple[order[2]] = row
+                triple = tuple(triple)
+                if not deleted or triple not in deleted:
+                    yield triple
+
+        for triple in list(self._pending):
+            if all(i is None or i == t for i, t in zip(ids, triple)) and not self._in_arrays(triple):
+                yield triple
+
+    def triples(self, triple_pattern, context=None):
+        ids = self._pattern_ids(triple_pattern)
+        if ids is False:
+            return
+        terms = self._terms
+        for s, p, o in self._match_ids(ids):
+            yield (terms[s], terms[p], terms[o]), iter(())
+
+    def estimate(self, triple_pattern):
+        """Upper bound on the matches of a pattern, from index ranges (no scan)"""
+        ids = self._pattern_ids(triple_pattern)
+        if ids is False:
+            return 0
+        name, key_positions = _PATTERN_INDEX[tuple(i is not None for i in ids)]
+        lo, hi = self._range(name, [ids[pos] for pos in key_positions])
+        return hi - lo + len(self._pending)
+
+    def _merged_range(self, triple_pattern):
+        """(index name, lo, hi) of a pattern's rows with pending writes merged, None if a term is unknown"""
+        ids = self._pattern_ids(triple_pattern)
+        if ids is False:
+            return None
+        if self._pending or self._deleted:
+            self._merge()
+        name, key_positions = _PATTERN_INDEX[tuple(i is not None for i in ids)]
+        lo, hi = self._range(name, [ids[pos] for pos in key_positions])
+        return name, lo, hi
+
+    def count(self, triple_pattern):
+        """Exact number of matches of a pattern, from index ranges (no scan)"""
+        found = self._merged_range(triple_pattern)
+        return 0 if found is None else found[2] - found[1]
+
+    def triples_slice(self, triple_pattern, start, stop):
+        """Matches [start, stop) of a pattern, in triples() order, without walking earlier ones"""
+        found = self._merged_range(triple_pattern)
+        if found is None:
+            return []
+        name, lo, hi = found
+        lo, hi = min(lo + start, hi), min(lo + stop, hi)
+        order = _ORDERS[name]
+        terms = self._terms
+        result = []
+        for row in zip(*(column[lo:hi].tolist() for column in self._indexes[name])):
+            triple = [0, 0, 0]
+            triple[order[0]], triple[order[1]], triple[order[2]] = row
+            result.append((terms[triple[0]], terms[triple[1]], terms[triple[2]]))
+        return result
+
+    def __len__(self, context=None):
+        if self._pending:
+            self._merge()
+        return len(self._indexes['spo'][0]) - len(self._deleted) + len(self._pending)
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def memory_usage(self):
+        """Bytes held by the triple index arrays (terms excluded)"""
+        return sum(column.nbytes for columns in self._indexes.values() for column in columns)
+
+    # -- Namespace bindings (same semantics as rdflib's Memory store) ------
+
+    def bind(self, prefix, namespace, override=True):
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = _coalesce(self._prefix.get(namespace), self._prefix.get(bound_namespace))
+        if override:
+            if bound_prefix is not None:
+                del self._namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self._prefix[bound_namespace]
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+        else:
+            self._prefix[_coalesce(bound_namespace, namespace)] = _coalesce(bound_prefix, default=prefix)
+            self._namespace[_coalesce(bound_prefix, prefix)] = _coalesce(bound_namespace, default=namespace)
+
+    def namespace(self, prefix):
+        return self._namespace.get(prefix, None)
+
+    def prefix(self, namespace):
+        return self._prefix.get(namespace, None)
+
+    def namespaces(self):
+        for prefix, namespace in self._namespace.items():
+            yield prefix, namespace
+
+plugin.register("CricketArray", Store, "array_store", "ArrayStore")
@@ -0,0 +1,207 @@
+"""
+ASGI front for the Flask apps
+AsyncApp runs the unchanged Flask (WSGI) app in a bounded thread pool and
+streams its responses to the client. Responses that carry an ETag (the
+conditional responses from http_cache) are deterministic for a graph
+version and request, so small ones are kept in an LRU and answered again
+straight from the event loop, without taking a pool thread.
+
+Usage:
+    asgi_app = AsyncApp(app, version=lambda: HOLDER.current().version)
+    uvicorn cricket_stats_professional_app:asgi_app
+"""
+
+import asyncio
+import io
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Request headers that can select a representation or a 304; Host because
+# fragment and link URLs are absolute
+KEY_HEADERS = (b"host", b"accept", b"accept-encoding", b"if-none-match", b"if-modified-since")
+
+# Chunks buffered between a pool thread and the event loop per response
+QUEUE_CHUNKS = 16
+
+_END = object()
+
+def wsgi_environ(scope, body):
+    """WSGI environ for an ASGI HTTP scope and its request body"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE' or name == 'CONTENT_LENGTH':
+            key = name
+        else:
+            key = 'HTTP_' + name
+        environ[key] = environ[key] + ',' + value if key in environ else value
+    return environ
+
+class AsyncApp:
+    """ASGI application serving a WSGI app from a bounded thread pool
+
+    `version()` returns the graph version being served; cached responses
+    of other versions are not used. `before()` is a cheap check run on the
+    event loop for every request (e.g. the dashboard's source check).
+    Responses up to `max_body` bytes are cached, at most `max_entries`.
+    """
+
+    def __init__(self, wsgi_app, version, before=None, threads=None,
+                 max_entries=1024, max_body=1 << 20):
+        self.wsgi_app = wsgi_app
+        self.version = version
+        self.before = before
+        self.threads = threads or int(os.environ.get("CRICKET_ASGI_THREADS", 8))
+        self.max_entries = max_entries
+        self.max_body = max_body
+        self._executor = None
+        self._responses = OrderedDict()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError(f"Unsupported ASGI scope type {scope['type']!r}")
+        if self.before is not None:
+            self.before()
+
+        key = self._key(scope)
+        if key is not None:
+            cached = self._responses.get(key)
+            if cached is not None and cached[0] == self.version():
+                self._responses.move_to_end(key)
+                _, status, headers, body = cached
+                await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+                await send({'type': 'http.response.body', 'body': body})
+                return
+
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b"")
+            if not message.get('more_body'):
+                break
+        await self._run_wsgi(scope, bytes(body), send, key)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _key(self, scope):
+        if scope['method'] not in ('GET', 'HEAD'):
+            return None
+        headers = dict(scope['headers'])
+        return (scope['method'], scope['path'], scope['query_string'],
+                tuple(headers.get(name) for name in KEY_HEADERS))
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.threads, thread_name_prefix="wsgi")
+        return self._executor
+
+    async def _run_wsgi(self, scope, body, send, key):
+        """Run the WSGI app in the pool and stream its response"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(QUEUE_CHUNKS)
+        abandoned = threading.Event()
+        version = self.version()
+
+        def put(item):
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+        def start_response(status, headers, exc_info=None):
+            put((int(status.split(' ', 1)[0]),
+                 [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]))
+
+        def produce():
+            try:
+                result = self.wsgi_app(wsgi_environ(scope, body), start_response)
+                try:
+                    for chunk in result:
+                        if abandoned.is_set():
+                            return
+                        if chunk:
+                            put(chunk)
+                finally:
+                    if hasattr(result, 'close'):
+                        result.close()
+                put(_END)
+            except BaseException as e:
+                if not abandoned.is_set():
+                    put(e)
+
+        loop.run_in_executor(self._pool(), produce)
+        parts = []
+        size = 0
+        started = None
+        try:
+            while True:
+                item = await queue.get()
+                if isinstance(item, BaseException):
+                    raise item
+                if item is _END:
+                    break
+                if isinstance(item, tuple):
+                    started = item
+                    await send({'type': 'http.response.start', 'status': item[0], 'headers': item[1]})
+                    continue
+                await send({'type': 'http.response.body', 'body': item, 'more_body': True})
+                if parts is not None:
+                    size += len(item)
+                    if size > self.max_body:
+                        parts = None
+                    else:
+                        parts.append(item)
+            await send({'type': 'http.response.body', 'body': b""})
+        except BaseException:
+            abandoned.set()
+            while not queue.empty():
+                queue.get_nowait()
+            raise
+
+        if key is not None and parts is not None and started is not None:
+            self._remember(key, version, started, b"".join(parts))
+
+    def _remember(self, key, version, started, body):
+        status, headers = started
+        names = {name for name, _ in headers}
+        if status not in (200, 304) or b"etag" not in names or version != self.version():
+            return
+        if status == 200 and b"content-length" not in names:
+            # Streamed when it was built; complete now
+            headers = headers + [(b"content-length", str(len(body)).encode('latin-1'))]
+        self._responses[key] = (version, status, headers, body)
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.max_entries:
+            self._responses.popitem(last=False)
@@ -0,0 +1,152 @@
+"""
+Latency of cheap requests while slow SPARQL queries run, Flask vs ASGI
+Serves the Linked Data app twice on the same data: with Flask's threaded
+development server (app.run, as `python publish_linked_data.py` does
+without the debug reloader) and with uvicorn over publish_linked_data:asgi_app.
+Slow clients keep posting uncached SPARQL queries while fast clients
+cycle through cheap, cacheable URLs; the fast clients' latency is reported.
+
+Usage:
+    python benchmark_async.py --source bowling_stats_enhanced_linked.ttl --seconds 10
+"""
+
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+DATA_NAME = "bowling_stats_improved.ttl"
+SOURCES = ("bowling_stats_enhanced_linked.ttl", "bowling_stats_enhanced.ttl",
+           "bowling_stats_improved.ttl", "bowling_stats.ttl")
+
+FAST_URLS = ['/', '/player/Shaheen_Shah_Afridi', '/team/Karachi_Kings',
+             '/fragments?predicate=http%3A%2F%2Fexample.org%2Fcricket%2Fontology%23wickets']
+
+# A filtered scan of the whole graph; the FILTER constant makes every query a cache miss
+SLOW_QUERY = """SELECT (COUNT(*) AS ?n) WHERE {{
+    ?s ?p ?o .
+    FILTER(STRLEN(STR(?o)) != {i})
+}}"""
+
+SERVERS = {
+    'flask': lambda port: [sys.executable, "-c",
+                           "import publish_linked_data as m; "
+                           f"m.app.run(host='127.0.0.1', port={port}, threaded=True)"],
+    'asgi': lambda port: [sys.executable, "-m", "uvicorn", "publish_linked_data:asgi_app",
+                          "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_ready(base_url, process, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            with urllib.request.urlopen(base_url + FAST_URLS[0], timeout=5) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else 0.0
+
+def run(server, serve_dir, fast_clients, slow_clients, seconds):
+    port = free_port()
+    env = dict(os.environ, CRICKET_RELOAD_INTERVAL="0",
+               PYTHONPATH=REPO + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    process = subprocess.Popen(SERVERS[server](port), cwd=serve_dir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    stop = threading.Event()
+    latencies = [[] for _ in range(fast_clients)]
+    slow = {'done': 0, 'busy': 0, 'failed': 0}
+    lock = threading.Lock()
+
+    def fast(index):
+        i = index
+        while not stop.is_set():
+            start = time.perf_counter()
+            with urllib.request.urlopen(base_url + FAST_URLS[i % len(FAST_URLS)], timeout=120) as response:
+                response.read()
+            latencies[index].append(time.perf_counter() - start)
+            i += 1
+
+    def slow_client(index):
+        i = index * 1_000_000
+        while not stop.is_set():
+            request = urllib.request.Request(base_url + "/sparql", data=SLOW_QUERY.format(i=i).encode(),
+                                             headers={'Content-Type': 'application/sparql-query'})
+            i += 1
+            try:
+                with urllib.request.urlopen(request, timeout=120) as response:
+                    response.read()
+                key = 'done'
+            except urllib.error.HTTPError as e:
+                key = 'busy' if e.code == 503 else 'failed'
+                time.sleep(0.1)
+            with lock:
+                slow[key] += 1
+
+    try:
+        wait_ready(base_url, process, timeout=600)
+        for url in FAST_URLS:
+            urllib.request.urlopen(base_url + url, timeout=120).read()
+        threads = ([threading.Thread(target=fast, args=(i,)) for i in range(fast_clients)] +
+                   [threading.Thread(target=slow_client, args=(i,)) for i in range(slow_clients)])
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        process.terminate()
+        process.wait()
+    samples = sorted(t for per_client in latencies for t in per_client)
+    return samples, slow
+
+def main():
+    parser = argparse.ArgumentParser(description="Cheap-request latency under slow SPARQL load")
+    parser.add_argument("--source", help="TTL to serve (default: first existing pipeline output)")
+    parser.add_argument("--servers", nargs="+", choices=sorted(SERVERS), default=['flask', 'asgi'])
+    parser.add_argument("--fast-clients", type=int, default=8)
+    parser.add_argument("--slow-clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    source = args.source or next((f for f in SOURCES if os.path.exists(f)), None)
+    if source is None:
+        raise SystemExit("No data file found; pass --source")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        shutil.copyfile(source, os.path.join(tmp_dir, DATA_NAME))
+        print("\n" + "=" * 80)
+        print(f"LATENCY UNDER LOAD: {os.path.basename(source)}, {os.cpu_count()} CPU, "
+              f"{args.fast_clients} fast + {args.slow_clients} SPARQL clients")
+        print("=" * 80)
+        print(f"{'Server':<8} {'Fast req/s':<12} {'p50 ms':<9} {'p95 ms':<9} {'p99 ms':<9} "
+              f"{'SPARQL ok':<10} {'503':<6} {'Failed':<6}")
+        print("-" * 80)
+        for server in args.servers:
+            samples, slow = run(server, tmp_dir, args.fast_clients, args.slow_clients, args.seconds)
+            print(f"{server:<8} {len(samples) / args.seconds:<12.1f} "
+                  f"{percentile(samples, 0.5) * 1000:<9.1f} {percentile(samples, 0.95) * 1000:<9.1f} "
+                  f"{percentile(samples, 0.99) * 1000:<9.1f} {slow['done']:<10} {slow['busy']:<6} {slow['failed']:<6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Concurrent load test for the graph snapshot holder
+Reader threads call one of the Flask apps in-process while a writer thread
+keeps swapping between two versions of the data file. Reports requests/sec
+and latency per thread count, and counts torn reads:
+- a response whose ETag (graph version) was already seen with a different
+  body for the same URL, i.e. validators and body from different graphs
+- (publish app) a fragment whose match count disagrees with its triples
+
+With --background the writer only starts a reload (as the file watcher and
+POST /admin/reload do) and readers keep going while it runs; the app's
+reload timings are printed at the end.
+
+Usage:
+    python benchmark_concurrency.py --app dashboard --threads 1 2 4 8 --seconds 5
+    python benchmark_concurrency.py --app publish --source bowling_stats_enhanced.ttl
+    python benchmark_concurrency.py --app dashboard --background
+"""
+
+import argparse
+import hashlib
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from rdflib import Dataset
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+
+from fragments import HYDRA
+
+# App module -> data file name it loads from the working directory
+APPS = {
+    'dashboard': ('cricket_stats_professional_app', 'bowling_stats_enhanced_linked.ttl'),
+    'publish': ('publish_linked_data', 'bowling_stats_improved.ttl'),
+}
+
+SOURCES = ("bowling_stats_enhanced_linked.ttl", "bowling_stats_enhanced.ttl",
+           "bowling_stats_improved.ttl", "bowling_stats.ttl")
+
+MARKER = "urn:cricket-benchmark:marker"
+MARKER_TRIPLES = 7
+
+# URLs each reader cycles through
+READS = {
+    'dashboard': ['/', '/tab/economy', '/api/search?q=khan', '/api/suggest?q=sha'],
+    'publish': ['/', '/player/Shaheen_Shah_Afridi',
+                '/fragments?predicate=' + MARKER + '%23p',
+                '/sparql?query=SELECT%20(COUNT(*)%20AS%20%3Fn)%20WHERE%20%7B%3Fs%20%3Fp%20%3Fo%7D'],
+}
+
+def write_versions(source, directory):
+    """Paths of two versions of the data: the source, and the source plus marker triples"""
+    version_a = os.path.join(directory, "version_a.ttl")
+    version_b = os.path.join(directory, "version_b.ttl")
+    shutil.copyfile(source, version_a)
+    shutil.copyfile(source, version_b)
+    with open(version_b, 'a', encoding='utf-8') as f:
+        f.write("\n")
+        for i in range(MARKER_TRIPLES):
+            f.write(f'<{MARKER}/{i}> <{MARKER}#p> "marker {i}" .\n')
+    return version_a, version_b
+
+def install(version, data_file):
+    """Replace the app's data file atomically"""
+    tmp = data_file + ".tmp"
+    shutil.copyfile(version, tmp)
+    os.replace(tmp, data_file)
+
+def fragment_is_torn(body):
+    """True if a marker fragment's hydra:totalItems differs from the triples it holds"""
+    document = Dataset()
+    document.parse(data=body, format='nquads')
+    data = len(document.graph(DATASET_DEFAULT_GRAPH_ID))
+    totals = [int(o) for graph in document.graphs() if graph.identifier != DATASET_DEFAULT_GRAPH_ID
+              for o in graph.objects(None, HYDRA.totalItems)]
+    return totals != [data]
+
+class LoadTest:
+    def __init__(self, app_name, module, background=False):
+        self.app_name = app_name
+        self.module = module
+        self.background = background
+        self.lock = threading.Lock()
+        self.bodies = {}
+        self.torn = 0
+        self.versions = set()
+
+    def check(self, url, response):
+        body = response.data
+        etag = response.headers.get('ETag')
+        digest = hashlib.sha1(body).hexdigest()
+        torn = False
+        if url.startswith('/fragments'):
+            torn = fragment_is_torn(body)
+        with self.lock:
+            self.versions.add(etag)
+            if self.bodies.setdefault((url, etag), digest) != digest:
+                torn = True
+            if torn:
+                self.torn += 1
+
+    def reader(self, stop, latencies):
+        client = self.module.app.test_client()
+        urls = READS[self.app_name]
+        headers = {'Accept': 'application/n-quads'}
+        i = 0
+        while not stop.is_set():
+            url = urls[i % len(urls)]
+            i += 1
+            start = time.perf_counter()
+            response = client.get(url, headers=headers if url.startswith('/fragments') else {})
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url}: HTTP {response.status_code}")
+            self.check(url, response)
+
+    def reload(self):
+        if self.background:
+            self.module.RELOADER.trigger()
+        elif self.app_name == 'publish':
+            self.module.reload_graph()
+        else:
+            self.module.dashboard_views(force=True)
+
+    def writer(self, stop, versions, data_file, interval, reloads):
+        turn = 0
+        while not stop.wait(interval):
+            turn += 1
+            install(versions[turn % 2], data_file)
+            self.reload()
+            reloads.append(turn)
+
+    def run(self, threads, seconds, versions, data_file, interval):
+        stop = threading.Event()
+        latencies = [[] for _ in range(threads)]
+        reloads = []
+        workers = [threading.Thread(target=self.reader, args=(stop, latencies[i])) for i in range(threads)]
+        workers.append(threading.Thread(target=self.writer,
+                                        args=(stop, versions, data_file, interval, reloads)))
+        for worker in workers:
+            worker.start()
+        time.sleep(seconds)
+        stop.set()
+        for worker in workers:
+            worker.join()
+        samples = sorted(t for per_thread in latencies for t in per_thread)
+        return len(samples), samples, len(reloads)
+
+def percentile(samples, fraction):
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] if samples else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent reads during graph reloads")
+    parser.add_argument("--app", choices=sorted(APPS), default="dashboard")
+    parser.add_argument("--source", help="TTL to serve (default: first existing pipeline output)")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration per thread count")
+    parser.add_argument("--reload-interval", type=float, default=0.5, help="Seconds between swaps")
+    parser.add_argument("--background", action="store_true",
+                        help="Start reloads in the background instead of running them in the writer")
+    args = parser.parse_args()
+
+    source = args.source or next((f for f in SOURCES if os.path.exists(f)), None)
+    if source is None:
+        raise SystemExit("No data file found; pass --source")
+    source = os.path.abspath(source)
+    module_name, data_name = APPS[args.app]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        versions = write_versions(source, tmp_dir)
+        serve_dir = os.path.join(tmp_dir, "serve")
+        os.makedirs(serve_dir)
+        data_file = os.path.join(serve_dir, data_name)
+        install(versions[0], data_file)
+
+        # The apps load their data file from the working directory at import
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        os.chdir(serve_dir)
+        # Only the writer reloads
+        os.environ["CRICKET_RELOAD_INTERVAL"] = "0"
+        module = importlib.import_module(module_name)
+
+        print("\n" + "=" * 80)
+        print(f"CONCURRENT LOAD TEST: {args.app} ({os.path.basename(source)}, {os.cpu_count()} CPU)")
+        print("=" * 80)
+        print(f"{'Threads':<9} {'Requests':<10} {'Req/s':<10} {'p50 ms':<9} {'p95 ms':<9} "
+              f"{'Reloads':<9} {'Versions':<10} {'Torn':<6}")
+        print("-" * 80)
+        for threads in args.threads:
+            test = LoadTest(args.app, module, args.background)
+            requests, samples, reloads = test.run(threads, args.seconds, versions, data_file,
+                                                  args.reload_interval)
+            print(f"{threads:<9} {requests:<10} {requests / args.seconds:<10.1f} "
+                  f"{percentile(samples, 0.5) * 1000:<9.1f} {percentile(samples, 0.95) * 1000:<9.1f} "
+                  f"{reloads:<9} {len(test.versions):<10} {test.torn:<6}")
+        reload_stats = module.RELOADER.stats()
+        if reload_stats['reloads']:
+            print(f"\nReloads swapped in: {reload_stats['reloads']}, failed: {reload_stats['failures']}, "
+                  f"mean {reload_stats['total_duration_seconds'] / reload_stats['reloads'] * 1000:.0f} ms, "
+                  f"max {reload_stats['max_duration_seconds'] * 1000:.0f} ms")
+        os.chdir(os.path.dirname(source))
+
+if __name__ == "__main__":
+    main()
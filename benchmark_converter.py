@@ -0,0 +1,142 @@
+"""
+Benchmark the CSV to RDF converter on a synthetic large dataset
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+
+from rdflib import Graph
+
+from add_more_external_links import add_extended_external_links
+from improved_converter_enhanced import convert_csv_sharded, data_triples
+from rdf_terms import TERMS
+
+def make_synthetic_csv(source_csv, output_csv, rows):
+    """Replicate the source rows until `rows` records exist
+
+    Each copy gets a numbered player name so players stay distinct while
+    teams repeat, like a multi-season historical dump.
+    """
+    with open(source_csv, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        base_rows = list(reader)
+
+    with open(output_csv, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for i in range(rows):
+            row = dict(base_rows[i % len(base_rows)])
+            row['Player'] = f"{row['Player']} {i // len(base_rows)}"
+            writer.writerow(row)
+
+def benchmark_sharded(csv_file, tmp_dir, worker_counts=(1, 2, 4, 8)):
+    """Time sharded conversion for several worker counts"""
+    results = []
+    for workers in worker_counts:
+        output = os.path.join(tmp_dir, f"sharded_{workers}.nt")
+        rows, elapsed = convert_csv_sharded(csv_file, output, workers)
+        results.append((workers, rows, elapsed))
+        os.remove(output)
+
+    print("\n" + "=" * 80)
+    print("SHARDED CONVERSION THROUGHPUT")
+    print("=" * 80)
+    print(f"{'Workers':<10} {'Rows':<12} {'Seconds':<10} {'Rows/sec':<12} {'Speedup':<10}")
+    print("-" * 80)
+    baseline = results[0][2]
+    for workers, rows, elapsed in results:
+        print(f"{workers:<10} {rows:<12} {elapsed:<10.2f} {rows / elapsed:<12,.0f} {baseline / elapsed:<10.2f}")
+
+    return results
+
+def benchmark_columnar(csv_file):
+    """Compare row-by-row and columnar NumPy triple generation"""
+    results = []
+    for label, columnar in (("row-by-row", False), ("columnar", True)):
+        start = time.perf_counter()
+        triples = sum(1 for _ in data_triples(csv_file, columnar=columnar))
+        results.append((label, triples, time.perf_counter() - start))
+
+    print("\n" + "=" * 80)
+    print("COLUMNAR INGEST")
+    print("=" * 80)
+    print(f"{'Path':<15} {'Triples':<12} {'Seconds':<10} {'Speedup':<10}")
+    print("-" * 80)
+    baseline = results[0][2]
+    for label, triples, elapsed in results:
+        print(f"{label:<15} {triples:<12} {elapsed:<10.2f} {baseline / elapsed:<10.2f}")
+
+    return results
+
+def _converter_graph(csv_file):
+    g = Graph()
+    for triple in data_triples(csv_file):
+        g.add(triple)
+    return g
+
+def benchmark_interning(csv_file, tmp_dir, maxsize=65536):
+    """Compare memory held with and without term interning
+
+    Covers the converter building its graph and a link script
+    (add_extended_external_links) re-parsing and extending that output.
+    """
+    ttl_file = os.path.join(tmp_dir, "interning.ttl")
+    linked_file = os.path.join(tmp_dir, "interning_linked.ttl")
+    _converter_graph(csv_file).serialize(destination=ttl_file, format="turtle")
+
+    stages = (
+        ("converter", lambda: _converter_graph(csv_file)),
+        ("link script", lambda: add_extended_external_links(ttl_file, linked_file)),
+    )
+    results = []
+    for stage, build in stages:
+        for label, size in (("no interning", 0), ("interning", maxsize)):
+            TERMS.resize(size)
+            tracemalloc.start()
+            start = time.perf_counter()
+            g = build()
+            elapsed = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append((stage, label, len(g), current, peak, elapsed))
+            del g
+    TERMS.resize(maxsize)
+
+    print("\n" + "=" * 80)
+    print("TERM INTERNING (graph build memory)")
+    print("=" * 80)
+    print(f"{'Stage':<13} {'Mode':<14} {'Triples':<10} {'Held MB':<9} {'Peak MB':<9} {'Bytes/triple':<13} {'Seconds':<8}")
+    print("-" * 80)
+    for stage, label, triples, current, peak, elapsed in results:
+        print(f"{stage:<13} {label:<14} {triples:<10} {current / 2**20:<9.1f} {peak / 2**20:<9.1f} "
+              f"{current / triples:<13.0f} {elapsed:<8.2f}")
+
+    return results
+
+BENCHMARKS = ("sharded", "columnar", "interning")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the CSV to RDF converter")
+    parser.add_argument("--input", default="bowlingAvg_clean.csv")
+    parser.add_argument("--rows", type=int, default=200_000, help="Synthetic rows to generate")
+    parser.add_argument("--only", choices=BENCHMARKS, action="append",
+                        help="Run only this benchmark (repeatable)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        synthetic_csv = os.path.join(tmp_dir, "synthetic.csv")
+        print(f"Generating {args.rows:,} synthetic rows from {args.input}...")
+        make_synthetic_csv(args.input, synthetic_csv, args.rows)
+
+        selected = args.only or BENCHMARKS
+        if "sharded" in selected:
+            benchmark_sharded(synthetic_csv, tmp_dir)
+        if "columnar" in selected:
+            benchmark_columnar(synthetic_csv)
+        if "interning" in selected:
+            benchmark_interning(synthetic_csv, tmp_dir)
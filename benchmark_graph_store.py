@@ -0,0 +1,82 @@
+"""
+Compare rdflib's default Memory store with the array-backed ArrayStore
+Reports memory held per triple, load time and lookup time on a synthetic graph
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from rdflib import Namespace
+
+from benchmark_converter import make_synthetic_csv
+from graph_snapshot import new_graph
+from improved_converter_enhanced import convert_csv_to_ntriples_streaming
+
+CRICKET = Namespace("http://example.org/cricket/ontology#")
+
+STORES = (("Memory", "default"), ("ArrayStore", "CricketArray"))
+
+def load_graph(ntriples_file, store):
+    """Parse N-Triples into a new Graph, returning (graph, held bytes, seconds)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    g = new_graph(store)
+    g.parse(ntriples_file, format="nt")
+    len(g)  # ArrayStore folds pending writes on first read
+    list(g.triples((None, CRICKET.wickets, None)))
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return g, current, elapsed
+
+def time_lookups(g, subjects):
+    """Seconds for a point lookup per subject plus one predicate scan"""
+    start = time.perf_counter()
+    for s in subjects:
+        g.value(s, CRICKET.wickets)
+    scanned = sum(1 for _ in g.subject_objects(CRICKET.economyRate))
+    return time.perf_counter() - start, scanned
+
+def benchmark_stores(ntriples_file, lookups=10_000, seed=0):
+    results = []
+    subjects = None
+    for label, store in STORES:
+        g, held, load_seconds = load_graph(ntriples_file, store)
+        if subjects is None:
+            stats = sorted(g.subjects(CRICKET.wickets, None))
+            subjects = random.Random(seed).choices(stats, k=lookups)
+        lookup_seconds, scanned = time_lookups(g, subjects)
+        results.append((label, len(g), held, load_seconds, lookup_seconds))
+        del g
+
+    print("\n" + "=" * 80)
+    print("GRAPH STORE COMPARISON")
+    print("=" * 80)
+    print(f"{'Store':<12} {'Triples':<10} {'Held MB':<10} {'Bytes/triple':<14} "
+          f"{'Load s':<10} {'Lookup s':<10}")
+    print("-" * 80)
+    for label, triples, held, load_seconds, lookup_seconds in results:
+        print(f"{label:<12} {triples:<10} {held / 2**20:<10.1f} {held / triples:<14.0f} "
+              f"{load_seconds:<10.2f} {lookup_seconds:<10.2f}")
+    print(f"\nLookups: {lookups:,} (s, cricket:wickets, ?) + one cricket:economyRate scan")
+
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark rdflib graph stores")
+    parser.add_argument("--input", default="bowlingAvg_clean.csv")
+    parser.add_argument("--rows", type=int, default=50_000, help="Synthetic rows to generate")
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        synthetic_csv = os.path.join(tmp_dir, "synthetic.csv")
+        ntriples_file = os.path.join(tmp_dir, "synthetic.nt")
+        print(f"Generating {args.rows:,} synthetic rows from {args.input}...")
+        make_synthetic_csv(args.input, synthetic_csv, args.rows)
+        convert_csv_to_ntriples_streaming(synthetic_csv, ntriples_file)
+        benchmark_stores(ntriples_file, args.lookups)
@@ -0,0 +1,171 @@
+"""
+Memory and throughput of the dashboard under gunicorn, by worker count
+Compares two ways of running N pre-fork workers on the same data:
+- private: every worker imports the app and loads its own graph
+  (rdflib Memory store), as a plain `gunicorn -w N` does today
+- mapped: gunicorn.conf.py, i.e. the app is preloaded in the master over
+  the memory-mapped graph image and the workers share it
+
+Memory is read from /proc/<pid>/smaps_rollup (Linux): USS is a process's
+private memory, PSS splits shared pages between the processes mapping them,
+so the total PSS is what the whole server costs. Requires gunicorn.
+
+Usage:
+    python benchmark_workers.py --workers 1 2 4 8 --rows 20000 --seconds 5
+"""
+
+import argparse
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from benchmark_converter import make_synthetic_csv
+from graph_snapshot import load_graph_cached
+from improved_converter_enhanced import convert_csv_to_ntriples_streaming
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+DATA_NAME = "bowling_stats_enhanced_linked.ttl"
+URLS = ['/', '/tab/economy', '/api/search?q=khan', '/api/suggest?q=sha']
+
+MODES = {
+    'private': ["-w", "{workers}"],
+    'mapped': ["-c", os.path.join(REPO, "gunicorn.conf.py"), "-w", "{workers}"],
+}
+MODE_STORES = {'private': "default", 'mapped': "CricketMapped"}
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def memory(pid):
+    """(RSS, PSS, USS) bytes of a process"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(':')] = int(parts[1]) * 1024
+    uss = values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    return values.get('Rss', 0), values.get('Pss', 0), uss
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+def wait_ready(base_url, process, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        try:
+            with urllib.request.urlopen(base_url + URLS[-1], timeout=5) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn did not become ready")
+
+def load(base_url, clients, seconds):
+    """Requests completed by `clients` threads cycling through URLS"""
+    stop = threading.Event()
+    counts = [0] * clients
+
+    def client(index):
+        i = index
+        while not stop.is_set():
+            with urllib.request.urlopen(base_url + URLS[i % len(URLS)], timeout=60) as response:
+                response.read()
+            i += 1
+            counts[index] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return sum(counts)
+
+def run(mode, workers, serve_dir, clients, seconds):
+    port = free_port()
+    args = [a.format(workers=workers) for a in MODES[mode]]
+    env = dict(os.environ, CRICKET_GRAPH_STORE=MODE_STORES[mode], CRICKET_RELOAD_INTERVAL="0",
+               PYTHONPATH=REPO + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", *args, "-b", f"127.0.0.1:{port}", "--timeout", "600",
+         "cricket_stats_professional_app:app"],
+        cwd=serve_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(base_url, process, timeout=600)
+        # Every worker has loaded once all of them have answered
+        while len(children(process.pid)) < workers:
+            time.sleep(0.1)
+        load(base_url, clients, 1.0)
+        ready = time.perf_counter() - start
+        requests = load(base_url, clients, seconds)
+        pids = [process.pid] + children(process.pid)
+        usage = [memory(pid) for pid in pids]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait()
+    worker_usage = usage[1:]
+    return {
+        'requests_per_second': requests / seconds,
+        'ready_seconds': ready,
+        'worker_rss': sum(u[0] for u in worker_usage) / len(worker_usage),
+        'worker_uss': sum(u[2] for u in worker_usage) / len(worker_usage),
+        'total_pss': sum(u[1] for u in usage),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard memory and req/s by gunicorn worker count")
+    parser.add_argument("--input", default="bowlingAvg_clean.csv")
+    parser.add_argument("--rows", type=int, default=20_000, help="Synthetic rows to generate")
+    parser.add_argument("--source", help="Serve this TTL instead of synthetic data")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--modes", nargs="+", choices=sorted(MODES), default=['private', 'mapped'])
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client threads")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Load duration per run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_file = os.path.join(tmp_dir, DATA_NAME)
+        if args.source:
+            shutil.copyfile(args.source, data_file)
+        else:
+            synthetic_csv = os.path.join(tmp_dir, "synthetic.csv")
+            print(f"Generating {args.rows:,} synthetic rows from {args.input}...")
+            make_synthetic_csv(args.input, synthetic_csv, args.rows)
+            convert_csv_to_ntriples_streaming(synthetic_csv, data_file)
+        # Build the snapshot and image up front so no run pays for them
+        triples = len(load_graph_cached(data_file))
+        for store in set(MODE_STORES[mode] for mode in args.modes):
+            load_graph_cached(data_file, store=store)
+
+        print("\n" + "=" * 80)
+        print(f"PRE-FORK WORKERS: dashboard, {triples:,} triples, {os.cpu_count()} CPU, "
+              f"{args.clients} clients")
+        print("=" * 80)
+        print(f"{'Mode':<9} {'Workers':<9} {'Req/s':<9} {'Ready s':<9} {'RSS/wkr MB':<12} "
+              f"{'USS/wkr MB':<12} {'Total PSS MB':<12}")
+        print("-" * 80)
+        for mode in args.modes:
+            for workers in args.workers:
+                result = run(mode, workers, tmp_dir, args.clients, args.seconds)
+                print(f"{mode:<9} {workers:<9} {result['requests_per_second']:<9.1f} "
+                      f"{result['ready_seconds']:<9.1f} {result['worker_rss'] / 2**20:<12.1f} "
+                      f"{result['worker_uss'] / 2**20:<12.1f} {result['total_pss'] / 2**20:<12.1f}")
+
+if __name__ == "__main__":
+    main()
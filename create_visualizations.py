@@ -6,21 +6,23 @@ Generates charts and graphs for the report
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
-from rdflib import Graph
 import os
 
+from graph_snapshot import load_graph_cached
+from star_index import attach_star_index
+
 def load_graph():
     """Load the RDF graph"""
-    g = Graph()
     if os.path.exists("bowling_stats_enhanced_linked.ttl"):
-        g.parse("bowling_stats_enhanced_linked.ttl", format="turtle")
+        g = load_graph_cached("bowling_stats_enhanced_linked.ttl")
         print(f"Loaded: bowling_stats_enhanced_linked.ttl ({len(g)} triples)")
     elif os.path.exists("bowling_stats_enhanced.ttl"):
-        g.parse("bowling_stats_enhanced.ttl", format="turtle")
+        g = load_graph_cached("bowling_stats_enhanced.ttl")
         print(f"Loaded: bowling_stats_enhanced.ttl ({len(g)} triples)")
     else:
         print("Error: No RDF file found!")
         return None
+    attach_star_index(g)
     return g
 
 def visualize_top_wicket_takers(g):
@@ -3,22 +3,53 @@ Professional Cricket Statistics Dashboard
 End User Application with Graph Backend - Linked to DBpedia & Wikidata
 """
 
-from flask import Flask, render_template_string, request, jsonify
+from flask import Flask, request, jsonify, abort
 from rdflib import Graph, Namespace
-from rdflib.namespace import OWL, RDFS, RDF
+from rdflib.namespace import RDF
+import hmac
 import os
 
+from async_app import AsyncApp
+from graph_holder import GraphHolder, Snapshot
+from graph_snapshot import load_graph_cached, source_hash
+from hot_reload import Reloader, source_signature
+from http_cache import conditional
+from link_index import attach_link_index
+from name_index import attach_name_index, attach_suggest_index
+from star_index import attach_star_index
+
 app = Flask(__name__)
 
-# Load RDF graph
-g = Graph()
-if os.path.exists("bowling_stats_enhanced_linked.ttl"):
-    g.parse("bowling_stats_enhanced_linked.ttl", format="turtle")
-elif os.path.exists("bowling_stats_enhanced.ttl"):
-    g.parse("bowling_stats_enhanced.ttl", format="turtle")
+# Source data: the first file that exists
+DATA_FILE = next((f for f in ("bowling_stats_enhanced_linked.ttl", "bowling_stats_enhanced.ttl")
+                  if os.path.exists(f)), None)
+
+# POST /admin/refresh and /admin/reload require a matching X-Admin-Token
+# header; without a token they are refused
+ADMIN_TOKEN = os.environ.get("CRICKET_ADMIN_TOKEN")
+
+# Seconds between checks of the source file for a background reload (0 disables)
+RELOAD_INTERVAL = float(os.environ.get("CRICKET_RELOAD_INTERVAL", 2.0))
+
+def load_graph(path):
+    """Load the RDF graph"""
+    graph = Graph()
+    if path:
+        graph = load_graph_cached(path)
+    # Dashboard queries are star joins on stats nodes; answer them from an index
+    attach_star_index(graph)
+    attach_link_index(graph)
+    attach_name_index(graph)
+    attach_suggest_index(graph)
+    return graph
+
+# Graph snapshots: each request reads the one current when it started,
+# reloads build a new snapshot and swap it in
+HOLDER = GraphHolder()
 
-print(f"✓ Loaded {len(g)} triples")
-print(f"✓ External links: {len(list(g.triples((None, OWL.sameAs, None))))}")
+def current_graph():
+    """Graph of the request's snapshot"""
+    return HOLDER.snapshot().graph
 
 # HTML Template will be added via fsAppend
 HTML_TEMPLATE = """
@@ -362,174 +393,28 @@ HTML_TEMPLATE = """
         </div>
         
         <!-- Tab 1: Top Wicket Takers -->
-        <div id="wickets" class="tab-content active">
-            <h2 class="section-title">Top 20 Wicket Takers</h2>
-            <div class="highlight-box">
-                <strong>🔗 Linked Open Data:</strong> Click on Wikipedia or Wikidata links to explore additional information about players from external knowledge bases.
-            </div>
-            <table>
-                <thead>
-                    <tr>
-                        <th style="width: 60px;">Rank</th>
-                        <th>Player</th>
-                        <th>Team</th>
-                        <th style="width: 100px;">Wickets</th>
-                        <th style="width: 100px;">Economy</th>
-                        <th style="width: 100px;">Avg</th>
-                        <th style="width: 200px;">External Links</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {% for player in top_wickets %}
-                    <tr>
-                        <td class="rank {% if loop.index <= 3 %}rank-{{ loop.index }}{% endif %}">
-                            #{{ loop.index }}
-                        </td>
-                        <td class="player-name">{{ player.name }}</td>
-                        <td>{{ player.team }}</td>
-                        <td><strong>{{ player.wickets }}</strong></td>
-                        <td>{{ player.economy }}</td>
-                        <td>{{ player.average }}</td>
-                        <td>
-                            {% if player.dbpedia %}
-                            <a href="{{ player.dbpedia }}" target="_blank" class="external-link">📖 Wikipedia</a>
-                            {% endif %}
-                            {% if player.wikidata %}
-                            <a href="{{ player.wikidata }}" target="_blank" class="external-link">🗃️ Wikidata</a>
-                            {% endif %}
-                            {% if not player.dbpedia and not player.wikidata %}
-                            <span class="no-links">No links</span>
-                            {% endif %}
-                        </td>
-                    </tr>
-                    {% endfor %}
-                </tbody>
-            </table>
+        <div id="wickets" class="tab-content active" data-src="/tab/wickets">
+            {{ tabs.wickets|safe }}
         </div>
         
         <!-- Tab 2: Best Economy -->
-        <div id="economy" class="tab-content">
-            <h2 class="section-title">Best Economy Rates (Min 20 Wickets)</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th style="width: 60px;">Rank</th>
-                        <th>Player</th>
-                        <th>Team</th>
-                        <th style="width: 100px;">Economy</th>
-                        <th style="width: 100px;">Wickets</th>
-                        <th style="width: 100px;">Overs</th>
-                        <th style="width: 200px;">External Links</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {% for player in best_economy %}
-                    <tr>
-                        <td class="rank {% if loop.index <= 3 %}rank-{{ loop.index }}{% endif %}">
-                            #{{ loop.index }}
-                        </td>
-                        <td class="player-name">{{ player.name }}</td>
-                        <td>{{ player.team }}</td>
-                        <td><strong>{{ player.economy }}</strong></td>
-                        <td>{{ player.wickets }}</td>
-                        <td>{{ player.overs }}</td>
-                        <td>
-                            {% if player.dbpedia %}
-                            <a href="{{ player.dbpedia }}" target="_blank" class="external-link">📖 Wikipedia</a>
-                            {% endif %}
-                            {% if player.wikidata %}
-                            <a href="{{ player.wikidata }}" target="_blank" class="external-link">🗃️ Wikidata</a>
-                            {% endif %}
-                            {% if not player.dbpedia and not player.wikidata %}
-                            <span class="no-links">No links</span>
-                            {% endif %}
-                        </td>
-                    </tr>
-                    {% endfor %}
-                </tbody>
-            </table>
+        <div id="economy" class="tab-content" data-src="/tab/economy">
         </div>
         
         <!-- Tab 3: 5-Wicket Hauls -->
-        <div id="fivewickets" class="tab-content">
-            <h2 class="section-title">Players with 5-Wicket Hauls</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Player</th>
-                        <th>Team</th>
-                        <th style="width: 120px;">5-Wicket Hauls</th>
-                        <th style="width: 150px;">Best Figures</th>
-                        <th style="width: 100px;">Total Wickets</th>
-                        <th style="width: 200px;">External Links</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {% for player in five_wickets %}
-                    <tr>
-                        <td class="player-name">{{ player.name }}</td>
-                        <td>{{ player.team }}</td>
-                        <td><strong>{{ player.five_wickets }}</strong></td>
-                        <td>{{ player.best }}</td>
-                        <td>{{ player.wickets }}</td>
-                        <td>
-                            {% if player.dbpedia %}
-                            <a href="{{ player.dbpedia }}" target="_blank" class="external-link">📖 Wikipedia</a>
-                            {% endif %}
-                            {% if player.wikidata %}
-                            <a href="{{ player.wikidata }}" target="_blank" class="external-link">🗃️ Wikidata</a>
-                            {% endif %}
-                            {% if not player.dbpedia and not player.wikidata %}
-                            <span class="no-links">No links</span>
-                            {% endif %}
-                        </td>
-                    </tr>
-                    {% endfor %}
-                </tbody>
-            </table>
+        <div id="fivewickets" class="tab-content" data-src="/tab/fivewickets">
         </div>
         
         <!-- Tab 4: Team Stats -->
-        <div id="teams" class="tab-content">
-            <h2 class="section-title">Team-wise Bowling Statistics</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Team</th>
-                        <th style="width: 100px;">Players</th>
-                        <th style="width: 120px;">Total Wickets</th>
-                        <th style="width: 120px;">Avg Economy</th>
-                        <th style="width: 120px;">Avg Strike Rate</th>
-                        <th style="width: 200px;">External Links</th>
-                    </tr>
-                </thead>
-                <tbody>
-                    {% for team in team_stats %}
-                    <tr>
-                        <td class="player-name">{{ team.name }}</td>
-                        <td>{{ team.players }}</td>
-                        <td><strong>{{ team.wickets }}</strong></td>
-                        <td>{{ team.economy }}</td>
-                        <td>{{ team.strike_rate }}</td>
-                        <td>
-                            {% if team.dbpedia %}
-                            <a href="{{ team.dbpedia }}" target="_blank" class="external-link">📖 Wikipedia</a>
-                            {% endif %}
-                            {% if team.wikidata %}
-                            <a href="{{ team.wikidata }}" target="_blank" class="external-link">🗃️ Wikidata</a>
-                            {% endif %}
-                        </td>
-                    </tr>
-                    {% endfor %}
-                </tbody>
-            </table>
+        <div id="teams" class="tab-content" data-src="/tab/teams">
         </div>
         
         <!-- Tab 5: Search -->
         <div id="search" class="tab-content">
             <h2 class="section-title">Search Players</h2>
             <div class="search-box">
-                <input type="text" id="searchInput" placeholder="Enter player name (e.g., Shaheen, Haris, Shadab...)">
+                <input type="text" id="searchInput" list="searchSuggestions" autocomplete="off" placeholder="Enter player name (e.g., Shaheen, Haris, Shadab...)">
+                <datalist id="searchSuggestions"></datalist>
                 <button onclick="searchPlayer()">Search</button>
             </div>
             <div id="searchResults"></div>
@@ -557,7 +442,16 @@ HTML_TEMPLATE = """
             });
             
             // Show selected tab
-            document.getElementById(tabName).classList.add('active');
+            const tab = document.getElementById(tabName);
+            tab.classList.add('active');
+            
+            // Load the tab's fragment on first view
+            if (tab.dataset.src && !tab.innerHTML.trim()) {
+                tab.innerHTML = '<p style="text-align: center; padding: 40px; color: #999;">Loading...</p>';
+                fetch(tab.dataset.src)
+                    .then(response => response.text())
+                    .then(html => { tab.innerHTML = html; });
+            }
             
             // Activate button
             event.target.classList.add('active');
@@ -604,9 +498,42 @@ HTML_TEMPLATE = """
                 });
         }
         
+        // Typeahead: fill the datalist from /api/suggest while typing, and
+        // search straight away when a suggested player is picked
+        let suggestTimer = null;
+        let suggestedPlayers = new Set();
+        
+        function suggestPlayers() {
+            const query = document.getElementById('searchInput').value;
+            if (suggestedPlayers.has(query)) {
+                searchPlayer();
+                return;
+            }
+            clearTimeout(suggestTimer);
+            suggestTimer = setTimeout(() => {
+                if (!query.trim()) return;
+                fetch('/api/suggest?q=' + encodeURIComponent(query))
+                    .then(response => response.json())
+                    .then(data => {
+                        const list = document.getElementById('searchSuggestions');
+                        list.innerHTML = '';
+                        suggestedPlayers = new Set();
+                        data.forEach(item => {
+                            const option = document.createElement('option');
+                            option.value = item.name;
+                            option.label = `${item.type === 'team' ? 'Team' : 'Player'} · ${item.wickets} wickets`;
+                            list.appendChild(option);
+                            if (item.type === 'player') suggestedPlayers.add(item.name);
+                        });
+                    });
+            }, 120);
+        }
+        
         // Allow Enter key to search
         document.addEventListener('DOMContentLoaded', function() {
-            document.getElementById('searchInput').addEventListener('keypress', function(e) {
+            const input = document.getElementById('searchInput');
+            input.addEventListener('input', suggestPlayers);
+            input.addEventListener('keypress', function(e) {
                 if (e.key === 'Enter') {
                     searchPlayer();
                 }
@@ -617,27 +544,183 @@ HTML_TEMPLATE = """
 </html>
 """
 
-def get_external_links(resource_uri):
+# Tab fragments, rendered separately and loaded lazily by the page
+TAB_TEMPLATES = {
+    'wickets': """
+    <h2 class="section-title">Top 20 Wicket Takers</h2>
+    <div class="highlight-box">
+        <strong>🔗 Linked Open Data:</strong> Click on Wikipedia or Wikidata links to explore additional information about players from external knowledge bases.
+    </div>
+    <table>
+        <thead>
+            <tr>
+                <th style="width: 60px;">Rank</th>
+                <th>Player</th>
+                <th>Team</th>
+                <th style="width: 100px;">Wickets</th>
+                <th style="width: 100px;">Economy</th>
+                <th style="width: 100px;">Avg</th>
+                <th style="width: 200px;">External Links</th>
+            </tr>
+        </thead>
+        <tbody>
+            {% for player in top_wickets %}
+            <tr>
+                <td class="rank {% if loop.index <= 3 %}rank-{{ loop.index }}{% endif %}">
+                    #{{ loop.index }}
+                </td>
+                <td class="player-name">{{ player.name }}</td>
+                <td>{{ player.team }}</td>
+                <td><strong>{{ player.wickets }}</strong></td>
+                <td>{{ player.economy }}</td>
+                <td>{{ player.average }}</td>
+                <td>
+                    {% if player.dbpedia %}
+                    <a href="{{ player.dbpedia }}" target="_blank" class="external-link">📖 Wikipedia</a>
+                    {% endif %}
+                    {% if player.wikidata %}
+                    <a href="{{ player.wikidata }}" target="_blank" class="external-link">🗃️ Wikidata</a>
+                    {% endif %}
+                    {% if not player.dbpedia and not player.wikidata %}
+                    <span class="no-links">No links</span>
+                    {% endif %}
+                </td>
+            </tr>
+            {% endfor %}
+        </tbody>
+    </table>
+""",
+    'economy': """
+    <h2 class="section-title">Best Economy Rates (Min 20 Wickets)</h2>
+    <table>
+        <thead>
+            <tr>
+                <th style="width: 60px;">Rank</th>
+                <th>Player</th>
+                <th>Team</th>
+                <th style="width: 100px;">Economy</th>
+                <th style="width: 100px;">Wickets</th>
+                <th style="width: 100px;">Overs</th>
+                <th style="width: 200px;">External Links</th>
+            </tr>
+        </thead>
+        <tbody>
+            {% for player in best_economy %}
+            <tr>
+                <td class="rank {% if loop.index <= 3 %}rank-{{ loop.index }}{% endif %}">
+                    #{{ loop.index }}
+                </td>
+                <td class="player-name">{{ player.name }}</td>
+                <td>{{ player.team }}</td>
+                <td><strong>{{ player.economy }}</strong></td>
+                <td>{{ player.wickets }}</td>
+                <td>{{ player.overs }}</td>
+                <td>
+                    {% if player.dbpedia %}
+                    <a href="{{ player.dbpedia }}" target="_blank" class="external-link">📖 Wikipedia</a>
+                    {% endif %}
+                    {% if player.wikidata %}
+                    <a href="{{ player.wikidata }}" target="_blank" class="external-link">🗃️ Wikidata</a>
+                    {% endif %}
+                    {% if not player.dbpedia and not player.wikidata %}
+                    <span class="no-links">No links</span>
+                    {% endif %}
+                </td>
+            </tr>
+            {% endfor %}
+        </tbody>
+    </table>
+""",
+    'fivewickets': """
+    <h2 class="section-title">Players with 5-Wicket Hauls</h2>
+    <table>
+        <thead>
+            <tr>
+                <th>Player</th>
+                <th>Team</th>
+                <th style="width: 120px;">5-Wicket Hauls</th>
+                <th style="width: 150px;">Best Figures</th>
+                <th style="width: 100px;">Total Wickets</th>
+                <th style="width: 200px;">External Links</th>
+            </tr>
+        </thead>
+        <tbody>
+            {% for player in five_wickets %}
+            <tr>
+                <td class="player-name">{{ player.name }}</td>
+                <td>{{ player.team }}</td>
+                <td><strong>{{ player.five_wickets }}</strong></td>
+                <td>{{ player.best }}</td>
+                <td>{{ player.wickets }}</td>
+                <td>
+                    {% if player.dbpedia %}
+                    <a href="{{ player.dbpedia }}" target="_blank" class="external-link">📖 Wikipedia</a>
+                    {% endif %}
+                    {% if player.wikidata %}
+                    <a href="{{ player.wikidata }}" target="_blank" class="external-link">🗃️ Wikidata</a>
+                    {% endif %}
+                    {% if not player.dbpedia and not player.wikidata %}
+                    <span class="no-links">No links</span>
+                    {% endif %}
+                </td>
+            </tr>
+            {% endfor %}
+        </tbody>
+    </table>
+""",
+    'teams': """
+    <h2 class="section-title">Team-wise Bowling Statistics</h2>
+    <table>
+        <thead>
+            <tr>
+                <th>Team</th>
+                <th style="width: 100px;">Players</th>
+                <th style="width: 120px;">Total Wickets</th>
+                <th style="width: 120px;">Avg Economy</th>
+                <th style="width: 120px;">Avg Strike Rate</th>
+                <th style="width: 200px;">External Links</th>
+            </tr>
+        </thead>
+        <tbody>
+            {% for team in team_stats %}
+            <tr>
+                <td class="player-name">{{ team.name }}</td>
+                <td>{{ team.players }}</td>
+                <td><strong>{{ team.wickets }}</strong></td>
+                <td>{{ team.economy }}</td>
+                <td>{{ team.strike_rate }}</td>
+                <td>
+                    {% if team.dbpedia %}
+                    <a href="{{ team.dbpedia }}" target="_blank" class="external-link">📖 Wikipedia</a>
+                    {% endif %}
+                    {% if team.wikidata %}
+                    <a href="{{ team.wikidata }}" target="_blank" class="external-link">🗃️ Wikidata</a>
+                    {% endif %}
+                </td>
+            </tr>
+            {% endfor %}
+        </tbody>
+    </table>
+""",
+}
+
+def get_external_links(resource_uri, graph=None):
     """Get DBpedia and Wikidata links"""
-    links = {'dbpedia': None, 'wikidata': None}
-    for s, p, o in g.triples((resource_uri, OWL.sameAs, None)):
-        link = str(o)
-        if 'dbpedia.org' in link:
-            links['dbpedia'] = link
-        elif 'wikidata.org' in link:
-            links['wikidata'] = link
-    return links
+    return attach_link_index(graph or current_graph()).resolve(resource_uri)
 
-@app.route('/')
-def index():
-    """Main dashboard"""
+def get_external_links_batch(resource_uris, graph=None):
+    """Get DBpedia and Wikidata links for many resources in one lookup"""
+    return attach_link_index(graph or current_graph()).resolve_many(resource_uris)
+
+def build_dashboard_views(g):
+    """Run the dashboard queries and return the template variables"""
     
     CRICKET = Namespace("http://example.org/cricket/ontology#")
     
     # Count stats
-    total_players = len(list(g.subjects(RDF.type, CRICKET.Player)))
-    total_teams = len(list(g.subjects(RDF.type, CRICKET.Team)))
-    external_links_count = len(list(g.triples((None, OWL.sameAs, None))))
+    total_players = sum(1 for _ in g.subjects(RDF.type, CRICKET.Player))
+    total_teams = sum(1 for _ in g.subjects(RDF.type, CRICKET.Team))
+    external_links_count = len(attach_link_index(g))
     
     # Total wickets
     query_wickets = """
@@ -667,8 +750,10 @@ def index():
     """
     
     top_wickets = []
-    for row in g.query(query_top):
-        links = get_external_links(row[0])
+    rows = list(g.query(query_top))
+    links_by_uri = get_external_links_batch((row[0] for row in rows), g)
+    for row in rows:
+        links = links_by_uri[row[0]]
         top_wickets.append({
             'name': str(row[1]),
             'team': str(row[2]),
@@ -700,8 +785,10 @@ def index():
     """
     
     best_economy = []
-    for row in g.query(query_economy):
-        links = get_external_links(row[0])
+    rows = list(g.query(query_economy))
+    links_by_uri = get_external_links_batch((row[0] for row in rows), g)
+    for row in rows:
+        links = links_by_uri[row[0]]
         best_economy.append({
             'name': str(row[1]),
             'team': str(row[2]),
@@ -732,8 +819,10 @@ def index():
     """
     
     five_wickets = []
-    for row in g.query(query_five):
-        links = get_external_links(row[0])
+    rows = list(g.query(query_five))
+    links_by_uri = get_external_links_batch((row[0] for row in rows), g)
+    for row in rows:
+        links = links_by_uri[row[0]]
         five_wickets.append({
             'name': str(row[1]),
             'team': str(row[2]),
@@ -767,8 +856,10 @@ def index():
     """
     
     team_stats = []
-    for row in g.query(query_teams):
-        links = get_external_links(row[0])
+    rows = list(g.query(query_teams))
+    links_by_uri = get_external_links_batch((row[0] for row in rows), g)
+    for row in rows:
+        links = links_by_uri[row[0]]
         team_stats.append({
             'name': str(row[1]),
             'players': int(row[2]),
@@ -779,8 +870,7 @@ def index():
             'wikidata': links['wikidata']
         })
     
-    return render_template_string(
-        HTML_TEMPLATE,
+    return dict(
         total_players=total_players,
         total_teams=total_teams,
         total_wickets=total_wickets,
@@ -792,51 +882,187 @@ def index():
         team_stats=team_stats
     )
 
+def build_snapshot(current, force=False):
+    """Next snapshot with materialized dashboard views, or None if unchanged
+
+    A cheap mtime/size check comes first; only when it differs is the file
+    hashed, and only a different hash reloads the graph. `force` rebuilds
+    the views even if nothing changed.
+    """
+    signature = source_signature(DATA_FILE)
+    if current is not None and not force and signature == current.signature:
+        return None
+    digest = source_hash(DATA_FILE) if signature is not None else None
+    if current is not None and digest == current.digest:
+        if not force:
+            # Touched but unchanged
+            return current.replace(signature=signature)
+        graph = current.graph
+    else:
+        graph = load_graph(DATA_FILE)
+        if current is not None:
+            print(f"✓ Reloaded {DATA_FILE}: {len(graph)} triples")
+
+    builds = (current.data['builds'] if current is not None else 0) + 1
+    version = f"{digest.hex()[:16] if digest else 'empty'}-{builds}"
+    views = dict(build_dashboard_views(graph), graph_version=version)
+    return Snapshot(graph, version, source=DATA_FILE, signature=signature, digest=digest,
+                    views=views, builds=builds)
+
+def source_changed():
+    """True if the source TTL's mtime/size differ from the served snapshot's
+
+    A missing file (e.g. mid-replacement) keeps the current snapshot.
+    """
+    signature = source_signature(DATA_FILE)
+    return signature is not None and signature != HOLDER.current().signature
+
+def check_source():
+    """Start a background reload if the source TTL changed
+
+    Runs before each request. The request itself, and every other one
+    until the swap, is served from the current snapshot.
+    """
+    RELOADER.check()
+
+def dashboard_views():
+    """Materialized dashboard views of the request's snapshot"""
+    return HOLDER.snapshot().data['views']
+
+# Load the graph and build the views at startup so page requests only render
+HOLDER.update(build_snapshot)
+HOLDER.pin(app, before=check_source)
+
+print(f"✓ Loaded {len(current_graph())} triples")
+print(f"✓ External links: {len(attach_link_index(current_graph()))}")
+
+# Templates compiled once; rendered HTML cached per graph version
+PAGE_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+TAB_FRAGMENTS = {name: app.jinja_env.from_string(source) for name, source in TAB_TEMPLATES.items()}
+DEFAULT_TAB = 'wickets'
+_html_cache = {}
+
+def cached_html(key, views, render):
+    """HTML for `key`, rendered once per graph version"""
+    cache_key = (views['graph_version'], key)
+    html = _html_cache.get(cache_key)
+    if html is None:
+        html = _html_cache[cache_key] = render()
+    return html
+
+def render_page(views):
+    return cached_html('page', views, lambda: PAGE_TEMPLATE.render(
+        tabs={DEFAULT_TAB: render_tab(DEFAULT_TAB, views)}, **views))
+
+def render_tab(name, views):
+    return cached_html(('tab', name), views, lambda: TAB_FRAGMENTS[name].render(**views))
+
+def warm_html(snapshot):
+    """Render the page and every tab of a snapshot before it is swapped in"""
+    views = snapshot.data['views']
+    render_page(views)
+    for name in TAB_FRAGMENTS:
+        render_tab(name, views)
+
+def drop_old_html(snapshot):
+    """Forget HTML of versions other than the one just swapped in"""
+    version = snapshot.data['views']['graph_version']
+    for key in [key for key in list(_html_cache) if key[0] != version]:
+        _html_cache.pop(key, None)
+
+# Reloads build, index and render the next snapshot off the request path
+RELOADER = Reloader(HOLDER, build_snapshot, changed=source_changed, warm=warm_html,
+                    on_swap=drop_old_html)
+RELOADER.watch(RELOAD_INTERVAL)
+
+def graph_validators():
+    """(graph version, Last-Modified) of the request's snapshot for conditional responses"""
+    snapshot = HOLDER.snapshot()
+    return snapshot.version, snapshot.last_modified
+
+@app.route('/')
+def index():
+    """Main dashboard (the first tab inline, the others loaded on demand)"""
+    views = dashboard_views()
+    return conditional(*graph_validators(), lambda: render_page(views))
+
+@app.route('/tab/<name>')
+def tab(name):
+    """One dashboard tab as an HTML fragment"""
+    if name not in TAB_FRAGMENTS:
+        abort(404)
+    views = dashboard_views()
+    return conditional(*graph_validators(), lambda: render_tab(name, views))
+
+def require_admin():
+    """403 unless CRICKET_ADMIN_TOKEN is set and the request's X-Admin-Token matches it"""
+    token = request.headers.get('X-Admin-Token', '')
+    if not ADMIN_TOKEN or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        abort(403)
+
+@app.route('/admin/refresh', methods=['POST'])
+def admin_refresh():
+    """Rebuild the materialized dashboard views (reloading changed data) in the background"""
+    require_admin()
+    started = RELOADER.trigger(lambda current: build_snapshot(current, force=True))
+    return jsonify(dict(RELOADER.stats(), status='started' if started else 'queued')), 202
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Reload changed data in the background; requests keep the current graph until the swap"""
+    require_admin()
+    started = RELOADER.trigger()
+    return jsonify(dict(RELOADER.stats(), status='started' if started else 'queued')), 202
+
+@app.route('/stats')
+def stats():
+    """Graph version being served and reload timings"""
+    return jsonify(RELOADER.stats())
+
 @app.route('/api/search')
 def search():
     """Search API"""
     query_text = request.args.get('q', '')
-    
-    sparql_query = f"""
-    PREFIX cricket: <http://example.org/cricket/ontology#>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    
-    SELECT ?player ?name ?team ?wickets ?economy ?average
-    WHERE {{
-        ?stats cricket:forPlayer ?player ;
-               cricket:forTeam ?teamRes ;
-               cricket:wickets ?wickets ;
-               cricket:economy ?economy ;
-               cricket:average ?average .
-        ?player rdfs:label ?name .
-        ?teamRes rdfs:label ?team .
-        FILTER(CONTAINS(LCASE(?name), LCASE("{query_text}")))
-    }}
-    ORDER BY DESC(?wickets)
-    LIMIT 50
-    """
+    return conditional(*graph_validators(), lambda: search_results(query_text))
+
+def search_results(query_text):
+    """JSON search results for the search API"""
+    # Name index lookup; the query text never reaches SPARQL
+    rows = attach_name_index(current_graph()).search(query_text, limit=50)
     
     results = []
-    for row in g.query(sparql_query):
-        links = get_external_links(row[0])
+    links_by_uri = get_external_links_batch(row['player'] for row in rows)
+    for row in rows:
+        links = links_by_uri[row['player']]
         results.append({
-            'name': str(row[1]),
-            'team': str(row[2]),
-            'wickets': int(float(row[3])),
-            'economy': f"{float(row[4]):.2f}",
-            'average': f"{float(row[5]):.2f}",
+            'name': str(row['name']),
+            'team': str(row['team']),
+            'wickets': int(float(row['wickets'])),
+            'economy': f"{float(row['economy']):.2f}",
+            'average': f"{float(row['average']):.2f}",
             'dbpedia': links['dbpedia'],
             'wikidata': links['wikidata']
         })
     
     return jsonify(results)
 
+@app.route('/api/suggest')
+def suggest():
+    """Typeahead API: players and teams whose name has a word starting with q"""
+    prefix = request.args.get('q', '')
+    limit = min(max(request.args.get('n', 10, type=int), 1), 50)
+    return conditional(*graph_validators(),
+                       lambda: jsonify(attach_suggest_index(current_graph()).suggest(prefix, limit)))
+
+# Async serving: uvicorn cricket_stats_professional_app:asgi_app
+asgi_app = AsyncApp(app, version=lambda: HOLDER.current().version, before=check_source)
+
 if __name__ == '__main__':
     print("=" * 80)
     print("PSL CRICKET STATISTICS - PROFESSIONAL DASHBOARD")
     print("=" * 80)
-    print(f"\n✓ Loaded {len(g)} RDF triples")
-    print(f"✓ External links: {len(list(g.triples((None, OWL.sameAs, None))))}")
+    print(f"\n✓ Loaded {len(current_graph())} RDF triples")
+    print(f"✓ External links: {len(attach_link_index(current_graph()))}")
     print("\n🌐 Starting professional web application...")
     print("📊 Open your browser at: http://localhost:5000")
     print("\nFeatures:")
@@ -844,8 +1070,10 @@ if __name__ == '__main__':
     print("  • Best Economy Rates")
     print("  • 5-Wicket Hauls")
     print("  • Team Statistics")
-    print("  • Player Search")
+    print("  • Player Search (with /api/suggest typeahead)")
     print("  • Links to DBpedia & Wikidata")
+    print("\nAdmin (X-Admin-Token = CRICKET_ADMIN_TOKEN): POST /admin/refresh rebuilds the leaderboards,")
+    print("       POST /admin/reload reloads changed data, both in the background; GET /stats")
     print("\nPress Ctrl+C to stop")
     print("=" * 80)
     
@@ -0,0 +1,113 @@
+"""
+On-disk cache of full-graph serializations for the /data endpoint
+Each format is serialized once per graph version and stored together with
+gzip and (if the brotli package is installed) brotli variants, so requests
+only stream a file.
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+# rdflib format -> file extension
+FORMAT_EXTENSIONS = {
+    'turtle': '.ttl',
+    'xml': '.rdf',
+    'json-ld': '.jsonld',
+    'nt': '.nt',
+}
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = {'br': '.br', 'gzip': '.gz'} if brotli else {'gzip': '.gz'}
+
+CHUNK_SIZE = 1 << 16
+
+def _gzip_file(source, destination):
+    with open(source, 'rb') as src, gzip.open(destination, 'wb', compresslevel=9) as out:
+        shutil.copyfileobj(src, out, CHUNK_SIZE)
+
+def _brotli_file(source, destination):
+    compressor = brotli.Compressor(quality=11)
+    with open(source, 'rb') as src, open(destination, 'wb') as out:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+            out.write(compressor.process(chunk))
+        out.write(compressor.finish())
+
+_COMPRESSORS = {'gzip': _gzip_file, 'br': _brotli_file}
+
+class DumpCache:
+    """Serialized graph files keyed by (graph version, format, encoding)
+
+    Files are written to a temporary name and renamed into place, so a
+    reader never sees a partial file. retain() (called when a new graph
+    version is swapped in) removes files of all but the current and the
+    previous version, so requests still pinned to the old snapshot, or
+    other workers not yet reloaded, keep their files.
+    """
+
+    # Graph versions whose files retain() keeps
+    KEEP_VERSIONS = 2
+
+    def __init__(self, cache_dir):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self._lock = threading.Lock()
+        self._versions = []
+
+    def path(self, version, fmt, encoding='identity'):
+        name = f"{version}{FORMAT_EXTENSIONS[fmt]}{ENCODINGS.get(encoding, '')}"
+        return os.path.join(self.cache_dir, name)
+
+    def ensure(self, g, version, fmt):
+        """Serialize `g` in `fmt` (plus compressed variants) unless already cached"""
+        wanted = [self.path(version, fmt)] + [self.path(version, fmt, enc) for enc in ENCODINGS]
+        if all(os.path.exists(p) for p in wanted):
+            return
+        with self._lock:
+            if all(os.path.exists(p) for p in wanted):
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+            plain = self.path(version, fmt)
+            tmp_dir = tempfile.mkdtemp(dir=self.cache_dir)
+            try:
+                tmp_plain = os.path.join(tmp_dir, "plain")
+                g.serialize(destination=tmp_plain, format=fmt)
+                for encoding in ENCODINGS:
+                    _COMPRESSORS[encoding](tmp_plain, os.path.join(tmp_dir, encoding))
+                for encoding in ENCODINGS:
+                    os.replace(os.path.join(tmp_dir, encoding), self.path(version, fmt, encoding))
+                os.replace(tmp_plain, plain)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def retain(self, version):
+        """Make `version` current and remove files of versions before the previous one"""
+        with self._lock:
+            if version in self._versions:
+                self._versions.remove(version)
+            self._versions = (self._versions + [version])[-self.KEEP_VERSIONS:]
+            if not os.path.isdir(self.cache_dir):
+                return
+            keep = tuple(v + "." for v in self._versions)
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if os.path.isfile(path) and not name.startswith(keep):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:  # another worker pruned it
+                        pass
+
+    def variant(self, g, version, fmt, accepted):
+        """(path, encoding) of the best cached variant for a client
+
+        `accepted` is the request's Accept-Encoding (a werkzeug Accept).
+        """
+        self.ensure(g, version, fmt)
+        encoding = accepted.best_match(list(ENCODINGS) + ['identity']) or 'identity'
+        return self.path(version, fmt, encoding), encoding
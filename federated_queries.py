@@ -4,24 +4,24 @@ Query local dataset + external sources (DBpedia, Wikidata)
 """
 
 from SPARQLWrapper import SPARQLWrapper, JSON
-from rdflib import Graph
 import json
 
+from graph_snapshot import load_graph_cached
+
 def query_local_and_dbpedia():
     """
     Federated query combining local data with DBpedia
     Gets player statistics and their Wikipedia abstracts
     """
     
-    # Load local graph
-    g = Graph()
+    # Load local graph (checks the data is there and keeps its snapshot current)
     try:
-        g.parse("bowling_stats_enhanced_linked.ttl", format="turtle")
+        load_graph_cached("bowling_stats_enhanced_linked.ttl")
     except:
         try:
-            g.parse("bowling_stats_linked.ttl", format="turtle")
+            load_graph_cached("bowling_stats_linked.ttl")
         except:
-            g.parse("bowling_stats_enhanced.ttl", format="turtle")
+            load_graph_cached("bowling_stats_enhanced.ttl")
     
     print("=" * 80)
     print("Federated Query 1: Local Data + DBpedia")
@@ -0,0 +1,157 @@
+"""
+Triple Pattern Fragments (Linked Data Fragments) over an rdflib Graph
+A fragment is one page of the triples matching a single pattern, together
+with a count of all matches and Hydra controls (first/previous/next page and
+a search form), so clients can join patterns themselves.
+
+Usage:
+    fragments = attach_fragment_index(g)
+    triples, total = fragments.page((None, RDF.type, None), page=1)
+    meta = fragment_metadata(url, page_url, dataset_url, template, total, 1, PAGE_SIZE, len(triples))
+    fragment_document(triples, meta, url, quads=True).serialize(format='nquads')
+"""
+
+from itertools import islice
+
+from rdflib import BNode, Dataset, Graph, Literal, Namespace, URIRef
+from rdflib.namespace import RDF, VOID, XSD
+from rdflib.util import from_n3
+
+from graph_index import GraphIndex
+
+HYDRA = Namespace("http://www.w3.org/ns/hydra/core#")
+
+PAGE_SIZE = 100
+
+# Query parameters of the search form and the RDF position each maps to
+PARAMETERS = (('subject', RDF.subject), ('predicate', RDF.predicate), ('object', RDF.object))
+
+def parse_term(value):
+    """Term for a request parameter (Hydra explicit representation), None if unbound
+
+    IRIs are given bare or in <...>; literals as "text", "text"@lang or
+    "text"^^<datatype>; an empty value or ?variable leaves the position open.
+    """
+    value = (value or '').strip()
+    if not value or value.startswith('?'):
+        return None
+    if value.startswith('"') or value.startswith('_:'):
+        return from_n3(value)
+    if value.startswith('<') and value.endswith('>'):
+        return URIRef(value[1:-1])
+    return URIRef(value)
+
+def format_term(term):
+    """Request parameter value for a term (inverse of parse_term)"""
+    if term is None:
+        return ''
+    if isinstance(term, URIRef):
+        return str(term)
+    return term.n3()
+
+class FragmentIndex(GraphIndex):
+    """Pages and match counts for triple patterns
+
+    Stores with sorted indexes (ArrayStore) count and slice a pattern's
+    index range directly, so any page costs the same. Other stores are
+    walked up to the page, and their counts are kept until the graph
+    changes.
+    """
+
+    MAX_COUNTS = 10000
+
+    def __init__(self, graph, page_size=PAGE_SIZE):
+        super().__init__(graph)
+        self.page_size = page_size
+        self._counts = {}
+
+    def build(self):
+        self._counts = {}
+
+    def count(self, pattern):
+        self.refresh()
+        if pattern == (None, None, None):
+            return len(self.graph)
+        count = getattr(self.graph.store, 'count', None)
+        if count is not None:
+            return count(pattern)
+        total = self._counts.get(pattern)
+        if total is None:
+            total = sum(1 for _ in self.graph.triples(pattern))
+            if len(self._counts) >= self.MAX_COUNTS:
+                self._counts.clear()
+            self._counts[pattern] = total
+        return total
+
+    def page(self, pattern, page=1):
+        """(triples on the 1-based page, total matches) for a pattern"""
+        start = (page - 1) * self.page_size
+        triples_slice = getattr(self.graph.store, 'triples_slice', None)
+        if triples_slice is not None:
+            triples = triples_slice(pattern, start, start + self.page_size)
+        else:
+            triples = list(islice(self.graph.triples(pattern), start, start + self.page_size))
+        return triples, self.count(pattern)
+
+def attach_fragment_index(graph):
+    """FragmentIndex for `graph`, created on first use"""
+    index = getattr(graph, 'fragment_index', None)
+    if index is None:
+        index = graph.fragment_index = FragmentIndex(graph)
+    index.refresh()
+    return index
+
+def fragment_metadata(fragment_url, page_url, dataset_url, template, total, page, page_size, count_on_page):
+    """Graph of the fragment's count and Hydra controls
+
+    page_url(n) is the URL of page n of the same fragment.
+    """
+    meta = Graph()
+    meta.bind('hydra', HYDRA)
+    meta.bind('void', VOID)
+    fragment = URIRef(fragment_url)
+    dataset = URIRef(dataset_url)
+
+    meta.add((dataset, RDF.type, VOID.Dataset))
+    meta.add((dataset, RDF.type, HYDRA.Collection))
+    meta.add((dataset, VOID.subset, fragment))
+    # Fixed blank node labels keep the bytes (and strong ETags) stable across processes
+    search = BNode('search')
+    meta.add((dataset, HYDRA.search, search))
+    meta.add((search, HYDRA.template, Literal(template)))
+    meta.add((search, HYDRA.variableRepresentation, HYDRA.ExplicitRepresentation))
+    for name, position in PARAMETERS:
+        mapping = BNode(f'mapping_{name}')
+        meta.add((search, HYDRA.mapping, mapping))
+        meta.add((mapping, HYDRA.variable, Literal(name)))
+        meta.add((mapping, HYDRA.property, position))
+
+    meta.add((fragment, RDF.type, HYDRA.PartialCollectionView))
+    meta.add((fragment, VOID.triples, Literal(total, datatype=XSD.integer)))
+    meta.add((fragment, HYDRA.totalItems, Literal(total, datatype=XSD.integer)))
+    meta.add((fragment, HYDRA.itemsPerPage, Literal(page_size, datatype=XSD.integer)))
+    meta.add((fragment, HYDRA.first, URIRef(page_url(1))))
+    if page > 1:
+        meta.add((fragment, HYDRA.previous, URIRef(page_url(page - 1))))
+    if count_on_page == page_size and page * page_size < total:
+        meta.add((fragment, HYDRA.next, URIRef(page_url(page + 1))))
+    return meta
+
+def fragment_document(triples, meta, fragment_url, quads, namespaces=()):
+    """Response graph: data and metadata together, or in separate graphs if `quads`
+
+    Quad formats (TriG, N-Quads) put the metadata in the named graph
+    <fragment_url#metadata> so clients can tell it apart from the data.
+    """
+    if quads:
+        document = Dataset()
+        target = document.graph(URIRef(fragment_url + '#metadata'))
+    else:
+        document = target = Graph()
+    for prefix, namespace in list(namespaces) + list(meta.namespaces()):
+        document.bind(prefix, namespace)
+    for triple in triples:
+        document.add(triple)
+    for triple in meta:
+        target.add(triple)
+    return document
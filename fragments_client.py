@@ -0,0 +1,183 @@
+"""
+Triple Pattern Fragments client
+Evaluates a basic graph pattern (a SELECT query with only triple patterns)
+against a /fragments endpoint: the pattern with the fewest matches is
+fetched first and its solutions are substituted into the remaining
+patterns, so all join work happens here and the server only answers
+single-pattern pages.
+
+Also a test harness for the endpoint: --check evaluates the same query on
+the local graph with rdflib and compares the solutions.
+
+Usage:
+    python fragments_client.py "SELECT * WHERE { ?s cricket:forPlayer ?p . ?p rdfs:label ?n }"
+    python fragments_client.py --endpoint http://localhost:5000/fragments QUERY
+    python fragments_client.py --local --check QUERY     # in-process app, no server
+"""
+
+import argparse
+import time
+import urllib.parse
+import urllib.request
+from collections import Counter
+
+from rdflib import Dataset, Variable
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+from rdflib.namespace import RDFS
+from rdflib.plugins.sparql import prepareQuery
+
+from fragments import HYDRA, format_term
+from star_index import CRICKET
+
+DEFAULT_ENDPOINT = "http://localhost:5000/fragments"
+
+# Prefixes available to queries without PREFIX declarations
+NAMESPACES = {'cricket': CRICKET, 'rdfs': RDFS}
+
+def http_fetch(url):
+    request = urllib.request.Request(url, headers={'Accept': 'application/n-quads'})
+    with urllib.request.urlopen(request) as response:
+        return response.read()
+
+def bgp_from_query(query, namespaces=NAMESPACES):
+    """(projected variables, triple patterns) of a SELECT over a single BGP"""
+    algebra = prepareQuery(query, initNs=namespaces).algebra
+    projected = list(algebra['PV'])
+    node = algebra['p']
+    if node.name == 'Project':
+        node = node['p']
+    if node.name != 'BGP':
+        raise ValueError(f"Only basic graph patterns are supported (got {node.name})")
+    return projected, list(node['triples'])
+
+class FragmentsClient:
+    """Reads fragments page by page and joins them locally
+
+    `fetch(url) -> bytes` returns an N-Quads fragment document; the default
+    uses HTTP. Counts each request for reporting.
+    """
+
+    def __init__(self, endpoint=DEFAULT_ENDPOINT, fetch=http_fetch):
+        self.endpoint = endpoint
+        self.fetch = fetch
+        self.requests = 0
+        self._first_pages = {}
+
+    def pattern_url(self, pattern):
+        params = {name: format_term(term) for name, term in zip(('subject', 'predicate', 'object'), pattern)
+                  if term is not None}
+        return self.endpoint + ('?' + urllib.parse.urlencode(params) if params else '')
+
+    def _page(self, url):
+        """(data triples, total matches, next page URL or None)"""
+        self.requests += 1
+        document = Dataset()
+        document.parse(data=self.fetch(url), format='nquads')
+        data = document.graph(DATASET_DEFAULT_GRAPH_ID)
+        total, next_url = 0, None
+        for graph in document.graphs():
+            if graph.identifier == DATASET_DEFAULT_GRAPH_ID:
+                continue
+            for _, _, value in graph.triples((None, HYDRA.totalItems, None)):
+                total = int(value)
+            for _, _, value in graph.triples((None, HYDRA.next, None)):
+                next_url = str(value)
+        return list(data), total, next_url
+
+    def _first_page(self, pattern):
+        if pattern not in self._first_pages:
+            self._first_pages[pattern] = self._page(self.pattern_url(pattern))
+        return self._first_pages[pattern]
+
+    def count(self, pattern):
+        """Server's match count for a pattern (None for unbound positions)"""
+        return self._first_page(pattern)[1]
+
+    def triples(self, pattern):
+        """All triples matching a pattern, following next-page links"""
+        triples, _, next_url = self._first_page(pattern)
+        yield from triples
+        while next_url:
+            triples, _, next_url = self._page(next_url)
+            yield from triples
+
+    def solve(self, patterns, binding=None):
+        """Yield solutions (dict Variable -> term) of a list of triple patterns"""
+        binding = binding or {}
+        if not patterns:
+            yield binding
+            return
+        bound = [tuple(binding.get(term, term) for term in pattern) for pattern in patterns]
+        lookups = [tuple(None if isinstance(term, Variable) else term for term in pattern)
+                   for pattern in bound]
+        # Greedy: the most selective pattern first
+        best = min(range(len(bound)), key=lambda i: self.count(lookups[i]))
+        if self.count(lookups[best]) == 0:
+            return
+        pattern = bound[best]
+        rest = bound[:best] + bound[best + 1:]
+        for triple in self.triples(lookups[best]):
+            extended = dict(binding)
+            for term, value in zip(pattern, triple):
+                if isinstance(term, Variable):
+                    if extended.setdefault(term, value) != value:
+                        break
+            else:
+                yield from self.solve(rest, extended)
+
+    def select(self, query):
+        """Rows (tuples in projection order) of a BGP-only SELECT query"""
+        projected, patterns = bgp_from_query(query)
+        for solution in self.solve(patterns):
+            yield tuple(solution.get(var) for var in projected)
+
+def local_fetch():
+    """fetch() that calls the publish app in-process through Flask's test client"""
+    from publish_linked_data import app
+    client = app.test_client()
+
+    def fetch(url):
+        response = client.get(url, headers={'Accept': 'application/n-quads'})
+        if response.status_code != 200:
+            raise RuntimeError(f"{url}: HTTP {response.status_code}")
+        return response.data
+    return fetch
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate a basic graph pattern over Triple Pattern Fragments")
+    parser.add_argument("query", help="SELECT query whose WHERE clause is only triple patterns")
+    parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT, help="fragments endpoint URL")
+    parser.add_argument("--local", action="store_true", help="query publish_linked_data.py in-process")
+    parser.add_argument("--check", action="store_true", help="compare with rdflib on the local graph")
+    parser.add_argument("--show", type=int, default=10, help="rows to print")
+    args = parser.parse_args()
+
+    if args.local:
+        client = FragmentsClient("http://localhost/fragments", fetch=local_fetch())
+    else:
+        client = FragmentsClient(args.endpoint)
+
+    print("=" * 80)
+    print("Triple Pattern Fragments query")
+    print("=" * 80)
+    start = time.perf_counter()
+    rows = list(client.select(args.query))
+    elapsed = time.perf_counter() - start
+    for row in rows[:args.show]:
+        print("  " + " | ".join("" if term is None else str(term) for term in row))
+    print(f"✓ {len(rows)} rows from {client.requests} fragment requests in {elapsed:.2f}s")
+
+    if args.check:
+        from publish_linked_data import g
+        projected, _ = bgp_from_query(args.query)
+        expected = Counter(tuple(row.get(var) for var in projected)
+                           for row in g.query(args.query, initNs=NAMESPACES).bindings)
+        if Counter(rows) == expected:
+            print(f"✓ Matches rdflib ({sum(expected.values())} rows)")
+        else:
+            print(f"✗ Differs from rdflib: {sum(expected.values())} expected rows, "
+                  f"{len(set(expected) - set(rows))} missing, {len(set(rows) - set(expected))} extra")
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
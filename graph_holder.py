@@ -0,0 +1,103 @@
+"""
+Read-only graph snapshots swapped atomically for the Flask apps
+A Snapshot bundles one loaded graph with its version and whatever was
+derived from it (indexes, materialized views). It is never modified after
+it is published: a reload builds a new Snapshot and swaps it in, so a request
+that started on the old version finishes on it.
+
+Usage:
+    holder = GraphHolder(Snapshot(graph, version))
+    holder.pin(app)                    # each request sees one snapshot
+    holder.snapshot().graph            # in a route
+    holder.update(lambda current: Snapshot(load(), new_version))
+"""
+
+import threading
+import time
+
+import flask
+
+from http_cache import file_last_modified
+
+class Snapshot:
+    """One graph version and the state derived from it
+
+    `data` holds app-specific derived values (e.g. dashboard views).
+    """
+
+    def __init__(self, graph, version, source=None, signature=None, digest=None, **data):
+        self.graph = graph
+        self.version = version
+        self.source = source
+        self.signature = signature
+        self.digest = digest
+        self.data = data
+        self.loaded_at = time.time()
+        # Of the file as loaded, not as it is on disk later
+        self.last_modified = file_last_modified(source)
+
+    def replace(self, **changes):
+        """Copy with some fields changed (same graph and derived data unless given)
+
+        The copy keeps the load time and Last-Modified of this snapshot:
+        they describe the content, which a new signature alone does not change.
+        """
+        fields = dict(self.data, graph=self.graph, version=self.version, source=self.source,
+                      signature=self.signature, digest=self.digest)
+        fields.update(changes)
+        snapshot = Snapshot(**fields)
+        snapshot.loaded_at = self.loaded_at
+        snapshot.last_modified = self.last_modified
+        return snapshot
+
+class GraphHolder:
+    """Readers-writer holder of the current Snapshot
+
+    Readers never lock: current() is a single reference read, which is
+    atomic. Writers are serialized by a lock, build the next snapshot while
+    readers keep using the current one, and publish it with one assignment.
+    """
+
+    def __init__(self, snapshot=None):
+        self._snapshot = snapshot
+        self._write_lock = threading.Lock()
+        self.swaps = 0
+
+    def current(self):
+        return self._snapshot
+
+    def update(self, build, blocking=True):
+        """Publish build(current) unless it returns None; return the current snapshot
+
+        With blocking=False an update already in progress is not waited
+        for: the caller gets the snapshot that is current now.
+        """
+        if not self._write_lock.acquire(blocking):
+            return self._snapshot
+        try:
+            snapshot = build(self._snapshot)
+            if snapshot is not None and snapshot is not self._snapshot:
+                self._snapshot = snapshot
+                self.swaps += 1
+            return self._snapshot
+        finally:
+            self._write_lock.release()
+
+    def pin(self, app, before=None):
+        """Give every request of `app` the snapshot current when it starts
+
+        `before()` (e.g. a cheap source-file check) runs first.
+        """
+        @app.before_request
+        def pin_graph_snapshot():
+            if before is not None:
+                before()
+            flask.g.graph_snapshot = self._snapshot
+
+    def snapshot(self):
+        """The request's pinned snapshot, or the current one outside requests"""
+        if flask.has_request_context():
+            pinned = flask.g.get('graph_snapshot')
+            if pinned is not None:
+                return pinned
+        return self._snapshot
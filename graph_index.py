@@ -0,0 +1,43 @@
+"""
+Base class for in-memory indexes derived from an rdflib Graph
+"""
+
+from rdflib.store import TripleAddedEvent, TripleRemovedEvent
+
+class GraphIndex:
+    """Index that rebuilds itself lazily when its graph changes
+
+    Added triples are seen through store events. Removals are caught by
+    comparing the graph size as well, because rdflib's Memory store does
+    not dispatch remove events. Subclasses implement build().
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._built_len = None
+        self._dirty = True
+        self.builds = 0
+        dispatcher = graph.store.dispatcher
+        dispatcher.subscribe(TripleAddedEvent, self._on_change)
+        dispatcher.subscribe(TripleRemovedEvent, self._on_change)
+
+    def _on_change(self, event):
+        self._dirty = True
+
+    def stale(self):
+        return self._dirty or self._built_len != len(self.graph)
+
+    def refresh(self):
+        """Rebuild the index if the graph changed"""
+        if self.stale():
+            self.rebuild()
+
+    def rebuild(self):
+        # Clear the flag first so changes made during build() are not lost
+        self._dirty = False
+        self._built_len = len(self.graph)
+        self.build()
+        self.builds += 1
+
+    def build(self):
+        raise NotImplementedError
@@ -0,0 +1,221 @@
+"""
+Binary graph snapshots for fast startup
+A snapshot sits next to its source file (e.g. data.ttl.snapshot) and holds
+dictionary-encoded terms plus an integer triple array, keyed by a SHA-256
+of the source so a stale snapshot is never used.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from rdflib import BNode, Graph, Literal, URIRef
+
+MAGIC = b"CKGSNAP1"
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# rdflib store used by load_graph_cached(): "default" (rdflib Memory),
+# "CricketArray" (array_store.ArrayStore, requires numpy) or "CricketMapped"
+# (read-only mapped_store.MappedStore over a <file>.image, requires numpy)
+DEFAULT_STORE = os.environ.get("CRICKET_GRAPH_STORE", "default")
+
+# Term kind codes
+_URI, _BNODE, _LITERAL = b"U"[0], b"B"[0], b"L"[0]
+
+def source_hash(path):
+    """SHA-256 digest of a source file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+def snapshot_path(source_path):
+    """Path of the snapshot belonging to a source file"""
+    return source_path + SNAPSHOT_SUFFIX
+
+def _uint32_array(values):
+    """array('I') in little-endian byte order"""
+    data = array('I', values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data
+
+def _read_uint32(buffer, offset, count):
+    data = array('I')
+    data.frombytes(buffer[offset:offset + 4 * count])
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data
+
+def _encode_term(term):
+    """(kind, value, extra) where extra is the language tag or datatype"""
+    if isinstance(term, Literal):
+        if term.language:
+            return _LITERAL, str(term), "@" + term.language
+        return _LITERAL, str(term), str(term.datatype) if term.datatype else ""
+    if isinstance(term, BNode):
+        return _BNODE, str(term), ""
+    return _URI, str(term), ""
+
+def _decode_term(kind, value, extra):
+    if kind == _URI:
+        return URIRef(value)
+    if kind == _BNODE:
+        return BNode(value)
+    if extra.startswith("@"):
+        return Literal(value, lang=extra[1:])
+    return Literal(value, datatype=URIRef(extra) if extra else None)
+
+def write_snapshot(g, path, digest):
+    """Write a graph snapshot tagged with the source digest
+
+    Layout: magic, 32-byte digest, header length + JSON header, one kind
+    byte per term, (value, extra) character lengths per term, the UTF-8
+    string blob and three uint32 term IDs per triple (little-endian).
+    """
+    ids = {}
+    kinds = bytearray()
+    lengths = []
+    strings = []
+    triples = []
+    for triple in g:
+        for term in triple:
+            term_id = ids.get(term)
+            if term_id is None:
+                term_id = ids[term] = len(kinds)
+                kind, value, extra = _encode_term(term)
+                kinds.append(kind)
+                lengths.extend((len(value), len(extra)))
+                strings.extend((value, extra))
+            triples.append(term_id)
+
+    blob = "".join(strings).encode('utf-8')
+    defaults = set(Graph().namespaces())
+    header = json.dumps({
+        'terms': len(kinds),
+        'triples': len(triples) // 3,
+        'blob_bytes': len(blob),
+        'namespaces': [[prefix, str(ns)] for prefix, ns in g.namespaces()
+                       if (prefix, ns) not in defaults],
+    }).encode('utf-8')
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(MAGIC)
+            out.write(digest)
+            out.write(struct.pack('<I', len(header)))
+            out.write(header)
+            out.write(kinds)
+            out.write(_uint32_array(lengths).tobytes())
+            out.write(blob)
+            out.write(_uint32_array(triples).tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def new_graph(store="default"):
+    """Empty Graph on a store named as for DEFAULT_STORE (except "CricketMapped")
+
+    ArrayStore is imported here, on first use, so numpy stays optional.
+    """
+    if store == "CricketArray":
+        from array_store import ArrayStore
+        return Graph(store=ArrayStore())
+    return Graph(store=store)
+
+def read_snapshot(path, digest=None, store="default"):
+    """Load a snapshot into a new Graph
+
+    Returns None if the file is not a snapshot or, when `digest` is
+    given, was built from a different version of the source.
+    """
+    with open(path, 'rb') as f:
+        buffer = f.read()
+    if buffer[:8] != MAGIC or (digest is not None and buffer[8:40] != digest):
+        return None
+
+    offset = 40
+    (header_len,) = struct.unpack_from('<I', buffer, offset)
+    offset += 4
+    header = json.loads(buffer[offset:offset + header_len])
+    offset += header_len
+
+    n_terms = header['terms']
+    kinds = buffer[offset:offset + n_terms]
+    offset += n_terms
+    lengths = _read_uint32(buffer, offset, 2 * n_terms)
+    offset += 8 * n_terms
+    text = buffer[offset:offset + header['blob_bytes']].decode('utf-8')
+    offset += header['blob_bytes']
+    triple_ids = _read_uint32(buffer, offset, 3 * header['triples'])
+
+    terms = []
+    pos = 0
+    for i in range(n_terms):
+        value_end = pos + lengths[2 * i]
+        extra_end = value_end + lengths[2 * i + 1]
+        terms.append(_decode_term(kinds[i], text[pos:value_end], text[value_end:extra_end]))
+        pos = extra_end
+
+    g = new_graph(store)
+    for prefix, ns in header['namespaces']:
+        g.bind(prefix, ns, replace=True)
+    if hasattr(g.store, 'load_ids'):
+        # Already dictionary-encoded: hand the IDs straight to the store
+        g.store.load_ids(terms, triple_ids)
+    else:
+        it = iter(triple_ids)
+        g.addN((terms[s], terms[p], terms[o], g) for s, p, o in zip(it, it, it))
+    return g
+
+def _load_mapped(path, format, digest):
+    """Graph over the memory-mapped image of a source, (re)building a stale image"""
+    import mapped_store
+    image = mapped_store.image_path(path)
+    with mapped_store.build_lock(image):
+        if os.path.exists(image):
+            try:
+                return mapped_store.open_image(image, digest)
+            except (OSError, ValueError, KeyError, struct.error):
+                pass
+        g = load_graph_cached(path, format, store="CricketArray")
+        try:
+            mapped_store.write_image(g, image, digest)
+        except OSError as e:
+            print(f"Warning: could not write image {image}: {e}")
+            return g
+        return mapped_store.open_image(image, digest)
+
+def load_graph_cached(path, format="turtle", store=None):
+    """Load an RDF file, using its binary snapshot when it is fresh
+
+    Falls back to parsing the source (and refreshing the snapshot) when
+    the snapshot is missing, unreadable or built from another version.
+    `store` picks the rdflib store (default: DEFAULT_STORE).
+    """
+    store = store or DEFAULT_STORE
+    digest = source_hash(path)
+    if store == "CricketMapped":
+        return _load_mapped(path, format, digest)
+    snapshot = snapshot_path(path)
+    if os.path.exists(snapshot):
+        try:
+            g = read_snapshot(snapshot, digest, store)
+            if g is not None:
+                return g
+        except (OSError, ValueError, KeyError, struct.error):
+            pass
+
+    g = new_graph(store)
+    g.parse(path, format=format)
+    try:
+        write_snapshot(g, snapshot, digest)
+    except OSError as e:
+        print(f"Warning: could not write snapshot {snapshot}: {e}")
+    return g
@@ -0,0 +1,163 @@
+"""
+Background graph reloads for the Flask apps
+A Reloader builds the next Snapshot (parse, indexes, warmed caches) in a
+background thread while requests keep using the current one, then swaps it
+in through the GraphHolder. Reloads are started by a file watcher, by a
+cheap per-request source check, or by an admin endpoint, and are timed for
+the stats endpoints.
+
+Usage:
+    reloader = Reloader(holder, build_snapshot, changed=source_changed,
+                        warm=render_pages, on_swap=clear_caches)
+    reloader.watch(interval=2.0)       # poll the source file
+    reloader.trigger()                 # reload in the background
+    reloader.reload()                  # reload now, return the served snapshot
+"""
+
+import os
+import threading
+import time
+import traceback
+
+def source_signature(path):
+    """(mtime, size) of the source file, or None"""
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _same_content(snapshot, other):
+    """True for a copy of the same version (e.g. only the file's mtime changed)"""
+    return other is not None and snapshot.version == other.version
+
+class Reloader:
+    """Loads new graph versions off the request path and swaps them in
+
+    `build(current)` returns the next Snapshot or None if nothing changed.
+    A snapshot of the same version (the file was touched, not changed)
+    only records the new signature: it is not warmed, counted as a reload
+    or passed to on_swap.
+    `changed()` is a cheap check (e.g. mtime/size) for the watcher.
+    `warm(snapshot)` fills caches before the swap, and `on_swap(snapshot)`
+    runs after it (e.g. to drop caches of the old version).
+    """
+
+    def __init__(self, holder, build, changed=None, warm=None, on_swap=None):
+        self.holder = holder
+        self.build = build
+        self.changed = changed or (lambda: False)
+        self.warm = warm
+        self.on_swap = on_swap
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pending = None
+        self._watcher = None
+        self.reloads = 0
+        self.failures = 0
+        self.last_duration = None
+        self.max_duration = None
+        self.total_duration = 0.0
+        self.last_reload_at = None
+        self.last_error = None
+
+    def reload(self, build=None):
+        """Build and swap in the next snapshot now; return the snapshot being served
+
+        A failed build is recorded and the current snapshot stays in place.
+        """
+        build = build or self.build
+
+        def build_and_warm(current):
+            snapshot = build(current)
+            if (snapshot is not None and snapshot is not current and self.warm is not None
+                    and not _same_content(snapshot, current)):
+                self.warm(snapshot)
+            return snapshot
+
+        start = time.perf_counter()
+        before = self.holder.current()
+        try:
+            snapshot = self.holder.update(build_and_warm)
+        except Exception as e:
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"✗ Reload failed, still serving {before.version}: {self.last_error}")
+            traceback.print_exc()
+            return before
+        if snapshot is not before and not _same_content(snapshot, before):
+            duration = time.perf_counter() - start
+            self.reloads += 1
+            self.last_duration = duration
+            self.max_duration = max(self.max_duration or 0.0, duration)
+            self.total_duration += duration
+            self.last_reload_at = time.time()
+            self.last_error = None
+            if self.on_swap is not None:
+                self.on_swap(snapshot)
+        return snapshot
+
+    def trigger(self, build=None):
+        """Reload in a background thread; True if one was started
+
+        A trigger while a reload is running queues one more run after it,
+        so a change that lands mid-reload is not missed.
+        """
+        with self._lock:
+            if self._thread is not None:
+                self._pending = build or self.build
+                return False
+            self._pending = build or self.build
+            self._thread = threading.Thread(target=self._run, name="graph-reload", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self):
+        while True:
+            with self._lock:
+                build, self._pending = self._pending, None
+                if build is None:
+                    self._thread = None
+                    return
+            self.reload(build)
+
+    @property
+    def in_progress(self):
+        return self._thread is not None
+
+    def check(self):
+        """Trigger a background reload if changed() says the source changed"""
+        if not self.in_progress and self.changed():
+            self.trigger()
+
+    def watch(self, interval=2.0):
+        """Poll changed() every `interval` seconds in a daemon thread"""
+        if self._watcher is not None or not interval:
+            return
+
+        def poll():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.check()
+                except Exception as e:
+                    print(f"✗ Source check failed: {e}")
+
+        self._watcher = threading.Thread(target=poll, name="graph-watch", daemon=True)
+        self._watcher.start()
+
+    def stats(self):
+        snapshot = self.holder.current()
+        return {
+            'graph_version': snapshot.version if snapshot else None,
+            'source': snapshot.source if snapshot else None,
+            'loaded_at': snapshot.loaded_at if snapshot else None,
+            'reloads': self.reloads,
+            'failures': self.failures,
+            'in_progress': self.in_progress,
+            'watching': self._watcher is not None,
+            'last_reload_at': self.last_reload_at,
+            'last_duration_seconds': self.last_duration,
+            'max_duration_seconds': self.max_duration,
+            'total_duration_seconds': round(self.total_duration, 3),
+            'last_error': self.last_error,
+        }
@@ -0,0 +1,54 @@
+"""
+HTTP conditional request helpers shared by the Flask apps
+Strong ETags derived from the graph version, Last-Modified from the data
+file, and 304 Not Modified for matching If-None-Match/If-Modified-Since.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from flask import make_response, request
+from werkzeug.http import is_resource_modified
+
+# Clients and CDNs may store responses but must revalidate them (cheap 304s)
+CACHE_CONTROL = "public, no-cache"
+
+def file_last_modified(path):
+    """Modification time of a file as an aware UTC datetime (whole seconds), or None"""
+    if not path or not os.path.exists(path):
+        return None
+    return datetime.fromtimestamp(int(os.path.getmtime(path)), tz=timezone.utc)
+
+def make_etag(version, *variant):
+    """Strong ETag for one representation of a resource at a graph version
+
+    The method is not part of it: HEAD describes the same representation as GET.
+    """
+    key = "\x1f".join((str(version), request.full_path) + tuple(map(str, variant)))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+def conditional(version, last_modified, build, vary=None, variant=()):
+    """Answer 304 when the client's validators match, else build() with validators
+
+    `build` is only called for a full response. `vary` names request headers
+    that select the representation (e.g. "Accept"); their values are part
+    of the ETag as well as the Vary header.
+    """
+    vary_headers = [vary] if isinstance(vary, str) else list(vary or ())
+    etag = make_etag(version, *variant, *(request.headers.get(h, '') for h in vary_headers))
+
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = make_response('', 304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            # Errors are not cacheable representations of the resource
+            return response
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    for header in vary_headers:
+        response.vary.add(header)
+    return response
@@ -2,22 +2,35 @@
 Enhanced CSV to RDF Converter using the Enhanced Ontology
 """
 
+import argparse
 import csv
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from rdflib import Graph, Namespace, Literal, URIRef
 from rdflib.namespace import RDF, RDFS, XSD, OWL, DCTERMS, FOAF
 
-# Define namespaces
-CRICKET = Namespace("http://example.org/cricket/ontology#")
-PLAYER = Namespace("http://example.org/cricket/resource/player/")
-TEAM = Namespace("http://example.org/cricket/resource/team/")
-STATS = Namespace("http://example.org/cricket/resource/stats/")
-SCHEMA = Namespace("http://schema.org/")
-DBPEDIA = Namespace("http://dbpedia.org/resource/")
+try:
+    import numpy as np
+except ImportError:  # Columnar ingest is optional
+    np = None
 
-def clean_uri_string(s):
-    """Clean string for use in URI following RFC 3986"""
-    return s.replace(" ", "_").replace(".", "").replace("/", "_").replace("'", "")
+from rdf_terms import TERMS
+
+# Define namespaces (terms are interned, so repeated URIs share one object)
+CRICKET = TERMS.namespace("http://example.org/cricket/ontology#")
+PLAYER = TERMS.namespace("http://example.org/cricket/resource/player/")
+TEAM = TERMS.namespace("http://example.org/cricket/resource/team/")
+STATS = TERMS.namespace("http://example.org/cricket/resource/stats/")
+SCHEMA = TERMS.namespace("http://schema.org/")
+DBPEDIA = TERMS.namespace("http://dbpedia.org/resource/")
 
 def convert_to_float(value):
     """Convert string to float, return None if empty or invalid"""
@@ -39,22 +52,576 @@ def classify_performance(wickets, economy):
             return CRICKET.PoorPerformance
     return CRICKET.BowlingStatistics
 
+DATASET_URI = URIRef("http://example.org/cricket/dataset/bowling-statistics")
+
+# CSV column -> (ontology property, datatype) for numeric statistics
+NUMERIC_FIELDS = {
+    'Mat': ('matches', XSD.integer),
+    'Inns': ('innings', XSD.float),
+    'Overs': ('overs', XSD.float),
+    'Mdns': ('maidens', XSD.float),
+    'Runs': ('runsConceded', XSD.float),
+    'Wkts': ('wickets', XSD.float),
+    'Ave': ('average', XSD.float),
+    'Econ': ('economy', XSD.float),
+    'SR': ('strikeRate', XSD.float),
+    '4': ('fourWickets', XSD.float),
+    '5': ('fiveWickets', XSD.float),
+    'Ct': ('catches', XSD.integer),
+    'St': ('stumpings', XSD.integer)
+}
+NUMERIC_PREDICATES = {field: CRICKET[rdf_property] for field, (rdf_property, _) in NUMERIC_FIELDS.items()}
+
+def provenance_triples(dataset_uri):
+    """Yield dataset metadata triples (VOID + Dublin Core)"""
+    VOID = Namespace("http://rdfs.org/ns/void#")
+    
+    yield (dataset_uri, RDF.type, VOID.Dataset)
+    yield (dataset_uri, DCTERMS.title, Literal("Cricket Bowling Statistics Dataset", lang="en"))
+    yield (dataset_uri, DCTERMS.description, Literal("PSL bowling statistics using enhanced ontology", lang="en"))
+    yield (dataset_uri, DCTERMS.created, Literal(datetime.now().isoformat(), datatype=XSD.dateTime))
+    yield (dataset_uri, DCTERMS.creator, Literal("Cricket Statistics Project"))
+    yield (dataset_uri, DCTERMS.source, Literal("bowlingAvg_clean.csv"))
+    yield (dataset_uri, DCTERMS.license, URIRef("http://creativecommons.org/licenses/by/4.0/"))
+
 def add_provenance(g, dataset_uri):
     
     # Use VOID vocabulary for dataset
-    VOID = Namespace("http://rdfs.org/ns/void#")
-    g.bind("void", VOID)
+    g.bind("void", Namespace("http://rdfs.org/ns/void#"))
+    
+    for triple in provenance_triples(dataset_uri):
+        g.add(triple)
+
+def stats_record_key(row):
+    """Natural key of a statistics record: player and team names"""
+    return f"{row['Player']}|{row['Team Name']}"
+
+def stats_record_id(row, seen):
+    """Derive a stable, content-based ID for a row's statistics node
+    
+    The ID hashes the player and team names, so inserting or deleting
+    other rows never renumbers it. `seen` counts earlier rows with the
+    same key, which separates namesakes playing for the same team.
+    """
+    key = stats_record_key(row)
+    occurrence = seen.get(key, 0)
+    seen[key] = occurrence + 1
+    if occurrence:
+        key = f"{key}|{occurrence}"
+    return "bowling_stats_" + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+def iter_records(csv_file):
+    """Yield (stats_id, row) for every row of a CSV file"""
+    seen = {}
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield stats_record_id(row, seen), row
+
+def row_to_triples(stats_id, row, dataset_uri=DATASET_URI):
+    """Yield the triples for a single CSV row"""
+    # Get statistics for classification
+    wickets = convert_to_float(row['Wkts'])
+    economy = convert_to_float(row['Econ'])
+    
+    # Classify performance
+    performance_class = classify_performance(wickets, economy)
+    
+    numeric_literals = (
+        (NUMERIC_PREDICATES[csv_field], numeric_literal(convert_to_float(row[csv_field]), datatype))
+        for csv_field, (_, datatype) in NUMERIC_FIELDS.items()
+    )
+    
+    yield from record_triples(stats_id, row['Player'], row['Team Name'], row['Span'], row['BBI'],
+                              numeric_literals, performance_class, dataset_uri)
+
+def numeric_literal(value, datatype):
+    """Typed literal for a parsed numeric cell, or None if the cell is empty"""
+    if value is None:
+        return None
+    return TERMS.literal(value, datatype=datatype)
+
+def record_triples(stats_id, player_name, team_name, span, bbi, numeric_literals,
+                   performance_class, dataset_uri=DATASET_URI):
+    """Yield the triples for one parsed statistics record
+    
+    `numeric_literals` holds (predicate, literal) pairs; None literals
+    are skipped.
+    """
+    # Create URIs
+    player_uri = TERMS.resource(PLAYER, player_name)
+    team_uri = TERMS.resource(TEAM, team_name)
+    stats_uri = STATS[stats_id]
+    
+    # Player information (using enhanced ontology)
+    yield (player_uri, RDF.type, CRICKET.Player)
+    yield (player_uri, RDF.type, CRICKET.Bowler)  # All are bowlers in this dataset
+    yield (player_uri, RDF.type, SCHEMA.Person)
+    yield (player_uri, FOAF.name, TERMS.literal(player_name, datatype=XSD.string))
+    yield (player_uri, RDFS.label, TERMS.literal(player_name, lang="en"))
+    yield (player_uri, CRICKET.playsFor, team_uri)
+    yield (player_uri, SCHEMA.memberOf, team_uri)
+    
+    # Team information (using enhanced ontology)
+    yield (team_uri, RDF.type, CRICKET.Team)
+    yield (team_uri, RDF.type, CRICKET.PSLTeam)  # PSL team type
+    yield (team_uri, RDF.type, SCHEMA.SportsTeam)
+    yield (team_uri, SCHEMA.name, TERMS.literal(team_name, datatype=XSD.string))
+    yield (team_uri, RDFS.label, TERMS.literal(team_name, lang="en"))
+    yield (team_uri, SCHEMA.sport, DBPEDIA.Cricket)
+    yield (team_uri, CRICKET.hasPlayer, player_uri)  # Inverse property
+    
+    # Bowling statistics (with performance classification)
+    yield (stats_uri, RDF.type, CRICKET.BowlingStatistics)
+    yield (stats_uri, RDF.type, performance_class)  # Add performance classification
+    yield (stats_uri, CRICKET.forPlayer, player_uri)
+    yield (stats_uri, CRICKET.forTeam, team_uri)
+    # Link to dataset using Dublin Core
+    yield (stats_uri, DCTERMS.source, dataset_uri)
+    
+    # Add span
+    if span:
+        yield (stats_uri, CRICKET.span, TERMS.literal(span, datatype=XSD.string))
+    
+    # Add numeric statistics with proper datatypes
+    for predicate, literal in numeric_literals:
+        if literal is not None:
+            yield (stats_uri, predicate, literal)
+    
+    # Add best bowling innings
+    if bbi:
+        yield (stats_uri, CRICKET.bestBowlingInnings, TERMS.literal(bbi, datatype=XSD.string))
+
+# Performance class per code used by the columnar classifier
+PERFORMANCE_CLASSES = [
+    CRICKET.BowlingStatistics,
+    CRICKET.ExcellentPerformance,
+    CRICKET.GoodPerformance,
+    CRICKET.AveragePerformance,
+    CRICKET.PoorPerformance,
+]
+
+def parse_float_column(values):
+    """Parse a column of strings like convert_to_float, in one pass
+    
+    Returns (floats, present): a float64 array and a boolean mask that is
+    False where convert_to_float would return None (empty, blank or
+    invalid cells). A separate mask is needed because "nan" is a valid
+    float and must not be confused with a missing value.
+    """
+    strings = np.asarray(values, dtype=str)
+    present = np.char.str_len(np.char.strip(strings)) > 0
+    floats = np.full(len(strings), np.nan)
+    try:
+        floats[present] = strings[present].astype(np.float64)
+    except ValueError:
+        # Some cells are not numbers: fall back to per-cell parsing for this column
+        for i in np.flatnonzero(present):
+            value = convert_to_float(strings[i])
+            if value is None:
+                present[i] = False
+            else:
+                floats[i] = value
+    return floats, present
+
+def literal_column(floats, present, datatype):
+    """Typed literals for a parsed column, one shared Literal per distinct value
+    
+    Distinct values are found on the raw float bits, so -0.0/0.0 and NaN
+    keep their own lexical forms. Absent cells map to None.
+    """
+    literals = [None] * len(floats)
+    indices = np.flatnonzero(present)
+    if len(indices):
+        bits, inverse = np.unique(floats[indices].view(np.int64), return_inverse=True)
+        unique_literals = [numeric_literal(value, datatype) for value in bits.view(np.float64).tolist()]
+        for i, u in zip(indices.tolist(), inverse.ravel().tolist()):
+            literals[i] = unique_literals[u]
+    return literals
+
+def classify_performance_columns(wickets, wickets_present, economy, economy_present):
+    """Vectorized classify_performance returning PERFORMANCE_CLASSES codes"""
+    # classify_performance tests truthiness: None and 0.0 are unclassified
+    classified = wickets_present & (wickets != 0) & economy_present & (economy != 0)
+    with np.errstate(invalid='ignore'):
+        codes = np.select(
+            [(wickets >= 50) & (economy < 7.5), wickets >= 20, wickets >= 10],
+            [1, 2, 3],
+            default=4,
+        )
+    return np.where(classified, codes, 0)
+
+def columnar_data_triples(csv_file, dataset_uri=DATASET_URI):
+    """Yield the data triples for a CSV using columnar NumPy parsing
+    
+    The whole file is loaded into columns, all numeric fields are parsed
+    and the performance class computed with array operations; triples are
+    then emitted from the parsed columns, building each distinct literal
+    once. Produces the same triples as row_to_triples().
+    """
+    if np is None:
+        raise ImportError("numpy is required for columnar ingest (pip install numpy)")
+    
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for row in reader if row]
+    if not rows:
+        return
+    columns = {name: [row[i] if i < len(row) else '' for row in rows]
+               for i, name in enumerate(header)}
+    
+    parsed = {field: parse_float_column(columns[field]) for field in NUMERIC_FIELDS}
+    codes = classify_performance_columns(*parsed['Wkts'], *parsed['Econ']).tolist()
+    
+    numeric_columns = [
+        (NUMERIC_PREDICATES[field], literal_column(*parsed[field], datatype))
+        for field, (_, datatype) in NUMERIC_FIELDS.items()
+    ]
+    
+    seen = {}
+    players, teams = columns['Player'], columns['Team Name']
+    spans, bbis = columns['Span'], columns['BBI']
+    for i in range(len(rows)):
+        stats_id = stats_record_id({'Player': players[i], 'Team Name': teams[i]}, seen)
+        numeric_literals = [(predicate, literals[i]) for predicate, literals in numeric_columns]
+        yield from record_triples(stats_id, players[i], teams[i], spans[i], bbis[i],
+                                  numeric_literals, PERFORMANCE_CLASSES[codes[i]], dataset_uri)
+
+def data_triples(csv_file, dataset_uri=DATASET_URI, columnar=False):
+    """Yield the data triples for a CSV, row by row or columnar"""
+    if columnar:
+        yield from columnar_data_triples(csv_file, dataset_uri)
+    else:
+        for stats_id, row in iter_records(csv_file):
+            yield from row_to_triples(stats_id, row, dataset_uri)
+
+def csv_to_triples(csv_file, dataset_uri=DATASET_URI, columnar=False):
+    """Yield every triple for a CSV file"""
+    yield from provenance_triples(dataset_uri)
+    yield from data_triples(csv_file, dataset_uri, columnar)
+
+def ntriples_line(triple):
+    """Format a single triple as an N-Triples line"""
+    s, p, o = triple
+    return f"{s.n3()} {p.n3()} {o.n3()} .\n"
+
+def open_ntriples(output_file):
+    """Open an N-Triples output file, gzip-compressed if it ends in .gz"""
+    if output_file.endswith('.gz'):
+        return gzip.open(output_file, 'wt', encoding='utf-8', newline='')
+    return open(output_file, 'w', encoding='utf-8', newline='')
+
+def convert_csv_to_ntriples_streaming(csv_file, output_file):
+    """Stream CSV rows straight to N-Triples without building a Graph
+    
+    Memory use is constant in the number of rows. Repeated player and
+    team triples are written once per row; any RDF parser collapses
+    them, so the resulting graph is identical to the in-memory path.
+    """
+    count = 0
+    with open_ntriples(output_file) as out:
+        for triple in csv_to_triples(csv_file):
+            out.write(ntriples_line(triple))
+            count += 1
+    
+    print(f"✓ Streamed RDF dataset created successfully!")
+    print(f"  - N-Triples: {output_file}")
+    print(f"  - Triples written: {count}")
+    
+    return count
+
+def row_hash(row):
+    """Hash every column of a CSV row to detect changed records"""
+    return hashlib.sha1(json.dumps(row, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _row_lines(row_items, dataset_uri=DATASET_URI):
+    """N-Triples lines produced by a collection of (stats_id, row) pairs"""
+    return {ntriples_line(t) for stats_id, row in row_items for t in row_to_triples(stats_id, row, dataset_uri)}
+
+def _load_manifest(manifest_file):
+    if not os.path.exists(manifest_file):
+        return {}
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        return json.load(f)['rows']
+
+def _write_atomic(path, write):
+    """Write a file through a temporary sibling and rename it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as out:
+            write(out)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def convert_csv_incremental(csv_file, output_file, manifest_file=None, patch_file=None):
+    """Convert only the rows that changed since the previous run
+    
+    The manifest maps each stats ID to its row hash (and the row itself,
+    so the triples of a removed or changed row can be regenerated). The
+    merged output is kept as sorted N-Triples, so applying a patch is a
+    streaming merge rather than a full re-serialization. Removals and
+    additions are also written to `patch_file` in RDF Patch syntax
+    (`D`/`A` lines). Player and team triples are only removed once no
+    remaining row produces them.
+    """
+    manifest_file = manifest_file or output_file + '.manifest.json'
+    patch_file = patch_file or output_file + '.patch'
+    
+    previous = _load_manifest(manifest_file) if os.path.exists(output_file) else {}
+    current = {stats_id: row for stats_id, row in iter_records(csv_file)}
+    hashes = {stats_id: row_hash(row) for stats_id, row in current.items()}
+    
+    added_ids = [i for i in current if i not in previous]
+    removed_ids = [i for i in previous if i not in current]
+    changed_ids = [i for i in current if i in previous and previous[i]['hash'] != hashes[i]]
+    
+    old_rows = [(i, previous[i]['row']) for i in removed_ids + changed_ids]
+    new_rows = [(i, current[i]) for i in added_ids + changed_ids]
+    old_lines = _row_lines(old_rows)
+    new_lines = _row_lines(new_rows)
+    
+    # Shared player/team triples survive while an untouched row still emits them
+    touched = {(row['Player'], row['Team Name']) for _, row in old_rows}
+    players = {player for player, _ in touched}
+    teams = {team for _, team in touched}
+    untouched = set(current) - set(added_ids) - set(changed_ids)
+    kept_lines = _row_lines((i, current[i]) for i in untouched
+                            if current[i]['Player'] in players or current[i]['Team Name'] in teams)
+    
+    removed = old_lines - new_lines - kept_lines
+    added = new_lines - old_lines
+    if not previous:
+        added |= {ntriples_line(t) for t in provenance_triples(DATASET_URI)}
+    
+    # Merge the sorted previous output with the sorted additions
+    existing = set()
+    def write_merged(out):
+        old = open(output_file, 'r', encoding='utf-8') if previous else iter(())
+        try:
+            last = None
+            for line in heapq.merge(old, sorted(added)):
+                if line == last:
+                    existing.add(line)
+                    continue
+                last = line
+                if line not in removed:
+                    out.write(line)
+        finally:
+            if previous:
+                old.close()
+    
+    if added or removed or not os.path.exists(output_file):
+        _write_atomic(output_file, write_merged)
+    added -= existing
+    
+    def write_patch(out):
+        out.writelines(f"D {line}" for line in sorted(removed))
+        out.writelines(f"A {line}" for line in sorted(added))
+    _write_atomic(patch_file, write_patch)
+    
+    def write_manifest(out):
+        json.dump({
+            'source': os.path.basename(csv_file),
+            'rows': {i: {'hash': hashes[i], 'row': row} for i, row in current.items()}
+        }, out)
+    _write_atomic(manifest_file, write_manifest)
+    
+    print(f"✓ Incremental RDF conversion complete!")
+    print(f"  - Rows added: {len(added_ids)}, changed: {len(changed_ids)}, removed: {len(removed_ids)}")
+    print(f"  - Patch: {patch_file} (+{len(added)} / -{len(removed)} triples)")
+    print(f"  - Merged N-Triples: {output_file}")
+    print(f"  - Manifest: {manifest_file}")
+    
+    return {'added': added, 'removed': removed}
+
+def csv_byte_ranges(csv_file, shards):
+    """Split a CSV file into byte ranges that start and end on row boundaries
+    
+    Assumes one record per physical line (no quoted newlines), which holds
+    for the stat dumps this converter reads.
+    """
+    size = os.path.getsize(csv_file)
+    with open(csv_file, 'rb') as f:
+        f.readline()  # Skip header
+        bounds = [f.tell()]
+        for i in range(1, shards):
+            target = bounds[0] + (size - bounds[0]) * i // shards
+            if target <= bounds[-1]:
+                continue
+            f.seek(target)
+            f.readline()  # Advance to the next row boundary
+            if f.tell() >= size:
+                break
+            bounds.append(f.tell())
+        bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+def _read_shard_rows(csv_file, start, end):
+    """Yield CSV rows (as dicts) for one byte range of the file"""
+    with open(csv_file, 'rb') as f:
+        fieldnames = next(csv.reader([f.readline().decode('utf-8')]))
+        f.seek(start)
+        
+        def lines():
+            while f.tell() < end:
+                line = f.readline()
+                if not line:
+                    break
+                yield line.decode('utf-8')
+        
+        yield from csv.DictReader(lines(), fieldnames=fieldnames)
+
+def _count_shard_keys(csv_file, start, end):
+    """Worker: count natural keys in a shard (for namesake ordinals)"""
+    return Counter(stats_record_key(row) for row in _read_shard_rows(csv_file, start, end))
+
+def _convert_shard(csv_file, start, end, seen, shard_file):
+    """Worker: convert one shard to sorted, de-duplicated N-Triples"""
+    lines = set()
+    rows = 0
+    for row in _read_shard_rows(csv_file, start, end):
+        stats_id = stats_record_id(row, seen)
+        lines.update(ntriples_line(t) for t in row_to_triples(stats_id, row))
+        rows += 1
+    with open(shard_file, 'w', encoding='utf-8', newline='') as out:
+        out.writelines(sorted(lines))
+    return rows
+
+def convert_csv_sharded(csv_file, output_file, workers=None):
+    """Convert a large CSV across worker processes, one byte range each
+    
+    A first pass counts player/team keys per shard, so each worker can
+    continue the namesake numbering of stats_record_id() where earlier
+    shards left off. Each worker then writes its shard as sorted
+    N-Triples and the shards are merged, dropping the player and team
+    triples repeated across shards. Output is sorted N-Triples (gzip if
+    it ends in .gz).
+    """
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    ranges = csv_byte_ranges(csv_file, workers)
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(output_file)))
+    shard_files = [os.path.join(tmp_dir, f"shard_{i}.nt") for i in range(len(ranges))]
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(_count_shard_keys, [csv_file] * len(ranges),
+                                   *zip(*ranges))) if len(ranges) > 1 else [Counter()]
+            
+            # Occurrences of each key in earlier shards
+            offsets = []
+            cumulative = Counter()
+            for shard_counts in counts:
+                offsets.append({key: cumulative[key] for key in shard_counts if key in cumulative})
+                cumulative.update(shard_counts)
+            
+            rows = sum(pool.map(_convert_shard, [csv_file] * len(ranges),
+                                *zip(*ranges), offsets, shard_files))
+        
+        provenance = sorted(ntriples_line(t) for t in provenance_triples(DATASET_URI))
+        shard_handles = [open(path, 'r', encoding='utf-8') for path in shard_files]
+        triples = 0
+        try:
+            with open_ntriples(output_file) as out:
+                last = None
+                for line in heapq.merge(provenance, *shard_handles):
+                    if line != last:
+                        out.write(line)
+                        triples += 1
+                        last = line
+        finally:
+            for handle in shard_handles:
+                handle.close()
+    finally:
+        for path in shard_files:
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(tmp_dir)
     
-    g.add((dataset_uri, RDF.type, VOID.Dataset))
-    g.add((dataset_uri, DCTERMS.title, Literal("Cricket Bowling Statistics Dataset", lang="en")))
-    g.add((dataset_uri, DCTERMS.description, Literal("PSL bowling statistics using enhanced ontology", lang="en")))
-    g.add((dataset_uri, DCTERMS.created, Literal(datetime.now().isoformat(), datatype=XSD.dateTime)))
-    g.add((dataset_uri, DCTERMS.creator, Literal("Cricket Statistics Project")))
-    g.add((dataset_uri, DCTERMS.source, Literal("bowlingAvg_clean.csv")))
-    g.add((dataset_uri, DCTERMS.license, URIRef("http://creativecommons.org/licenses/by/4.0/")))
+    elapsed = time.perf_counter() - start_time
+    print(f"✓ Sharded RDF conversion complete!")
+    print(f"  - N-Triples: {output_file}")
+    print(f"  - Shards: {len(ranges)}, rows: {rows}, triples: {triples}")
+    print(f"  - Throughput: {rows / elapsed:,.0f} rows/sec ({elapsed:.2f}s)")
+    
+    return rows, elapsed
+
+# Output format name -> (file extension, rdflib serializer, display label)
+SERIALIZATION_FORMATS = {
+    'turtle': ('.ttl', 'turtle', 'Turtle'),
+    'xml': ('.rdf', 'xml', 'RDF/XML'),
+    'json-ld': ('.jsonld', 'json-ld', 'JSON-LD'),
+    'nt': ('.nt', 'nt', 'N-Triples'),
+}
+DEFAULT_FORMATS = ('turtle', 'xml', 'json-ld')
+
+def format_destination(output_file, fmt):
+    """Derive the output path for a format: the output path with the format's extension"""
+    return os.path.splitext(output_file)[0] + SERIALIZATION_FORMATS[fmt][0]
+
+def _serialize_from_ntriples(nt_file, namespaces, destination, fmt):
+    """Worker: load the canonical N-Triples file and write one format"""
+    start = time.perf_counter()
+    g = Graph()
+    for prefix, namespace in namespaces:
+        g.bind(prefix, namespace)
+    g.parse(nt_file, format='nt')
+    g.serialize(destination=destination, format=SERIALIZATION_FORMATS[fmt][1])
+    return time.perf_counter() - start
+
+def serialize_formats(g, output_file, formats=DEFAULT_FORMATS, workers=None):
+    """Serialize a graph to several formats, in parallel across processes
+    
+    The graph is written once as sorted N-Triples, which every worker
+    parses independently, so no rdflib objects cross process boundaries.
+    With a single format or workers=1 the graph is serialized in-process.
+    Returns a dict of format -> (destination, seconds).
+    """
+    for fmt in formats:
+        if fmt not in SERIALIZATION_FORMATS:
+            raise ValueError(f"Unknown format '{fmt}' (choose from {', '.join(SERIALIZATION_FORMATS)})")
+    destinations = [format_destination(output_file, fmt) for fmt in formats]
+    if len(set(destinations)) != len(destinations):
+        raise ValueError(f"Formats {', '.join(formats)} would write the same file more than once")
+    
+    timings = {}
+    if workers == 1 or len(formats) <= 1:
+        for fmt in formats:
+            start = time.perf_counter()
+            destination = format_destination(output_file, fmt)
+            g.serialize(destination=destination, format=SERIALIZATION_FORMATS[fmt][1])
+            timings[fmt] = (destination, time.perf_counter() - start)
+        return timings
+    
+    namespaces = [(prefix, str(namespace)) for prefix, namespace in g.namespaces()]
+    fd, nt_file = tempfile.mkstemp(suffix='.nt', dir=os.path.dirname(os.path.abspath(output_file)))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as out:
+            out.writelines(sorted(ntriples_line(t) for t in g))
+        
+        with ProcessPoolExecutor(max_workers=workers or len(formats)) as pool:
+            futures = {
+                fmt: pool.submit(_serialize_from_ntriples, nt_file, namespaces,
+                                 format_destination(output_file, fmt), fmt)
+                for fmt in formats
+            }
+            for fmt, future in futures.items():
+                timings[fmt] = (format_destination(output_file, fmt), future.result())
+    finally:
+        os.remove(nt_file)
+    
+    return timings
 
-def convert_csv_to_rdf_enhanced(csv_file, output_file):
-    """Convert CSV to RDF using enhanced ontology"""
+def convert_csv_to_rdf_enhanced(csv_file, output_file, formats=DEFAULT_FORMATS, workers=None,
+                                columnar=False):
+    """Convert CSV to RDF using enhanced ontology
+    
+    With columnar=True the CSV is parsed into NumPy columns instead of
+    row by row (requires numpy).
+    """
     
     g = Graph()
     
@@ -70,94 +637,18 @@ def convert_csv_to_rdf_enhanced(csv_file, output_file):
     g.bind("dbpedia", DBPEDIA)
     
     # Add dataset metadata
-    dataset_uri = URIRef("http://example.org/cricket/dataset/bowling-statistics")
-    add_provenance(g, dataset_uri)
+    add_provenance(g, DATASET_URI)
     
     # Read CSV file
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        
-        for idx, row in enumerate(reader):
-            player_name = row['Player']
-            team_name = row['Team Name']
-            
-            # Create URIs
-            player_uri = PLAYER[clean_uri_string(player_name)]
-            team_uri = TEAM[clean_uri_string(team_name)]
-            stats_uri = STATS[f"bowling_stats_{idx}"]
-            
-            # Get statistics for classification
-            wickets = convert_to_float(row['Wkts'])
-            economy = convert_to_float(row['Econ'])
-            
-            # Classify performance
-            performance_class = classify_performance(wickets, economy)
-            
-            # Player information (using enhanced ontology)
-            g.add((player_uri, RDF.type, CRICKET.Player))
-            g.add((player_uri, RDF.type, CRICKET.Bowler))  # All are bowlers in this dataset
-            g.add((player_uri, RDF.type, SCHEMA.Person))
-            g.add((player_uri, FOAF.name, Literal(player_name, datatype=XSD.string)))
-            g.add((player_uri, RDFS.label, Literal(player_name, lang="en")))
-            g.add((player_uri, CRICKET.playsFor, team_uri))
-            g.add((player_uri, SCHEMA.memberOf, team_uri))
-            
-            # Team information (using enhanced ontology)
-            g.add((team_uri, RDF.type, CRICKET.Team))
-            g.add((team_uri, RDF.type, CRICKET.PSLTeam))  # PSL team type
-            g.add((team_uri, RDF.type, SCHEMA.SportsTeam))
-            g.add((team_uri, SCHEMA.name, Literal(team_name, datatype=XSD.string)))
-            g.add((team_uri, RDFS.label, Literal(team_name, lang="en")))
-            g.add((team_uri, SCHEMA.sport, DBPEDIA.Cricket))
-            g.add((team_uri, CRICKET.hasPlayer, player_uri))  # Inverse property
-            
-            # Bowling statistics (with performance classification)
-            g.add((stats_uri, RDF.type, CRICKET.BowlingStatistics))
-            g.add((stats_uri, RDF.type, performance_class))  # Add performance classification
-            g.add((stats_uri, CRICKET.forPlayer, player_uri))
-            g.add((stats_uri, CRICKET.forTeam, team_uri))
-            # Link to dataset using Dublin Core
-            g.add((stats_uri, DCTERMS.source, dataset_uri))
-            
-            # Add span
-            if row['Span']:
-                g.add((stats_uri, CRICKET.span, Literal(row['Span'], datatype=XSD.string)))
-            
-            # Add numeric statistics with proper datatypes
-            numeric_fields = {
-                'Mat': ('matches', XSD.integer),
-                'Inns': ('innings', XSD.float),
-                'Overs': ('overs', XSD.float),
-                'Mdns': ('maidens', XSD.float),
-                'Runs': ('runsConceded', XSD.float),
-                'Wkts': ('wickets', XSD.float),
-                'Ave': ('average', XSD.float),
-                'Econ': ('economy', XSD.float),
-                'SR': ('strikeRate', XSD.float),
-                '4': ('fourWickets', XSD.float),
-                '5': ('fiveWickets', XSD.float),
-                'Ct': ('catches', XSD.integer),
-                'St': ('stumpings', XSD.integer)
-            }
-            
-            for csv_field, (rdf_property, datatype) in numeric_fields.items():
-                value = convert_to_float(row[csv_field])
-                if value is not None:
-                    g.add((stats_uri, CRICKET[rdf_property], Literal(value, datatype=datatype)))
-            
-            # Add best bowling innings
-            if row['BBI']:
-                g.add((stats_uri, CRICKET.bestBowlingInnings, Literal(row['BBI'], datatype=XSD.string)))
+    for triple in data_triples(csv_file, DATASET_URI, columnar):
+        g.add(triple)
     
     # Serialize to multiple formats
-    g.serialize(destination=output_file, format='turtle')
-    g.serialize(destination=output_file.replace('.ttl', '.rdf'), format='xml')
-    g.serialize(destination=output_file.replace('.ttl', '.jsonld'), format='json-ld')
+    timings = serialize_formats(g, output_file, formats, workers)
     
     print(f"✓ Enhanced RDF dataset created successfully!")
-    print(f"  - Turtle: {output_file}")
-    print(f"  - RDF/XML: {output_file.replace('.ttl', '.rdf')}")
-    print(f"  - JSON-LD: {output_file.replace('.ttl', '.jsonld')}")
+    for fmt, (destination, seconds) in timings.items():
+        print(f"  - {SERIALIZATION_FORMATS[fmt][2]}: {destination} ({seconds:.2f}s)")
     print(f"  - Total triples: {len(g)}")
     
     # Count performance classifications
@@ -175,7 +666,35 @@ def convert_csv_to_rdf_enhanced(csv_file, output_file):
     return g
 
 if __name__ == "__main__":
-    input_csv = "bowlingAvg_clean.csv"
-    output_rdf = "bowling_stats_enhanced.ttl"
+    parser = argparse.ArgumentParser(description="Convert bowling CSV to RDF")
+    parser.add_argument("--input", dest="input_csv", default="bowlingAvg_clean.csv")
+    parser.add_argument("--output", dest="output_rdf", default=None,
+                        help="Output file (default: bowling_stats_enhanced.ttl, "
+                             "or bowling_stats_enhanced.nt with --stream)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream N-Triples (.nt or .nt.gz) in constant memory")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Emit only added/changed/removed triples since the last run "
+                             "(patch + merged sorted N-Triples)")
+    parser.add_argument("--sharded", action="store_true",
+                        help="Convert byte-range shards of the CSV in --workers processes "
+                             "(sorted N-Triples output)")
+    parser.add_argument("--columnar", action="store_true",
+                        help="Parse numeric columns and classify performance with NumPy")
+    parser.add_argument("--formats", default=",".join(DEFAULT_FORMATS),
+                        help=f"Comma-separated output formats ({', '.join(SERIALIZATION_FORMATS)})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes: serializers (default: one per format; 1 = serial) "
+                             "or, with --sharded, converters (default: CPU count)")
+    args = parser.parse_args()
     
-    graph = convert_csv_to_rdf_enhanced(input_csv, output_rdf)
+    if args.incremental:
+        convert_csv_incremental(args.input_csv, args.output_rdf or "bowling_stats_enhanced.nt")
+    elif args.sharded:
+        convert_csv_sharded(args.input_csv, args.output_rdf or "bowling_stats_enhanced.nt", args.workers)
+    elif args.stream:
+        convert_csv_to_ntriples_streaming(args.input_csv, args.output_rdf or "bowling_stats_enhanced.nt")
+    else:
+        formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+        graph = convert_csv_to_rdf_enhanced(args.input_csv, args.output_rdf or "bowling_stats_enhanced.ttl",
+                                            formats, args.workers, args.columnar)
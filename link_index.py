@@ -0,0 +1,71 @@
+"""
+owl:sameAs lookup index
+Maps each local resource to its DBpedia and Wikidata targets so pages can
+resolve the external links of many rows in one call.
+
+Usage:
+    links = attach_link_index(g)
+    links.resolve_many([player1, player2])   # {uri: {'dbpedia': ..., 'wikidata': ...}}
+"""
+
+from rdflib.namespace import OWL
+
+from graph_index import GraphIndex
+
+# Link kind -> substring that identifies its target URIs
+LINK_KINDS = (
+    ('dbpedia', 'dbpedia.org'),
+    ('wikidata', 'wikidata.org'),
+)
+
+def no_links():
+    return {kind: None for kind, _ in LINK_KINDS}
+
+class LinkIndex(GraphIndex):
+    """Resolved external links per local resource
+
+    Rebuilt lazily after the graph changes, e.g. when another link file
+    is parsed into it.
+    """
+
+    def __init__(self, graph):
+        super().__init__(graph)
+        self._links = {}
+        self.count = 0
+
+    def build(self):
+        links = {}
+        count = 0
+        for s, _, o in self.graph.triples((None, OWL.sameAs, None)):
+            count += 1
+            target = str(o)
+            for kind, marker in LINK_KINDS:
+                if marker in target:
+                    links.setdefault(s, no_links())[kind] = target
+                    break
+        self._links = links
+        self.count = count
+
+    def __len__(self):
+        """Number of owl:sameAs statements"""
+        self.refresh()
+        return self.count
+
+    def resolve(self, uri):
+        """{'dbpedia': url or None, 'wikidata': url or None} for one resource"""
+        self.refresh()
+        return dict(self._links.get(uri) or no_links())
+
+    def resolve_many(self, uris):
+        """resolve() for a batch of resources, as {uri: links}"""
+        self.refresh()
+        links = self._links
+        return {uri: dict(links.get(uri) or no_links()) for uri in uris}
+
+def attach_link_index(graph):
+    """LinkIndex for `graph`, created on first use"""
+    index = getattr(graph, 'link_index', None)
+    if index is None:
+        index = graph.link_index = LinkIndex(graph)
+    index.refresh()
+    return index
@@ -0,0 +1,238 @@
+"""
+Read-only triple store memory-mapped from a graph image file
+An image (e.g. data.ttl.image) holds an ArrayStore's sorted SPO/POS/OSP
+columns, the encoded term dictionary and a hash table from terms to IDs,
+keyed by the source's SHA-256 like a graph snapshot. Every process that
+opens it maps the same pages from the OS page cache, so pre-fork workers
+share one copy of the graph instead of parsing a private one each.
+
+Usage:
+    write_image(g, "data.ttl.image", source_hash("data.ttl"))
+    g = open_image("data.ttl.image")   # Graph over a MappedStore
+"""
+
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # no advisory locks (Windows); concurrent builds just race
+    fcntl = None
+
+import numpy as np
+from rdflib import Graph
+
+from array_store import _ORDERS, ArrayStore
+from graph_snapshot import _decode_term, _encode_term
+
+MAGIC = b"CKGIMAG1"
+IMAGE_SUFFIX = ".image"
+
+# Sections start on 8-byte boundaries so every array view is aligned
+_ALIGN = 8
+
+def image_path(source_path):
+    """Path of the graph image belonging to a source file"""
+    return source_path + IMAGE_SUFFIX
+
+@contextlib.contextmanager
+def build_lock(path):
+    """Exclusive lock held while (re)building an image
+
+    Workers starting together then build it once and all map the same file.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _term_key(kind, value, extra):
+    return bytes((kind,)) + value.encode('utf-8') + b"\0" + extra.encode('utf-8')
+
+def _term_hash(key):
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+def write_image(g, path, digest):
+    """Write the image of a graph, tagged with the source digest
+
+    Layout: magic, 32-byte digest, header length + JSON header (counts,
+    namespaces and the offset of each section), then the aligned
+    little-endian sections: nine uint32 index columns, term kinds, value
+    byte lengths, term offsets into the UTF-8 blob, the blob, and the
+    sorted term hashes with their IDs.
+    """
+    store = g.store
+    if not isinstance(store, ArrayStore):
+        store = ArrayStore()
+        store.addN((s, p, o, None) for s, p, o in g)
+        for prefix, namespace in g.namespaces():
+            store.bind(prefix, namespace)
+    len(store)  # fold pending writes into the sorted arrays
+
+    n_terms = len(store._terms)
+    kinds = np.empty(n_terms, dtype=np.uint8)
+    value_lengths = np.empty(n_terms, dtype='<u4')
+    offsets = np.empty(n_terms + 1, dtype='<u8')
+    hashes = np.empty(n_terms, dtype='<u8')
+    blob = bytearray()
+    for term_id, term in enumerate(store._terms):
+        kind, value, extra = _encode_term(term)
+        key = _term_key(kind, value, extra)
+        kinds[term_id] = kind
+        value_lengths[term_id] = len(key) - 2 - len(extra.encode('utf-8'))
+        offsets[term_id] = len(blob)
+        hashes[term_id] = _term_hash(key)
+        blob += key[1:]
+    offsets[n_terms] = len(blob)
+    order = np.argsort(hashes, kind='stable')
+
+    sections = {}
+    for name in _ORDERS:
+        for position, column in zip('abc', store._indexes[name]):
+            sections[f'{name}_{position}'] = column.astype('<u4')
+    sections.update(kinds=kinds, value_lengths=value_lengths, offsets=offsets,
+                    blob=np.frombuffer(bytes(blob), dtype=np.uint8),
+                    hashes=hashes[order], hash_ids=order.astype('<u4'))
+
+    layout = {}
+    offset = 0
+    for name, data in sections.items():
+        offset = -(-offset // _ALIGN) * _ALIGN
+        layout[name] = [offset, data.dtype.str, len(data)]
+        offset += data.nbytes
+    header = json.dumps({
+        'terms': n_terms,
+        'triples': len(store._indexes['spo'][0]),
+        'namespaces': [[prefix, str(ns)] for prefix, ns in g.namespaces()],
+        'sections': layout,
+    }).encode('utf-8')
+    base = -(-(len(MAGIC) + 32 + 4 + len(header)) // _ALIGN) * _ALIGN
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(MAGIC)
+            out.write(digest)
+            out.write(struct.pack('<I', len(header)))
+            out.write(header)
+            for name, data in sections.items():
+                out.write(b"\0" * (base + layout[name][0] - out.tell()))
+                out.write(data.tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+class _MappedTerms:
+    """Term list decoded lazily from the mapped dictionary (one cache per process)"""
+
+    def __init__(self, kinds, value_lengths, offsets, blob):
+        self._kinds = kinds
+        self._value_lengths = value_lengths
+        self._offsets = offsets
+        self._blob = blob
+        self._cache = {}
+
+    def __len__(self):
+        return len(self._kinds)
+
+    def __getitem__(self, term_id):
+        term = self._cache.get(term_id)
+        if term is None:
+            start, end = int(self._offsets[term_id]), int(self._offsets[term_id + 1])
+            raw = self._blob[start:end].tobytes()
+            split = int(self._value_lengths[term_id])
+            term = self._cache[term_id] = _decode_term(
+                int(self._kinds[term_id]), raw[:split].decode('utf-8'), raw[split + 1:].decode('utf-8'))
+        return term
+
+class _MappedIds:
+    """Term -> ID lookups through the mapped hash table"""
+
+    def __init__(self, terms, hashes, hash_ids):
+        self._terms = terms
+        self._hashes = hashes
+        self._hash_ids = hash_ids
+        self._cache = {}
+
+    def get(self, term, default=None):
+        term_id = self._cache.get(term)
+        if term_id is not None:
+            return term_id
+        key_hash = np.uint64(_term_hash(_term_key(*_encode_term(term))))
+        lo = int(np.searchsorted(self._hashes, key_hash, 'left'))
+        hi = int(np.searchsorted(self._hashes, key_hash, 'right'))
+        for i in range(lo, hi):
+            term_id = int(self._hash_ids[i])
+            if self._terms[term_id] == term:
+                self._cache[term] = term_id
+                return term_id
+        return default
+
+    def __getitem__(self, term):
+        term_id = self.get(term)
+        if term_id is None:
+            raise KeyError(term)
+        return term_id
+
+class MappedStore(ArrayStore):
+    """ArrayStore whose arrays and term dictionary live in a mapped image file
+
+    The index columns are read-only views of the mapping, so nothing is
+    copied when the store is opened. Terms are decoded on first use and
+    cached per process. Adds and removes raise TypeError.
+    """
+
+    def __init__(self, path, digest=None, identifier=None):
+        super().__init__(identifier=identifier)
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = self._mmap
+        if buffer[:8] != MAGIC or (digest is not None and buffer[8:40] != digest):
+            self._mmap.close()
+            raise ValueError(f"{path} is not an image of this source")
+        (header_len,) = struct.unpack_from('<I', buffer, 40)
+        header = json.loads(buffer[44:44 + header_len])
+        base = -(-(44 + header_len) // _ALIGN) * _ALIGN
+
+        def section(name):
+            offset, dtype, count = header['sections'][name]
+            return np.frombuffer(buffer, dtype=dtype, count=count, offset=base + offset)
+
+        self._indexes = {name: tuple(section(f'{name}_{position}') for position in 'abc')
+                         for name in _ORDERS}
+        self._terms = _MappedTerms(section('kinds'), section('value_lengths'),
+                                   section('offsets'), section('blob'))
+        self._ids = _MappedIds(self._terms, section('hashes'), section('hash_ids'))
+        self.namespaces_in_image = header['namespaces']
+
+    def add(self, triple, context, quoted=False):
+        raise TypeError("MappedStore is read-only")
+
+    def remove(self, triple_pattern, context=None):
+        raise TypeError("MappedStore is read-only")
+
+    def load_ids(self, terms, triple_ids):
+        raise TypeError("MappedStore is read-only")
+
+def open_image(path, digest=None):
+    """Graph over a MappedStore of an image
+
+    Raises ValueError if the file is not an image or, when `digest` is
+    given, was built from a different version of the source.
+    """
+    store = MappedStore(path, digest)
+    g = Graph(store=store)
+    for prefix, namespace in store.namespaces_in_image:
+        g.bind(prefix, namespace, replace=True)
+    return g
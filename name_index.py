@@ -0,0 +1,259 @@
+"""
+In-memory name indexes for search and typeahead
+NameIndex: trigrams plus a sorted suffix array over player rdfs:label/foaf:name,
+with the player's statistics rows pre-sorted by wickets, so a search never
+runs SPARQL (and user input never ends up in a query string).
+SuggestIndex: sorted word-prefix array over player and team names.
+SlugIndex: URL slug -> player/team URI for the Linked Data routes.
+
+Usage:
+    names = attach_name_index(g)
+    names.search("afridi", limit=50)
+    attach_suggest_index(g).suggest("sha", limit=10)
+"""
+
+from bisect import bisect_left
+
+from rdflib.namespace import FOAF, RDF, RDFS
+
+from graph_index import GraphIndex
+from rdf_terms import clean_uri_string
+from star_index import CRICKET, attach_star_index
+
+# Sorts after every character that can follow a prefix in the suffix array
+_MAX_CHAR = "\U0010ffff"
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _number(literal):
+    try:
+        return float(literal)
+    except (TypeError, ValueError):
+        return float('-inf')
+
+class NameIndex(GraphIndex):
+    """Substring search over player names returning statistics rows
+
+    Rows match the dashboard search query: one per statistics node with
+    forPlayer, forTeam, wickets, economy and average, plus player and
+    team labels, ordered by wickets (descending, ties in graph order).
+    """
+
+    def __init__(self, graph, namespace=CRICKET):
+        super().__init__(graph)
+        self.namespace = namespace
+        self._rows = []
+        self._player_rows = {}
+        self._names = []
+        self._trigrams = {}
+        self._suffixes = []
+        self._suffix_names = []
+
+    def build(self):
+        g = self.graph
+        ns = self.namespace
+        star = attach_star_index(g, ns)
+
+        rows = []
+        for _, props in star.records():
+            for player in props.get(ns.forPlayer, ()):
+                for team in props.get(ns.forTeam, ()):
+                    for wickets in props.get(ns.wickets, ()):
+                        for economy in props.get(ns.economy, ()):
+                            for average in props.get(ns.average, ()):
+                                for name in star.labels(player):
+                                    for team_name in star.labels(team):
+                                        rows.append({
+                                            'player': player, 'name': name, 'team': team_name,
+                                            'wickets': wickets, 'economy': economy,
+                                            'average': average,
+                                        })
+        rows.sort(key=lambda row: -_number(row['wickets']))
+
+        player_rows = {}
+        for position, row in enumerate(rows):
+            player_rows.setdefault(row['player'], []).append(position)
+
+        names = []
+        for player in player_rows:
+            spellings = dict.fromkeys(str(name).lower() for predicate in (RDFS.label, FOAF.name)
+                                      for name in g.objects(player, predicate))
+            names.extend((spelling, player) for spelling in spellings)
+
+        grams = {}
+        suffixes = []
+        for name_id, (name, _) in enumerate(names):
+            for gram in trigrams(name):
+                grams.setdefault(gram, set()).add(name_id)
+            suffixes.extend((name[i:], name_id) for i in range(len(name)))
+        suffixes.sort()
+
+        self._rows = rows
+        self._player_rows = player_rows
+        self._names = names
+        self._trigrams = grams
+        self._suffixes = [suffix for suffix, _ in suffixes]
+        self._suffix_names = [name_id for _, name_id in suffixes]
+
+    def _matching_names(self, text):
+        """IDs of names containing `text` (already lower-cased)"""
+        if len(text) >= 3:
+            postings = sorted((self._trigrams.get(gram, ()) for gram in trigrams(text)), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+            return {name_id for name_id in candidates if text in self._names[name_id][0]}
+        # Short queries: every suffix starting with the text marks a substring match
+        lo = bisect_left(self._suffixes, text)
+        hi = bisect_left(self._suffixes, text + _MAX_CHAR, lo)
+        return set(self._suffix_names[lo:hi])
+
+    def players(self, text):
+        """Players whose label or foaf:name contains `text` (case-insensitive)"""
+        self.refresh()
+        text = text.lower()
+        if not text:
+            return set(self._player_rows)
+        return {self._names[name_id][1] for name_id in self._matching_names(text)}
+
+    def search(self, text, limit=50):
+        """Statistics rows of matching players, by wickets descending"""
+        players = self.players(text)
+        player_rows = self._player_rows
+        positions = sorted(position for player in players for position in player_rows[player])
+        return [self._rows[position] for position in positions[:limit]]
+
+def attach_name_index(graph, namespace=CRICKET):
+    """NameIndex for `graph`, created on first use"""
+    index = getattr(graph, 'name_index', None)
+    if index is None:
+        index = graph.name_index = NameIndex(graph, namespace)
+    index.refresh()
+    return index
+
+class SuggestIndex(GraphIndex):
+    """Prefix typeahead over player and team names, ranked by total wickets
+
+    Every name is stored under its full lower-cased spelling and under each
+    word start ("shaheen shah afridi" is also found by "shah" and "afr") in
+    one sorted array, so a lookup is a binary search plus a short scan.
+    """
+
+    def __init__(self, graph, namespace=CRICKET):
+        super().__init__(graph)
+        self.namespace = namespace
+        self._entries = []
+        self._keys = []
+        self._key_entries = []
+
+    def build(self):
+        g = self.graph
+        ns = self.namespace
+        star = attach_star_index(g, ns)
+
+        wickets = {}
+        kinds = {}
+        for _, props in star.records():
+            total = sum(w for w in map(_number, props.get(ns.wickets, ())) if w > float('-inf'))
+            for kind, predicate in (('player', ns.forPlayer), ('team', ns.forTeam)):
+                for resource in props.get(predicate, ()):
+                    wickets[resource] = wickets.get(resource, 0) + total
+                    kinds[resource] = kind
+
+        # Entries ranked once: most wickets first, then by name
+        entries = []
+        for resource, kind in kinds.items():
+            name = star.label(resource)
+            if name is None:
+                continue
+            spellings = [str(label) for label in star.labels(resource)]
+            if kind == 'player':
+                spellings += [str(foaf_name) for foaf_name in g.objects(resource, FOAF.name)]
+            entries.append((-wickets[resource], str(name), kind, resource, spellings))
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+
+        keys = []
+        for rank, (_, _, _, _, spellings) in enumerate(entries):
+            for spelling in dict.fromkeys(s.lower() for s in spellings):
+                starts = [0] + [i + 1 for i, ch in enumerate(spelling) if ch == ' ']
+                keys.extend((spelling[start:], rank) for start in starts if start < len(spelling))
+        keys = sorted(set(keys))
+
+        self._entries = [
+            {'name': name, 'type': kind, 'wickets': int(-negative_wickets), 'uri': str(resource)}
+            for negative_wickets, name, kind, resource, _ in entries
+        ]
+        self._keys = [key for key, _ in keys]
+        self._key_entries = [rank for _, rank in keys]
+
+    def suggest(self, prefix, limit=10):
+        """Top `limit` names with a word starting with `prefix`"""
+        self.refresh()
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + _MAX_CHAR, lo)
+        ranks = sorted(set(self._key_entries[lo:hi]))[:limit]
+        return [dict(self._entries[rank]) for rank in ranks]
+
+def attach_suggest_index(graph, namespace=CRICKET):
+    """SuggestIndex for `graph`, created on first use"""
+    index = getattr(graph, 'suggest_index', None)
+    if index is None:
+        index = graph.suggest_index = SuggestIndex(graph, namespace)
+    index.refresh()
+    return index
+
+def slug_key(text):
+    """Normalized slug: URI-cleaned and lower-cased ("Shaheen Shah Afridi" -> "shaheen_shah_afridi")"""
+    return clean_uri_string(text).lower()
+
+class SlugIndex(GraphIndex):
+    """Resolve URL slugs to player and team resources
+
+    A resource is found by its URI's last path segment or by its cleaned
+    rdfs:label, case-insensitively. fuzzy() keeps the old substring match
+    on labels for callers that ask for it.
+    """
+
+    KINDS = ('Player', 'Team')
+
+    def __init__(self, graph, namespace=CRICKET):
+        super().__init__(graph)
+        self.namespace = namespace
+        self._slugs = {}
+        self._labels = {}
+
+    def build(self):
+        g = self.graph
+        slugs = {kind: {} for kind in self.KINDS}
+        labels = {kind: [] for kind in self.KINDS}
+        for kind in self.KINDS:
+            for resource in g.subjects(RDF.type, self.namespace[kind]):
+                keys = [slug_key(str(resource).rstrip('/').rsplit('/', 1)[-1])]
+                for label in g.objects(resource, RDFS.label):
+                    keys.append(slug_key(str(label)))
+                    labels[kind].append((str(label).lower(), resource))
+                for key in keys:
+                    slugs[kind].setdefault(key, resource)
+        self._slugs = slugs
+        self._labels = labels
+
+    def exact(self, kind, slug):
+        """Resource of `kind` ('Player' or 'Team') for a slug, or None"""
+        self.refresh()
+        return self._slugs[kind].get(slug_key(slug))
+
+    def fuzzy(self, kind, slug):
+        """Resources whose label contains the slug (underscores as spaces)"""
+        self.refresh()
+        text = slug.replace('_', ' ').lower()
+        return list(dict.fromkeys(resource for label, resource in self._labels[kind] if text in label))
+
+def attach_slug_index(graph, namespace=CRICKET):
+    """SlugIndex for `graph`, created on first use"""
+    index = getattr(graph, 'slug_index', None)
+    if index is None:
+        index = graph.slug_index = SlugIndex(graph, namespace)
+    index.refresh()
+    return index
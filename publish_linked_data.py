@@ -3,21 +3,130 @@ Publish RDF Dataset as Linked Data
 Simple Flask server with content negotiation
 """
 
-from flask import Flask, request, Response, render_template_string
-from rdflib import Graph
+from flask import Flask, request, Response, abort, jsonify, render_template_string, send_file, url_for
+from rdflib import BNode, Graph
+import hmac
 import os
 
+from async_app import AsyncApp
+from dump_cache import DumpCache
+from fragments import (PAGE_SIZE, attach_fragment_index, format_term, fragment_document,
+                       fragment_metadata, parse_term)
+from graph_holder import GraphHolder, Snapshot
+from graph_snapshot import load_graph_cached, source_hash
+from hot_reload import Reloader, source_signature
+from http_cache import conditional
+from name_index import attach_slug_index
+from query_guard import QueryGuard, QueryLimitError, ServerBusy
+from sparql_cache import BoundedCache, QueryCache
+from sparql_stream import (MIMETYPES, end_with_error, evaluate, is_select, negotiate, prefetch,
+                           select_chunks, serialize)
+from star_index import CRICKET
+
 app = Flask(__name__)
 
-# Load RDF graph
-g = Graph()
-if os.path.exists("bowling_stats_improved.ttl"):
-    g.parse("bowling_stats_improved.ttl", format="turtle")
-elif os.path.exists("bowling_stats.ttl"):
-    g.parse("bowling_stats.ttl", format="turtle")
-else:
+# Source data: the first file that exists
+DATA_FILE = next((f for f in ("bowling_stats_improved.ttl", "bowling_stats.ttl")
+                  if os.path.exists(f)), None)
+
+# POST /admin/reload requires a matching X-Admin-Token header; without a
+# token it is refused
+ADMIN_TOKEN = os.environ.get("CRICKET_ADMIN_TOKEN")
+
+# Seconds between checks of the data file for a background reload (0 disables)
+RELOAD_INTERVAL = float(os.environ.get("CRICKET_RELOAD_INTERVAL", 2.0))
+
+def load_snapshot(path, version=None):
+    """Snapshot of the data file with the lookup indexes built
+
+    The version (used in ETags and cache keys) is the file's hash.
+    """
+    graph = Graph()
+    signature = source_signature(path)
+    if path:
+        graph = load_graph_cached(path)
+        version = version or source_hash(path).hex()[:16]
+    attach_slug_index(graph)
+    attach_fragment_index(graph)
+    return Snapshot(graph, version or "empty", source=path, signature=signature)
+
+# Graph snapshots: each request reads the one current when it started
+HOLDER = GraphHolder(load_snapshot(DATA_FILE))
+HOLDER.pin(app)
+if not DATA_FILE:
     print("Error: No RDF file found!")
 
+def current():
+    """The request's graph snapshot"""
+    return HOLDER.snapshot()
+
+# Serialized /data files, one set per graph version
+DUMPS = DumpCache(os.environ.get("CRICKET_DATA_CACHE", ".data_cache"))
+DUMPS.retain(HOLDER.current().version)
+
+# Serialized /sparql results per (graph version, normalized query, format)
+SPARQL_CACHE = QueryCache(
+    max_entries=int(os.environ.get("CRICKET_SPARQL_CACHE_ENTRIES", 256)),
+    max_bytes=int(os.environ.get("CRICKET_SPARQL_CACHE_MB", 64)) << 20,
+)
+
+# Limits for /sparql evaluation (0 disables the timeout or row limit)
+QUERY_GUARD = QueryGuard(
+    timeout=float(os.environ.get("CRICKET_SPARQL_TIMEOUT", 30)),
+    max_rows=int(os.environ.get("CRICKET_SPARQL_MAX_ROWS", 100000)),
+    max_concurrent=int(os.environ.get("CRICKET_SPARQL_MAX_CONCURRENT", 4)),
+)
+
+# SELECT results are evaluated in full before the status is sent while the
+# row limit is at most this; above it (or without a limit) they stream
+SPARQL_BUFFER_ROWS = int(os.environ.get("CRICKET_SPARQL_BUFFER_ROWS", 100000))
+
+# Serialized descriptions per (graph version, kind, resources, format)
+DESCRIPTIONS = BoundedCache(
+    max_entries=int(os.environ.get("CRICKET_DESCRIBE_CACHE_ENTRIES", 1024)),
+    max_bytes=int(os.environ.get("CRICKET_DESCRIBE_CACHE_MB", 16)) << 20,
+)
+DESCRIPTIONS.retain(HOLDER.current().version)
+
+def build_snapshot(current_snapshot):
+    """Snapshot of the data file if its content changed, else None"""
+    signature = source_signature(DATA_FILE)
+    if signature == current_snapshot.signature:
+        return None
+    version = source_hash(DATA_FILE).hex()[:16] if DATA_FILE else "empty"
+    if version == current_snapshot.version:
+        # Touched but unchanged
+        return current_snapshot.replace(signature=signature)
+    return load_snapshot(DATA_FILE, version)
+
+def source_changed():
+    """True if the data file's mtime/size differ; a missing file keeps the current snapshot"""
+    signature = source_signature(DATA_FILE)
+    return signature is not None and signature != HOLDER.current().signature
+
+def clear_caches(snapshot):
+    # Entries of the old version can no longer be hit
+    SPARQL_CACHE.invalidate()
+    DESCRIPTIONS.retain(snapshot.version)
+    DUMPS.retain(snapshot.version)
+
+# Reloads load and index the next snapshot off the request path
+RELOADER = Reloader(HOLDER, build_snapshot, changed=source_changed, on_swap=clear_caches)
+RELOADER.watch(RELOAD_INTERVAL)
+
+def reload_graph():
+    """Load the data file again now and swap it in if its content changed
+
+    Requests already running finish on the snapshot they started with.
+    Returns the snapshot now being served.
+    """
+    return RELOADER.reload()
+
+def cacheable(build, vary=None):
+    """Conditional response (ETag/Last-Modified/304) for the request's graph"""
+    snapshot = current()
+    return conditional(snapshot.version, snapshot.last_modified, build, vary=vary)
+
 # HTML template for human-readable view
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -49,15 +158,27 @@ HTML_TEMPLATE = """
     </div>
     
     <div class="endpoint">
-        <strong>GET /player/{player_name}</strong> - Get player information
+        <strong>GET /player/{player_name}</strong> - Get player information (add <code>?match=fuzzy</code> for partial names)
     </div>
     
     <div class="endpoint">
-        <strong>GET /team/{team_name}</strong> - Get team information
+        <strong>GET /team/{team_name}</strong> - Get team information (add <code>?match=fuzzy</code> for partial names)
     </div>
     
     <div class="endpoint">
-        <strong>GET /sparql</strong> - SPARQL endpoint (POST queries)
+        <strong>GET /sparql</strong> - SPARQL endpoint (POST queries); SELECT results as JSON, CSV or TSV by Accept header
+    </div>
+    
+    <div class="endpoint">
+        <strong>GET /fragments?subject=&amp;predicate=&amp;object=&amp;page=</strong> - Triple Pattern Fragments (pages of 100 triples with counts and next-page links)
+    </div>
+    
+    <div class="endpoint">
+        <strong>GET /stats</strong> - Server counters (graph version and reloads, SPARQL result cache, killed queries)
+    </div>
+    
+    <div class="endpoint">
+        <strong>POST /admin/reload</strong> - Reload the data file in the background (the current graph is served until the swap)
     </div>
     
     <h2>Content Negotiation</h2>
@@ -95,92 +216,113 @@ curl -X POST http://localhost:5000/sparql \\
 @app.route('/')
 def index():
     """Home page with dataset information"""
-    return render_template_string(HTML_TEMPLATE, triples=len(g))
+    return cacheable(lambda: render_template_string(HTML_TEMPLATE, triples=len(current().graph)))
 
 @app.route('/data')
 def get_data():
     """Get full dataset with content negotiation"""
+    return cacheable(serialize_data, vary=("Accept", "Accept-Encoding"))
+
+def serialize_data():
     accept = request.headers.get('Accept', 'text/turtle')
     
     if 'application/rdf+xml' in accept:
-        return Response(g.serialize(format='xml'), mimetype='application/rdf+xml')
+        return stream_dump('xml', 'application/rdf+xml')
     elif 'application/ld+json' in accept or 'application/json' in accept:
-        return Response(g.serialize(format='json-ld'), mimetype='application/ld+json')
+        return stream_dump('json-ld', 'application/ld+json')
     elif 'text/html' in accept:
-        return index()
+        return render_template_string(HTML_TEMPLATE, triples=len(current().graph))
     else:  # Default to Turtle
-        return Response(g.serialize(format='turtle'), mimetype='text/turtle')
+        return stream_dump('turtle', 'text/turtle')
 
-@app.route('/player/<player_name>')
-def get_player(player_name):
-    """Get information about a specific player"""
-    # Replace underscores with spaces for search
-    search_name = player_name.replace('_', ' ')
-    
-    # Query for player data
-    query = f"""
-    PREFIX cricket: <http://example.org/cricket/ontology#>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    
-    CONSTRUCT {{
-        ?player ?p ?o .
-        ?stats ?sp ?so .
-    }}
-    WHERE {{
-        ?player rdfs:label ?name .
-        FILTER(CONTAINS(LCASE(?name), LCASE("{search_name}")))
-        ?player ?p ?o .
-        OPTIONAL {{
-            ?stats cricket:forPlayer ?player ;
-                   ?sp ?so .
-        }}
-    }}
+def stream_dump(fmt, mimetype):
+    """Stream the cached serialization of the graph, compressed if the client accepts it"""
+    snapshot = current()
+    path, encoding = DUMPS.variant(snapshot.graph, snapshot.version, fmt, request.accept_encodings)
+    response = send_file(path, mimetype=mimetype, conditional=False, etag=False)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+def concise_bounded_description(g, resource, into):
+    """Add the CBD of a resource to `into`: its triples, following blank nodes"""
+    pending = [resource]
+    seen = set()
+    while pending:
+        node = pending.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        for triple in g.triples((node, None, None)):
+            into.add(triple)
+            if isinstance(triple[2], BNode):
+                pending.append(triple[2])
+
+def describe(g, resources, related):
+    """Graph of the CBDs of `resources` and of related(g, resource) for each"""
+    result = Graph()
+    for prefix, namespace in g.namespaces():
+        result.bind(prefix, namespace)
+    for resource in resources:
+        concise_bounded_description(g, resource, result)
+        for other in related(g, resource):
+            concise_bounded_description(g, other, result)
+    return result
+
+def player_related(g, player):
+    """Stats nodes of a player plus the teams they played for"""
+    stats = list(g.subjects(CRICKET.forPlayer, player))
+    teams = dict.fromkeys(g.objects(player, CRICKET.playsFor))
+    for node in stats:
+        teams.update(dict.fromkeys(g.objects(node, CRICKET.forTeam)))
+    return stats + list(teams)
+
+def team_related(g, team):
+    """Players of a team"""
+    return list(g.subjects(CRICKET.playsFor, team))
+
+def describe_response(kind, slug, related):
+    """Negotiated description of the player or team named by `slug`
+
+    Exact slug lookup by default; ?match=fuzzy matches every resource
+    whose label contains the slug.
     """
-    
-    result_graph = g.query(query).graph
+    snapshot = current()
+    fuzzy = request.args.get('match') == 'fuzzy'
+    slugs = attach_slug_index(snapshot.graph)
+    if fuzzy:
+        resources = slugs.fuzzy(kind, slug)
+    else:
+        resource = slugs.exact(kind, slug)
+        resources = [resource] if resource is not None else []
+    if not resources:
+        return Response(f"No {kind.lower()} found for '{slug}' (try ?match=fuzzy)",
+                        status=404, mimetype='text/plain')
     
     accept = request.headers.get('Accept', 'text/turtle')
     if 'application/rdf+xml' in accept:
-        return Response(result_graph.serialize(format='xml'), mimetype='application/rdf+xml')
+        fmt, mimetype = 'xml', 'application/rdf+xml'
     elif 'application/ld+json' in accept:
-        return Response(result_graph.serialize(format='json-ld'), mimetype='application/ld+json')
+        fmt, mimetype = 'json-ld', 'application/ld+json'
     else:
-        return Response(result_graph.serialize(format='turtle'), mimetype='text/turtle')
+        fmt, mimetype = 'turtle', 'text/turtle'
+    
+    key = (snapshot.version, kind, tuple(resources), fmt)
+    entry = DESCRIPTIONS.lookup(key)
+    if entry is None:
+        body = describe(snapshot.graph, resources, related).serialize(format=fmt, encoding='utf-8')
+        entry = DESCRIPTIONS.store(key, (body, mimetype))
+    return Response(entry[0], mimetype=entry[1])
+
+@app.route('/player/<player_name>')
+def get_player(player_name):
+    """Get information about a specific player"""
+    return cacheable(lambda: describe_response('Player', player_name, player_related), vary="Accept")
 
 @app.route('/team/<team_name>')
 def get_team(team_name):
     """Get information about a specific team"""
-    # Replace underscores with spaces for search
-    search_name = team_name.replace('_', ' ')
-    
-    query = f"""
-    PREFIX cricket: <http://example.org/cricket/ontology#>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    
-    CONSTRUCT {{
-        ?team ?p ?o .
-        ?player ?pp ?po .
-    }}
-    WHERE {{
-        ?team rdfs:label ?name .
-        FILTER(CONTAINS(LCASE(?name), LCASE("{search_name}")))
-        ?team ?p ?o .
-        OPTIONAL {{
-            ?player cricket:playsFor ?team ;
-                    ?pp ?po .
-        }}
-    }}
-    """
-    
-    result_graph = g.query(query).graph
-    
-    accept = request.headers.get('Accept', 'text/turtle')
-    if 'application/rdf+xml' in accept:
-        return Response(result_graph.serialize(format='xml'), mimetype='application/rdf+xml')
-    elif 'application/ld+json' in accept:
-        return Response(result_graph.serialize(format='json-ld'), mimetype='application/ld+json')
-    else:
-        return Response(result_graph.serialize(format='turtle'), mimetype='text/turtle')
+    return cacheable(lambda: describe_response('Team', team_name, team_related), vary="Accept")
 
 @app.route('/sparql', methods=['GET', 'POST'])
 def sparql_endpoint():
@@ -193,17 +335,137 @@ def sparql_endpoint():
     if not query:
         return Response("No query provided", status=400)
     
+    if request.method == 'GET':
+        # Same query against the same graph version: revalidate instead of re-running
+        return cacheable(lambda: run_sparql(query), vary="Accept")
+    return run_sparql(query)
+
+def run_sparql(query):
+    # SELECT results as SPARQL JSON, CSV or TSV by Accept; other forms as JSON
+    fmt = negotiate(request.accept_mimetypes)
+    snapshot = current()
+    cached = SPARQL_CACHE.get(snapshot.version, query, fmt)
+    if cached is not None:
+        body, mimetype = cached
+        return Response(body, mimetype=mimetype)
     try:
-        results = g.query(query)
-        
-        # Return results in SPARQL JSON format
-        return Response(results.serialize(format='json'), mimetype='application/sparql-results+json')
+        body, mimetype = QUERY_GUARD.stream(lambda: evaluate_sparql(snapshot, query, fmt))
+    except QueryLimitError as e:
+        response = Response(str(e), status=e.status, mimetype='text/plain')
+        if isinstance(e, ServerBusy):
+            response.headers['Retry-After'] = '1'
+        return response
     except Exception as e:
         return Response(f"Query error: {str(e)}", status=400)
+    return Response(end_with_error(body, fmt), mimetype=mimetype)
+
+def evaluate_sparql(snapshot, query, fmt):
+    """(chunks, mimetype): SELECT solutions stream, other results are serialized here"""
+    result = evaluate(snapshot.graph, query)
+    if not is_select(result):
+        body = serialize(result, QUERY_GUARD.max_rows)
+        SPARQL_CACHE.put(snapshot.version, query, (body, MIMETYPES['json']), fmt)
+        return [body], MIMETYPES['json']
+    max_rows = QUERY_GUARD.max_rows
+    chunks = cache_stream(snapshot.version, query, fmt, select_chunks(result, fmt, max_rows))
+    if max_rows and max_rows <= SPARQL_BUFFER_ROWS:
+        # At most max_rows rows are held, and every limit still maps to a status
+        return list(chunks), MIMETYPES[fmt]
+    return prefetch(chunks), MIMETYPES[fmt]
+
+def cache_stream(version, query, fmt, chunks):
+    """Pass chunks through, caching the complete body if it fits in the cache"""
+    parts = []
+    size = 0
+    for chunk in chunks:
+        if parts is not None:
+            size += len(chunk)
+            if size <= SPARQL_CACHE.max_bytes:
+                parts.append(chunk)
+            else:
+                parts = None
+        yield chunk
+    if parts is not None:
+        SPARQL_CACHE.put(version, query, (b''.join(parts), MIMETYPES[fmt]), fmt)
+
+# Fragment formats: media type -> (rdflib format, metadata in a separate graph)
+FRAGMENT_FORMATS = {
+    'text/turtle': ('turtle', False),
+    'application/trig': ('trig', True),
+    'application/n-quads': ('nquads', True),
+    'application/n-triples': ('nt', False),
+}
+
+@app.route('/fragments')
+def get_fragments():
+    """Triple Pattern Fragment: one page of the triples matching ?subject ?predicate ?object"""
+    try:
+        pattern = tuple(parse_term(request.args.get(name)) for name in ('subject', 'predicate', 'object'))
+        page = int(request.args.get('page', 1))
+    except Exception as e:
+        return Response(f"Invalid fragment request: {e}", status=400, mimetype='text/plain')
+    if page < 1:
+        return Response("page must be 1 or more", status=400, mimetype='text/plain')
+    # Hydra links are absolute URLs on the request's host
+    return cacheable(lambda: fragment_response(pattern, page), vary=("Accept", "Host"))
+
+def fragment_url(pattern, page):
+    params = {name: format_term(term) for name, term in zip(('subject', 'predicate', 'object'), pattern)
+              if term is not None}
+    if page > 1:
+        params['page'] = page
+    return url_for('get_fragments', _external=True, **params)
+
+def fragment_response(pattern, page):
+    mimetype = request.accept_mimetypes.best_match(list(FRAGMENT_FORMATS), default='text/turtle')
+    fmt, quads = FRAGMENT_FORMATS[mimetype]
+    g = current().graph
+    triples, total = attach_fragment_index(g).page(pattern, page)
+    
+    url = fragment_url(pattern, page)
+    meta = fragment_metadata(
+        url, lambda n: fragment_url(pattern, n),
+        dataset_url=url_for('get_fragments', _external=True) + '#dataset',
+        template=url_for('get_fragments', _external=True) + '{?subject,predicate,object}',
+        total=total, page=page, page_size=PAGE_SIZE, count_on_page=len(triples),
+    )
+    document = fragment_document(triples, meta, url, quads, g.namespaces())
+    return Response(document.serialize(format=fmt), mimetype=mimetype)
+
+@app.route('/stats')
+def stats():
+    """Server counters (graph reloads, SPARQL result cache, query limits)"""
+    return jsonify({
+        'graph_version': current().version,
+        'reload': RELOADER.stats(),
+        'sparql_cache': SPARQL_CACHE.stats(),
+        'description_cache': DESCRIPTIONS.stats(),
+        'sparql_limits': QUERY_GUARD.stats(),
+    })
+
+def require_admin():
+    """403 unless CRICKET_ADMIN_TOKEN is set and the request's X-Admin-Token matches it"""
+    token = request.headers.get('X-Admin-Token', '')
+    if not ADMIN_TOKEN or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        abort(403)
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Reload the data file in the background; requests keep the current graph until the swap"""
+    require_admin()
+    started = RELOADER.trigger()
+    return jsonify(dict(RELOADER.stats(), status='started' if started else 'queued')), 202
+
+# Async serving: uvicorn publish_linked_data:asgi_app
+asgi_app = AsyncApp(app, version=lambda: HOLDER.current().version)
 
 if __name__ == '__main__':
     print("🚀 Starting Linked Data Server...")
-    print(f"📊 Loaded {len(g)} triples")
+    snapshot = HOLDER.current()
+    print(f"📊 Loaded {len(snapshot.graph)} triples")
+    print("📦 Preparing /data downloads...")
+    for fmt in ('turtle', 'xml', 'json-ld'):
+        DUMPS.ensure(snapshot.graph, snapshot.version, fmt)
     print("🌐 Server running at http://localhost:5000")
     print("\nPress Ctrl+C to stop")
     app.run(debug=True, port=5000)
@@ -0,0 +1,264 @@
+"""
+Resource limits for SPARQL evaluation
+QueryGuard caps concurrent queries, stops queries that run past a wall-clock
+timeout and rejects results with too many rows, counting each outcome.
+
+rdflib evaluates queries in pure Python, so a timeout is enforced by raising
+an exception asynchronously in the evaluating thread: evaluation stops at
+the next bytecode instead of running to completion in the background.
+
+Usage:
+    guard = QueryGuard(timeout=30, max_rows=100000, max_concurrent=4)
+    try:
+        body = guard.run(lambda: evaluate(query))
+    except QueryLimitError as e:
+        return Response(str(e), status=e.status)
+"""
+
+import ctypes
+import itertools
+import threading
+
+class QueryLimitError(Exception):
+    """A query hit a limit; `status` is the HTTP status to answer with"""
+
+    status = 400
+    reason = "limit"
+
+class QueryTimeout(QueryLimitError):
+    status = 503
+    reason = "timeout"
+
+class TooManyRows(QueryLimitError):
+    status = 413
+    reason = "rows"
+
+class ServerBusy(QueryLimitError):
+    status = 503
+    reason = "busy"
+
+class _Expired(BaseException):
+    """Raised in the evaluating thread when its deadline passes
+
+    A BaseException, so the `except Exception` blocks in rdflib (e.g. when
+    casting literals) and pyparsing cannot swallow it; _Deadline.call()
+    turns it into QueryTimeout.
+    """
+
+def _raise_in_thread(thread_id, exception):
+    """Make `exception` be raised in another thread at its next bytecode"""
+    return ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id),
+                                                      ctypes.py_object(exception))
+
+def _abandon(thread_id):
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), None)
+
+def check_rows(results, max_rows):
+    """Raise TooManyRows if a SELECT or CONSTRUCT result exceeds `max_rows`
+
+    SELECT solutions are pulled one at a time, so evaluation stops at the
+    first row over the limit.
+    """
+    if not max_rows:
+        return
+    if results.type == 'SELECT':
+        count = sum(1 for _ in itertools.islice(results, max_rows + 1))
+    elif results.type in ('CONSTRUCT', 'DESCRIBE'):
+        count = len(results.graph)
+    else:
+        return
+    if count > max_rows:
+        raise TooManyRows(f"Query result exceeds {max_rows} rows; add a LIMIT")
+
+class _Deadline:
+    """Wall-clock limit for work done in one or more calls
+
+    call() runs a function with the deadline armed for the calling thread.
+    When time runs out during a call, _Expired is raised inside it and
+    leaves call() as QueryTimeout. rdflib's casts catch everything with a
+    bare `except:` and turn it into a FILTER error, so _Expired is raised
+    again every RETRY_SECONDS until the call ends, and a call that returns
+    after swallowing one still fails (its result may be missing rows).
+    Between calls (e.g. while a response chunk is being sent) the deadline
+    only marks itself expired and the next call fails.
+    """
+
+    RETRY_SECONDS = 0.05
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expired = False
+        self._lock = threading.Lock()
+        self._thread = None
+        self._injected = None
+        self._timer = None
+        if seconds:
+            self._start_timer(seconds)
+
+    def _start_timer(self, seconds):
+        self._timer = threading.Timer(seconds, self._expire)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _expire(self):
+        with self._lock:
+            self.expired = True
+            if self._thread is not None:
+                self._injected = self._thread
+                _raise_in_thread(self._thread, _Expired)
+                self._start_timer(self.RETRY_SECONDS)
+
+    def call(self, function, *args):
+        thread_id = threading.get_ident()
+        try:
+            try:
+                with self._lock:
+                    if self.expired:
+                        raise _Expired
+                    self._thread = thread_id
+                try:
+                    result = function(*args)
+                finally:
+                    with self._lock:
+                        self._thread = None
+                if self._injected == thread_id:
+                    raise _Expired
+                return result
+            except _Expired:
+                raise QueryTimeout(f"Query exceeded the {self.seconds:g}s time limit") from None
+        finally:
+            if self._injected == thread_id:
+                # The exception may still be pending if the call returned first
+                _abandon(thread_id)
+                self._injected = None
+
+    def cancel(self):
+        with self._lock:
+            timer = self._timer
+        if timer is not None:
+            timer.cancel()
+
+class GuardedStream:
+    """Response iterable that pulls chunks under a QueryGuard's limits
+
+    Holds a concurrency slot until exhausted or closed. The WSGI server
+    closes it even when the client disconnects before the first chunk.
+    """
+
+    def __init__(self, guard, deadline, chunks):
+        self._guard = guard
+        self._deadline = deadline
+        self._chunks = iter(chunks)
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._closed:
+            raise StopIteration
+        try:
+            return self._deadline.call(next, self._chunks)
+        except StopIteration:
+            self._guard._finish(None)
+            self.close()
+            raise
+        except QueryLimitError as e:
+            self._guard._finish(e)
+            self.close()
+            raise
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._deadline.cancel()
+        self._guard._release()
+        close = getattr(self._chunks, 'close', None)
+        if close is not None:
+            close()
+
+class QueryGuard:
+    """Concurrency cap, wall-clock timeout and row limit for query evaluation"""
+
+    def __init__(self, timeout=30.0, max_rows=100000, max_concurrent=4, queue_wait=1.0):
+        self.timeout = timeout
+        self.max_rows = max_rows
+        self.max_concurrent = max_concurrent
+        self.queue_wait = queue_wait
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.running = 0
+        self.completed = 0
+        self.killed = {'timeout': 0, 'rows': 0, 'busy': 0}
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.queue_wait):
+            self._finish(ServerBusy())
+            raise ServerBusy(f"Too many concurrent queries (limit {self.max_concurrent}); retry shortly")
+        with self._lock:
+            self.running += 1
+
+    def _release(self):
+        with self._lock:
+            self.running -= 1
+        self._slots.release()
+
+    def _finish(self, error):
+        with self._lock:
+            if error is None:
+                self.completed += 1
+            else:
+                self.killed[error.reason] += 1
+
+    def run(self, evaluate):
+        """Call evaluate() within the limits and return its result
+
+        Raises ServerBusy when no slot frees up within `queue_wait` seconds,
+        QueryTimeout when evaluation runs longer than `timeout` seconds, and
+        lets TooManyRows from check_rows() through. Each is counted.
+        """
+        self._acquire()
+        deadline = _Deadline(self.timeout)
+        try:
+            result = deadline.call(evaluate)
+        except QueryLimitError as e:
+            self._finish(e)
+            raise
+        finally:
+            deadline.cancel()
+            self._release()
+        self._finish(None)
+        return result
+
+    def stream(self, open_stream):
+        """(GuardedStream, info) for open_stream() returning (chunks, info)
+
+        The slot is taken and open_stream() (parsing, planning) runs before
+        anything is sent, so busy and early errors still get a status code.
+        `info` is passed through (e.g. the response mimetype). The timeout
+        covers the whole stream; a limit hit while streaming aborts the
+        response.
+        """
+        self._acquire()
+        deadline = _Deadline(self.timeout)
+        try:
+            chunks, info = deadline.call(open_stream)
+        except BaseException as e:
+            if isinstance(e, QueryLimitError):
+                self._finish(e)
+            deadline.cancel()
+            self._release()
+            raise
+        return GuardedStream(self, deadline, chunks), info
+
+    def stats(self):
+        with self._lock:
+            return {
+                'timeout_seconds': self.timeout,
+                'max_rows': self.max_rows,
+                'max_concurrent': self.max_concurrent,
+                'running': self.running,
+                'completed': self.completed,
+                'killed': dict(self.killed),
+            }
@@ -4,6 +4,8 @@ Query RDF Dataset using SPARQL
 
 from rdflib import Graph
 
+from star_index import attach_star_index
+
 def load_and_query_rdf(rdf_file):
     """Load RDF file and execute sample queries"""
     
@@ -12,6 +14,7 @@ def load_and_query_rdf(rdf_file):
     g = Graph()
     g.parse(rdf_file, format='turtle')
     print(f"Loaded {len(g)} triples\n")
+    attach_star_index(g, "http://example.org/cricket/")
     
     # Query 1: Top 10 wicket-takers
     print("=" * 80)
@@ -0,0 +1,114 @@
+"""
+Interned RDF term factory
+Reuses URIRef/Literal objects and cleaned URI strings across a run
+"""
+
+from collections import OrderedDict
+from rdflib import Literal, Namespace, URIRef
+
+def clean_uri_string(s):
+    """Clean string for use in URI following RFC 3986"""
+    return s.replace(" ", "_").replace(".", "").replace("/", "_").replace("'", "")
+
+class LRUCache:
+    """Small bounded mapping that evicts the least recently used entry"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key, create):
+        """Return the cached value for key, calling create() on a miss"""
+        if self.maxsize <= 0:
+            self.misses += 1
+            return create()
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = self._data[key] = create()
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return value
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+def _literal_key(value, datatype, lang):
+    """Cache key that keeps 1, 1.0 and True (and 0.0/-0.0) apart"""
+    if isinstance(value, float):
+        return (float, value.hex(), datatype, lang)
+    return (type(value), value, datatype, lang)
+
+class InternedNamespace(Namespace):
+    """Namespace whose terms (NS.name, NS[name]) come from a TermFactory"""
+
+    def __new__(cls, value, factory):
+        ns = super().__new__(cls, value)
+        ns._factory = factory
+        return ns
+
+    def term(self, name):
+        return self._factory.uri(self, name if isinstance(name, str) else "")
+
+class TermFactory:
+    """Create RDF terms through bounded LRU caches
+
+    Equal terms built through the factory are the same object, so a graph
+    holding thousands of rows for the same player, team or statistic value
+    stores one term instead of one copy per row. A maxsize of 0 disables
+    interning. Not thread-safe; use one factory per thread or process.
+    """
+
+    def __init__(self, maxsize=65536):
+        self._uris = LRUCache(maxsize)
+        self._literals = LRUCache(maxsize)
+        self._cleaned = LRUCache(maxsize)
+
+    def resize(self, maxsize):
+        """Change the cache bound (0 disables interning) and clear the caches"""
+        for cache in (self._uris, self._literals, self._cleaned):
+            cache.maxsize = maxsize
+            cache.clear()
+
+    def namespace(self, value):
+        """Namespace whose terms are interned through this factory"""
+        return InternedNamespace(value, self)
+
+    def clean(self, name):
+        """Cached clean_uri_string()"""
+        return self._cleaned.get(name, lambda: clean_uri_string(name))
+
+    def uri(self, namespace, local=""):
+        """Interned URIRef for namespace + local (local used verbatim)"""
+        key = str(namespace) + local
+        return self._uris.get(key, lambda: URIRef(key))
+
+    def resource(self, namespace, name):
+        """Interned URIRef for a resource named by a human-readable string"""
+        return self.uri(namespace, self.clean(name))
+
+    def literal(self, value, datatype=None, lang=None):
+        """Interned Literal"""
+        return self._literals.get(_literal_key(value, datatype, lang),
+                                  lambda: Literal(value, datatype=datatype, lang=lang))
+
+    def stats(self):
+        """Hit/miss counters and sizes per cache"""
+        return {
+            name: {'size': len(cache), 'hits': cache.hits, 'misses': cache.misses}
+            for name, cache in (('uris', self._uris), ('literals', self._literals),
+                                ('cleaned', self._cleaned))
+        }
+
+# Shared factory used by the converter and the link scripts
+TERMS = TermFactory()
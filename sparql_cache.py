@@ -0,0 +1,172 @@
+"""
+LRU cache of serialized SPARQL results
+Keys are the graph version, the result format and the normalized query
+text: comments and insignificant whitespace are dropped and PREFIX/BASE
+declarations spelled one way, so formatting differences between clients
+share one entry. Entries of an old graph version are never hit again; invalidate()
+drops them when a new version is swapped in. BoundedCache is the same LRU
+for other serialized responses keyed by graph version (e.g. descriptions).
+
+Usage:
+    cache = QueryCache(max_entries=256, max_bytes=64 << 20)
+    entry = cache.get(version, query, 'json')          # (body, mimetype) or None
+    if entry is None:
+        entry = cache.put(version, query, (run(query), mimetype), 'json')
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+# Strings, IRIs, comments and whitespace; everything else is kept as is
+_TOKEN = re.compile(r'''
+    (?P<string>"""(?:[^"\\]|\\.|"(?!""))*"""|'\'\'(?:[^'\\]|\\.|'(?!''))*'\'\'
+              |"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<iri><[^<>"{}|^`\\\s]*>)
+  | (?P<comment>\#[^\n]*)
+  | (?P<space>\s+)
+''', re.VERBOSE)
+
+_DECLARATION = re.compile(r'(?i)\s*(PREFIX\s+[^\s:]*:\s*<[^>]*>|BASE\s+<[^>]*>)')
+
+def _collapse(query):
+    """Query with comments removed and whitespace runs outside literals/IRIs
+    reduced to one space"""
+    parts = []
+    position = 0
+    for match in _TOKEN.finditer(query):
+        if match.start() > position:
+            parts.append(query[position:match.start()])
+        if match.lastgroup in ('space', 'comment'):
+            if parts and parts[-1] != ' ':
+                parts.append(' ')
+        else:
+            parts.append(match.group())
+        position = match.end()
+    parts.append(query[position:])
+    return ''.join(parts).strip()
+
+def normalize_query(query):
+    """Canonical text of a query for cache keys
+
+    Keyword spacing of the leading PREFIX/BASE declarations is normalized
+    ("PREFIX x:<...>" == "prefix x: <...>") and a declaration repeated
+    right after itself is dropped. Their order is kept: a redefined prefix
+    takes its last definition, and BASE changes how later IRIs resolve.
+    """
+    text = _collapse(query)
+    declarations = []
+    while True:
+        match = _DECLARATION.match(text)
+        if not match:
+            break
+        declaration = re.sub(r'\s+', ' ', match.group(1))
+        keyword, rest = declaration.split(' ', 1)
+        declaration = keyword.upper() + ' ' + rest.replace(': <', ':<')
+        if not declarations or declarations[-1] != declaration:
+            declarations.append(declaration)
+        text = text[match.end():]
+    return ' '.join(declarations + [text.strip()])
+
+class BoundedCache:
+    """Serialized (body, mimetype) entries bounded by entry count and total bytes
+
+    Keys are tuples starting with the graph version. Entries are evicted
+    in LRU order. Counts hits, misses and evictions for the stats endpoint.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 << 20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Only entries of this version are stored once retain() has set it
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def lookup(self, key):
+        """Cached (body, mimetype) for `key`, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def store(self, key, entry):
+        """Store (body, mimetype) and return it
+
+        Bodies over max_bytes, and entries of a version other than the
+        retained one (e.g. from a request still running on the old graph),
+        are not kept.
+        """
+        size = len(entry[0])
+        if size > self.max_bytes:
+            return entry
+        with self._lock:
+            if self._version is not None and key[0] != self._version:
+                return entry
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[0])
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted[0])
+                self.evictions += 1
+        return entry
+
+    def retain(self, version):
+        """Drop entries of every other graph version and stop storing them"""
+        with self._lock:
+            self._version = version
+            stale = [key for key in self._entries if key[0] != version]
+            if stale:
+                self.invalidations += 1
+            for key in stale:
+                self._bytes -= len(self._entries.pop(key)[0])
+
+    def invalidate(self):
+        """Drop every entry (the graph was replaced)"""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+class QueryCache(BoundedCache):
+    """Serialized SPARQL results per (graph version, normalized query, format)"""
+
+    @staticmethod
+    def key(version, query, variant=''):
+        return (version, normalize_query(query), variant)
+
+    def get(self, version, query, variant=''):
+        """Cached (body, mimetype) for a query (and result format), or None"""
+        return self.lookup(self.key(version, query, variant))
+
+    def put(self, version, query, entry, variant=''):
+        """Store (body, mimetype) and return it; bodies over max_bytes are not kept"""
+        return self.store(self.key(version, query, variant), entry)
@@ -0,0 +1,184 @@
+"""
+Streaming SPARQL SELECT results as JSON, CSV or TSV
+Solutions are pulled from rdflib's evaluation one at a time and written in
+small batches, so the first bytes go out before the query has finished and
+memory does not grow with the number of rows.
+
+Usage:
+    fmt = negotiate(request.accept_mimetypes)
+    result = evaluate(g, query)
+    Response(select_chunks(result, fmt), mimetype=MIMETYPES[fmt])
+"""
+
+import csv
+import io
+import itertools
+import json
+import threading
+
+from rdflib import BNode, URIRef
+from rdflib.plugins.sparql import prepareQuery
+from rdflib.plugins.sparql.processor import SPARQLProcessor, SPARQLResult
+
+from query_guard import QueryLimitError, TooManyRows, check_rows
+
+# Accepted media type -> format, most preferred first
+FORMATS = {
+    'application/sparql-results+json': 'json',
+    'application/json': 'json',
+    'text/csv': 'csv',
+    'text/tab-separated-values': 'tsv',
+}
+
+# Passed as Response(mimetype=...), which adds "; charset=utf-8" to text types
+MIMETYPES = {
+    'json': 'application/sparql-results+json',
+    'csv': 'text/csv',
+    'tsv': 'text/tab-separated-values',
+}
+
+# Rows per chunk written to the response
+BATCH_ROWS = 256
+
+# rdflib's SPARQL parser (pyparsing) is not thread-safe; evaluation is, so
+# only parsing is serialized. Without this, concurrent requests on the
+# threaded server intermittently fail to parse valid queries (400).
+_PARSE_LOCK = threading.Lock()
+
+def negotiate(accept):
+    """Result format for a request's Accept header (a werkzeug MIMEAccept)"""
+    return FORMATS[accept.best_match(list(FORMATS), default='application/sparql-results+json')]
+
+def evaluate(graph, query):
+    """rdflib's raw result dict for a query, SELECT bindings still a generator
+
+    Graph.query() wraps this in a Result that keeps every row it has
+    iterated; streaming needs the bare generator. The graph's prefixes are
+    passed in the same way Graph.query() does. Only parsing is serialized,
+    so concurrent requests still evaluate in parallel.
+    """
+    with _PARSE_LOCK:
+        prepared = prepareQuery(query, initNs=dict(graph.namespaces()))
+    return SPARQLProcessor(graph).query(prepared)
+
+def is_select(result):
+    return result.get('type_') == 'SELECT'
+
+def serialize(result, max_rows=None):
+    """Whole SPARQL JSON body for a non-streamed (ASK/CONSTRUCT/DESCRIBE) result"""
+    result = SPARQLResult(result)
+    check_rows(result, max_rows)
+    return result.serialize(format='json')
+
+def _json_term(term):
+    if isinstance(term, URIRef):
+        return {'type': 'uri', 'value': str(term)}
+    if isinstance(term, BNode):
+        return {'type': 'bnode', 'value': str(term)}
+    value = {'type': 'literal', 'value': str(term)}
+    if term.datatype is not None:
+        value['datatype'] = str(term.datatype)
+    if term.language is not None:
+        value['xml:lang'] = term.language
+    return value
+
+def _csv_term(term):
+    if term is None:
+        return ''
+    if isinstance(term, BNode):
+        return f'_:{term}'
+    return str(term)
+
+def _tsv_term(term):
+    return '' if term is None else term.n3()
+
+def _rows(bindings, max_rows):
+    for count, row in enumerate(bindings, 1):
+        if max_rows and count > max_rows:
+            raise TooManyRows(f"Query result exceeds {max_rows} rows; add a LIMIT")
+        if row:  # rdflib skips empty solutions too
+            yield row
+
+def _batches(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_ROWS:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def prefetch(chunks, count=2):
+    """Chunks with the first `count` already pulled
+
+    rdflib evaluates lazily, so errors, timeouts and a row limit hit in
+    the first batch only surface when rows are pulled. Pulling the header
+    and the first batch before the response starts lets them still map to
+    a status code instead of a truncated 200.
+    """
+    chunks = iter(chunks)
+    head = list(itertools.islice(chunks, count))
+    return itertools.chain(head, chunks)
+
+def error_trailer(fmt, error):
+    """Bytes ending a streamed result that a query limit cut short
+
+    The 200 status has already been sent, so the body has to say so: JSON
+    results are closed with a top-level "error" member, CSV and TSV end
+    with a "#error <status> <message>" line.
+    """
+    if fmt == 'json':
+        error_json = json.dumps({'status': error.status, 'message': str(error)}, separators=(',', ':'))
+        return (']},"error":%s}' % error_json).encode('utf-8')
+    return f"#error {error.status} {error}\n".encode('utf-8')
+
+def end_with_error(chunks, fmt):
+    """Pass chunks through, ending with error_trailer() if a query limit stops them"""
+    try:
+        for chunk in chunks:
+            yield chunk
+    except QueryLimitError as e:
+        yield error_trailer(fmt, e)
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+def select_chunks(result, fmt, max_rows=None):
+    """Encoded chunks of a SELECT result in `fmt` ('json', 'csv' or 'tsv')"""
+    variables = list(result.get('vars_') or ())
+    rows = _rows(result['bindings'], max_rows)
+
+    if fmt == 'json':
+        head = {'vars': [str(v) for v in variables]}
+        yield ('{"head":%s,"results":{"bindings":[' % json.dumps(head, separators=(',', ':'))).encode('utf-8')
+        separator = ''
+        for batch in _batches(rows):
+            parts = []
+            for row in batch:
+                solution = {str(v): _json_term(row[v]) for v in variables if row.get(v) is not None}
+                parts.append(separator + json.dumps(solution, separators=(',', ':')))
+                separator = ','
+            yield ''.join(parts).encode('utf-8')
+        yield b']}}'
+
+    elif fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\r\n')
+        writer.writerow([str(v) for v in variables])
+        yield buffer.getvalue().encode('utf-8')
+        for batch in _batches(rows):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_csv_term(row.get(v)) for v in variables] for row in batch)
+            yield buffer.getvalue().encode('utf-8')
+
+    elif fmt == 'tsv':
+        yield ('\t'.join(f'?{v}' for v in variables) + '\n').encode('utf-8')
+        for batch in _batches(rows):
+            yield ''.join('\t'.join(_tsv_term(row.get(v)) for v in variables) + '\n'
+                          for row in batch).encode('utf-8')
+
+    else:
+        raise ValueError(f"Unknown result format: {fmt}")
@@ -0,0 +1,206 @@
+"""
+Star-pattern index for BowlingStatistics records
+One row per statistics node with all of its properties, plus the labels of
+the linked player and team. SPARQL basic graph patterns that are a star on
+a statistics node (forPlayer, forTeam, wickets, economy, ...) followed by
+rdfs:label lookups are answered from the index instead of triple by triple.
+
+Usage:
+    index = attach_star_index(g)    # g.query(...) now uses the index
+"""
+
+import threading
+from collections import OrderedDict, defaultdict
+
+from rdflib import BNode, Namespace, URIRef, Variable
+from rdflib.namespace import RDF, RDFS
+from rdflib.plugins.sparql import CUSTOM_EVALS
+
+from graph_index import GraphIndex
+
+CRICKET = Namespace("http://example.org/cricket/ontology#")
+
+class StarIndex(GraphIndex):
+    """Precomputed star rows for the statistics nodes of a graph
+
+    Rebuilt lazily whenever the graph changed since the last build. Query
+    plans are kept for the last MAX_PLANS query shapes.
+    """
+
+    MAX_PLANS = 1024
+
+    def __init__(self, graph, namespace=CRICKET):
+        super().__init__(graph)
+        self.namespace = Namespace(namespace)
+        self.link_predicates = (self.namespace.forPlayer, self.namespace.forTeam)
+        self._rows = {}
+        self._labels = {}
+        self._plans = OrderedDict()
+        self._plans_lock = threading.Lock()
+
+    # -- Build -------------------------------------------------------------
+
+    def build(self):
+        g = self.graph
+        # Dicts rather than sets keep graph order, so ties in ORDER BY ... LIMIT
+        # resolve the same way on every run
+        nodes = dict.fromkeys(g.subjects(RDF.type, self.namespace.BowlingStatistics))
+        for predicate in self.link_predicates:
+            nodes.update(dict.fromkeys(g.subjects(predicate, None)))
+
+        rows = {}
+        linked = {}
+        for node in nodes:
+            row = defaultdict(list)
+            for predicate, obj in g.predicate_objects(node):
+                row[predicate].append(obj)
+            rows[node] = dict(row)
+            for predicate in self.link_predicates:
+                linked.update(dict.fromkeys(row.get(predicate, ())))
+
+        self._rows = rows
+        self._labels = {resource: list(g.objects(resource, RDFS.label)) for resource in linked}
+
+    # -- Direct access -----------------------------------------------------
+
+    def __len__(self):
+        self.refresh()
+        return len(self._rows)
+
+    def records(self):
+        """Iterate (stats node, {predicate: [objects]}) pairs"""
+        self.refresh()
+        return iter(self._rows.items())
+
+    def get(self, node):
+        """Properties of one statistics node, or None"""
+        self.refresh()
+        return self._rows.get(node)
+
+    def labels(self, resource):
+        """rdfs:label values of a linked player or team"""
+        self.refresh()
+        return self._labels.get(resource, [])
+
+    def label(self, resource):
+        """First rdfs:label of a linked player or team, or None"""
+        labels = self.labels(resource)
+        return labels[0] if labels else None
+
+    # -- SPARQL ------------------------------------------------------------
+
+    def plan(self, triples):
+        """Split a BGP into (star, star steps, label steps), or None if it is not a star
+
+        A star has exactly one subject that is the statistics node (the
+        subject of forPlayer/forTeam or of `a cricket:BowlingStatistics`),
+        only constant predicates on it, and otherwise only rdfs:label
+        patterns on variables bound through forPlayer/forTeam.
+        """
+        key = tuple(triples)
+        with self._plans_lock:
+            if key in self._plans:
+                self._plans.move_to_end(key)
+                return self._plans[key]
+        plan = self._make_plan(triples)
+        with self._plans_lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.MAX_PLANS:
+                self._plans.popitem(last=False)
+        return plan
+
+    def _make_plan(self, triples):
+        if any(isinstance(term, BNode) for triple in triples for term in triple):
+            return None
+        stars = {s for s, p, o in triples
+                 if p in self.link_predicates
+                 or (p == RDF.type and o == self.namespace.BowlingStatistics)}
+        if len(stars) != 1:
+            return None
+        star = stars.pop()
+
+        star_steps = []
+        links = set()
+        for s, p, o in triples:
+            if s != star:
+                continue
+            if not isinstance(p, URIRef):
+                return None
+            star_steps.append((p, o))
+            if p in self.link_predicates and isinstance(o, Variable):
+                links.add(o)
+
+        label_steps = []
+        for s, p, o in triples:
+            if s == star:
+                continue
+            if p != RDFS.label or s not in links:
+                return None
+            label_steps.append((s, o))
+
+        return star, star_steps, label_steps
+
+    def solutions(self, ctx, plan):
+        """Yield FrozenBindings for a planned star BGP under `ctx`"""
+        self.refresh()
+        star, star_steps, label_steps = plan
+        bound_star = ctx[star]
+        if bound_star is None:
+            candidates = self._rows.items()
+        elif bound_star in self._rows:
+            candidates = ((bound_star, self._rows[bound_star]),)
+        else:
+            return
+
+        base = ctx.solution()
+        labels = self._labels
+        steps = ([(True, p, o) for p, o in star_steps] +
+                 [(False, s, o) for s, o in label_steps])
+
+        def value(term, bindings):
+            if isinstance(term, Variable):
+                return bindings.get(term, ctx[term])
+            return term
+
+        def extend(row, i, bindings):
+            if i == len(steps):
+                yield bindings
+                return
+            on_star, key, obj = steps[i]
+            values = row.get(key, ()) if on_star else labels.get(value(key, bindings), ())
+            current = value(obj, bindings)
+            if current is not None:
+                if current in values:
+                    yield from extend(row, i + 1, bindings)
+                return
+            for v in values:
+                extended = dict(bindings)
+                extended[obj] = v
+                yield from extend(row, i + 1, extended)
+
+        for node, row in candidates:
+            start = {star: node} if bound_star is None else {}
+            for bindings in extend(row, 0, start):
+                yield base.merge(bindings)
+
+def attach_star_index(graph, namespace=CRICKET):
+    """Build a StarIndex for `graph` and route its star-shaped SPARQL through it"""
+    index = getattr(graph, 'star_index', None)
+    if index is None:
+        index = graph.star_index = StarIndex(graph, namespace)
+    index.refresh()
+    return index
+
+def _eval_star_bgp(ctx, part):
+    """rdflib custom evaluation hook: answer star BGPs from the graph's index"""
+    if part.name != "BGP":
+        raise NotImplementedError()
+    index = getattr(ctx.graph, 'star_index', None)
+    if index is None:
+        raise NotImplementedError()
+    plan = index.plan(part.triples)
+    if plan is None:
+        raise NotImplementedError()
+    return index.solutions(ctx, plan)
+
+CUSTOM_EVALS['cricket_star_index'] = _eval_star_bgp
@@ -0,0 +1,44 @@
+import importlib
+import os
+import shutil
+import sys
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+SAMPLE_DATA = os.path.join(REPO, "bowling_stats_enhanced.ttl")
+
+@pytest.fixture(scope="session")
+def publish_app(tmp_path_factory):
+    """publish_linked_data imported over a copy of the sample data"""
+    serve_dir = tmp_path_factory.mktemp("publish")
+    shutil.copyfile(SAMPLE_DATA, serve_dir / "bowling_stats_improved.ttl")
+    cwd = os.getcwd()
+    os.environ["CRICKET_RELOAD_INTERVAL"] = "0"
+    os.environ["CRICKET_DATA_CACHE"] = str(serve_dir / "data_cache")
+    os.chdir(serve_dir)
+    try:
+        module = importlib.import_module("publish_linked_data")
+    finally:
+        os.chdir(cwd)
+    # Reloads after the chdir back still read the copy
+    module.DATA_FILE = os.path.abspath(serve_dir / module.DATA_FILE)
+    return module
+
+@pytest.fixture(scope="session")
+def dashboard_app(tmp_path_factory):
+    """cricket_stats_professional_app imported over a copy of the sample data"""
+    serve_dir = tmp_path_factory.mktemp("dashboard")
+    shutil.copyfile(SAMPLE_DATA, serve_dir / "bowling_stats_enhanced.ttl")
+    cwd = os.getcwd()
+    os.environ["CRICKET_RELOAD_INTERVAL"] = "0"
+    os.chdir(serve_dir)
+    try:
+        module = importlib.import_module("cricket_stats_professional_app")
+    finally:
+        os.chdir(cwd)
+    # Reloads after the chdir back still read the copy
+    module.DATA_FILE = os.path.abspath(serve_dir / module.DATA_FILE)
+    return module
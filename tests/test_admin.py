@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+def wait_for_reload(reloader):
+    deadline = time.time() + 30
+    while reloader.in_progress and time.time() < deadline:
+        time.sleep(0.05)
+
+@pytest.mark.parametrize('path', ['/admin/refresh', '/admin/reload'])
+def test_dashboard_admin_is_closed_without_a_token(dashboard_app, monkeypatch, path):
+    monkeypatch.setattr(dashboard_app, 'ADMIN_TOKEN', None)
+    client = dashboard_app.app.test_client()
+    assert client.post(path).status_code == 403
+    assert client.post(path, headers={'X-Admin-Token': ''}).status_code == 403
+
+def test_dashboard_refresh_rebuilds_in_the_background(dashboard_app, monkeypatch):
+    monkeypatch.setattr(dashboard_app, 'ADMIN_TOKEN', 'secret')
+    client = dashboard_app.app.test_client()
+    assert client.post('/admin/refresh', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    builds = dashboard_app.HOLDER.current().data['builds']
+    response = client.post('/admin/refresh', headers={'X-Admin-Token': 'secret'})
+    assert response.status_code == 202
+    wait_for_reload(dashboard_app.RELOADER)
+    assert dashboard_app.HOLDER.current().data['builds'] == builds + 1
+
+def test_publish_reload_is_closed_without_a_token(publish_app, monkeypatch):
+    monkeypatch.setattr(publish_app, 'ADMIN_TOKEN', None)
+    client = publish_app.app.test_client()
+    assert client.post('/admin/reload').status_code == 403
+    assert client.post('/admin/reload', headers={'X-Admin-Token': ''}).status_code == 403
+
+def test_publish_reload_accepts_the_configured_token(publish_app, monkeypatch):
+    monkeypatch.setattr(publish_app, 'ADMIN_TOKEN', 'secret')
+    client = publish_app.app.test_client()
+    assert client.post('/admin/reload', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    assert client.post('/admin/reload', headers={'X-Admin-Token': 'secret'}).status_code == 202
+    wait_for_reload(publish_app.RELOADER)
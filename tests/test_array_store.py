@@ -0,0 +1,61 @@
+import random
+
+from rdflib import Graph, Literal, Namespace
+
+from array_store import ArrayStore
+
+EX = Namespace("http://example.org/")
+
+PATTERNS = [(None, None, None), (EX.s1, None, None), (None, EX.p2, None), (None, None, Literal(3)),
+            (EX.s1, EX.p0, None), (EX.s2, None, Literal(5)), (None, EX.p1, Literal(7)),
+            (EX.s3, EX.p1, Literal(7)), (EX.unknown, None, None)]
+
+def random_triple(rng):
+    return EX[f"s{rng.randrange(20)}"], EX[f"p{rng.randrange(4)}"], Literal(rng.randrange(10))
+
+def matches(g, pattern):
+    return sorted(g.triples(pattern))
+
+def assert_same(array, memory):
+    assert len(array) == len(memory)
+    for pattern in PATTERNS:
+        assert matches(array, pattern) == matches(memory, pattern)
+
+def test_add_and_remove_match_memory_store():
+    rng = random.Random(7)
+    array, memory = Graph(store=ArrayStore()), Graph()
+    for step in range(3000):
+        triple = random_triple(rng)
+        if rng.random() < 0.7:
+            array.add(triple)
+            memory.add(triple)
+        else:
+            array.remove(triple)
+            memory.remove(triple)
+        if step % 500 == 0:
+            assert_same(array, memory)
+    assert_same(array, memory)
+
+def test_merges_keep_results(monkeypatch):
+    # A low threshold exercises merging pending adds and tombstones into the arrays
+    monkeypatch.setattr(ArrayStore, 'COMPACT_THRESHOLD', 8)
+    rng = random.Random(11)
+    array, memory = Graph(store=ArrayStore()), Graph()
+    triples = [random_triple(rng) for _ in range(400)]
+    for triple in triples:
+        array.add(triple)
+        memory.add(triple)
+    assert_same(array, memory)
+    for pattern in [(EX.s1, None, None), (None, EX.p2, None)]:
+        array.remove(pattern)
+        memory.remove(pattern)
+    assert_same(array, memory)
+
+def test_duplicate_adds_count_once():
+    g = Graph(store=ArrayStore())
+    for _ in range(3):
+        g.add((EX.s, EX.p, Literal(1)))
+    assert len(g) == 1
+    g.remove((EX.s, EX.p, Literal(1)))
+    assert len(g) == 0
+    assert list(g.triples((None, None, None))) == []
@@ -0,0 +1,26 @@
+import asyncio
+
+from async_app import AsyncApp
+
+def call(app, path, host):
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'',
+             'headers': [(b'host', host.encode())]}
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages[0]['status'], b''.join(m.get('body', b'') for m in messages[1:])
+
+def test_cached_responses_are_kept_per_host(publish_app):
+    app = AsyncApp(publish_app.app, version=lambda: publish_app.HOLDER.current().version)
+    for _ in range(2):
+        for host in ('a.example', 'b.example'):
+            status, body = call(app, '/fragments', host)
+            assert status == 200
+            assert f'http://{host}/fragments'.encode() in body
+    assert len(app._responses) == 2
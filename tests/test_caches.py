@@ -0,0 +1,50 @@
+from sparql_cache import BoundedCache, QueryCache, normalize_query
+
+def test_bounded_cache_evicts_least_recently_used():
+    cache = BoundedCache(max_entries=2, max_bytes=1 << 20)
+    cache.store(('v1', 'a'), (b'a', 'text/plain'))
+    cache.store(('v1', 'b'), (b'b', 'text/plain'))
+    assert cache.lookup(('v1', 'a')) is not None
+    cache.store(('v1', 'c'), (b'c', 'text/plain'))
+    assert cache.lookup(('v1', 'b')) is None
+    assert cache.stats()['evictions'] == 1
+
+def test_bounded_cache_limits_bytes():
+    cache = BoundedCache(max_entries=100, max_bytes=10)
+    for i in range(5):
+        cache.store(('v1', i), (b'xxxx', 'text/plain'))
+    assert cache.stats()['bytes'] <= 10
+
+def test_retain_drops_and_refuses_other_versions():
+    cache = BoundedCache()
+    cache.store(('v1', 'a'), (b'a', 'text/plain'))
+    cache.retain('v2')
+    assert cache.lookup(('v1', 'a')) is None
+    cache.store(('v1', 'b'), (b'b', 'text/plain'))
+    assert cache.stats()['entries'] == 0
+    cache.store(('v2', 'b'), (b'b', 'text/plain'))
+    assert cache.lookup(('v2', 'b')) == (b'b', 'text/plain')
+
+def test_query_cache_normalizes_queries():
+    cache = QueryCache()
+    cache.put('v1', 'SELECT * WHERE { ?s ?p ?o }  # all', (b'1', 'application/json'))
+    assert cache.get('v1', 'SELECT *\nWHERE { ?s ?p ?o }') == (b'1', 'application/json')
+
+def test_query_cache_keeps_declaration_order():
+    first = 'PREFIX ex: <http://a/> PREFIX ex: <http://b/> SELECT * WHERE { ex:s ?p ?o }'
+    second = 'PREFIX ex: <http://b/> PREFIX ex: <http://a/> SELECT * WHERE { ex:s ?p ?o }'
+    assert normalize_query(first) != normalize_query(second)
+    assert normalize_query('BASE <http://a/> PREFIX : <x/> ASK {}') != \
+        normalize_query('PREFIX : <x/> BASE <http://a/> ASK {}')
+    assert normalize_query('prefix ex:<http://a/>\nPREFIX ex: <http://a/> ASK {}') == \
+        normalize_query('PREFIX ex: <http://a/> ASK {}')
+    cache = QueryCache()
+    cache.put('v1', first, (b'a', 'application/json'))
+    assert cache.get('v1', second) is None
+
+def test_fuzzy_descriptions_stay_bounded(publish_app, monkeypatch):
+    monkeypatch.setattr(publish_app.DESCRIPTIONS, 'max_entries', 5)
+    client = publish_app.app.test_client()
+    for probe in ('sh', 'ah', 'ka', 'mo', 'ha', 'ra', 'an', 'al'):
+        client.get(f'/player/{probe}?match=fuzzy', headers={'Accept': 'text/turtle'})
+    assert publish_app.DESCRIPTIONS.stats()['entries'] <= 5
@@ -0,0 +1,28 @@
+import os
+
+import pytest
+from rdflib import Graph
+from rdflib.namespace import XSD
+
+from conftest import REPO
+from improved_converter_enhanced import (CRICKET, data_triples, format_destination, numeric_literal,
+                                         serialize_formats)
+
+CSV_FILE = os.path.join(REPO, "bowlingAvg_clean.csv")
+
+def test_columnar_path_matches_row_path():
+    assert set(data_triples(CSV_FILE, columnar=True)) == set(data_triples(CSV_FILE))
+
+def test_integer_fields_keep_their_lexical_form():
+    assert str(numeric_literal(3.0, XSD.integer)) == "3.0"
+    matches = {o for _, p, o in data_triples(CSV_FILE) if p == CRICKET.matches}
+    assert all(str(o).endswith(".0") for o in matches)
+
+def test_format_destinations_replace_only_the_extension():
+    assert format_destination("out.nt", 'turtle') == "out.ttl"
+    assert format_destination("data.ttl/out.ttl", 'xml') == "data.ttl/out.rdf"
+    assert format_destination("out", 'json-ld') == "out.jsonld"
+
+def test_duplicate_destinations_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        serialize_formats(Graph(), str(tmp_path / "out.ttl"), formats=('turtle', 'turtle'), workers=2)
@@ -0,0 +1,31 @@
+import os
+
+from rdflib import Graph, Literal, URIRef
+
+from dump_cache import DumpCache
+
+def graph(value):
+    g = Graph()
+    g.add((URIRef('urn:s'), URIRef('urn:p'), Literal(value)))
+    return g
+
+def versions_on_disk(cache):
+    return {name.split('.')[0] for name in os.listdir(cache.cache_dir)
+            if os.path.isfile(os.path.join(cache.cache_dir, name))}
+
+def test_ensure_does_not_remove_other_versions(tmp_path):
+    cache = DumpCache(tmp_path)
+    cache.ensure(graph(1), 'v1', 'turtle')
+    cache.ensure(graph(2), 'v2', 'turtle')
+    cache.ensure(graph(1), 'v1', 'turtle')
+    assert versions_on_disk(cache) == {'v1', 'v2'}
+
+def test_retain_keeps_current_and_previous_version(tmp_path):
+    cache = DumpCache(tmp_path)
+    for i, version in enumerate(('v1', 'v2', 'v3'), 1):
+        cache.retain(version)
+        cache.ensure(graph(i), version, 'turtle')
+    assert versions_on_disk(cache) == {'v2', 'v3'}
+    assert os.path.exists(cache.path('v2', 'turtle', 'gzip'))
+    cache.retain('v4')
+    assert versions_on_disk(cache) == {'v3'}
@@ -0,0 +1,54 @@
+from itertools import islice
+
+from rdflib import Graph, Literal, Namespace
+
+from array_store import ArrayStore
+from fragments import FragmentIndex
+
+EX = Namespace("http://example.org/")
+
+def make_graph():
+    g = Graph(store=ArrayStore())
+    for i in range(500):
+        g.add((EX[f"s{i % 50}"], EX[f"p{i % 3}"], Literal(i)))
+    return g
+
+PATTERNS = [(None, None, None), (None, EX.p1, None), (EX.s7, None, None), (EX.s7, EX.p1, None),
+            (None, None, Literal(42)), (EX.missing, None, None)]
+
+def test_pages_match_the_store_order():
+    g = make_graph()
+    index = FragmentIndex(g, page_size=40)
+    for pattern in PATTERNS:
+        expected = [t for t, _ in g.store.triples(pattern)]
+        for page in (1, 2, 5):
+            triples, total = index.page(pattern, page)
+            assert triples == expected[(page - 1) * 40:page * 40]
+            assert total == len(expected)
+
+def test_counts_are_exact_after_removals():
+    g = make_graph()
+    for i in range(0, 500, 3):
+        g.remove((EX[f"s{i % 50}"], EX[f"p{i % 3}"], Literal(i)))
+    g.add((EX.s7, EX.p1, Literal("new")))
+    index = FragmentIndex(g)
+    for pattern in PATTERNS:
+        assert index.count(pattern) == sum(1 for _ in g.triples(pattern))
+
+def test_other_stores_fall_back_to_scanning():
+    g = Graph()
+    for triple in make_graph():
+        g.add(triple)
+    index = FragmentIndex(g, page_size=40)
+    triples, total = index.page((None, EX.p1, None), 2)
+    assert triples == list(islice(g.triples((None, EX.p1, None)), 40, 80))
+    assert total == sum(1 for _ in g.triples((None, EX.p1, None)))
+
+def test_fragment_etag_varies_by_host(publish_app):
+    client = publish_app.app.test_client()
+    first = client.get('/fragments', headers={'Host': 'a.example'})
+    second = client.get('/fragments', headers={'Host': 'b.example'})
+    assert b'http://a.example/fragments' in first.data
+    assert b'http://b.example/fragments' in second.data
+    assert first.headers['ETag'] != second.headers['ETag']
+    assert 'Host' in first.headers['Vary']
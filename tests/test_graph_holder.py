@@ -0,0 +1,70 @@
+import threading
+
+import flask
+from rdflib import Graph, Literal, Namespace
+
+from graph_holder import GraphHolder, Snapshot
+
+EX = Namespace("http://example.org/")
+
+def make_snapshot(version):
+    g = Graph()
+    for i in range(version):
+        g.add((EX.s, EX.p, Literal(i)))
+    return Snapshot(g, version, total=version)
+
+def test_readers_see_whole_snapshots_during_swaps():
+    holder = GraphHolder(make_snapshot(1))
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            snapshot = holder.current()
+            if len(snapshot.graph) != snapshot.version or snapshot.data['total'] != snapshot.version:
+                errors.append(snapshot.version)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for version in range(2, 60):
+        holder.update(lambda current, version=version: make_snapshot(version))
+    stop.set()
+    for thread in readers:
+        thread.join()
+    assert errors == []
+    assert holder.current().version == 59
+    assert holder.swaps == 58
+
+def test_request_keeps_its_pinned_snapshot_across_a_swap():
+    app = flask.Flask(__name__)
+    holder = GraphHolder(make_snapshot(1))
+    holder.pin(app)
+
+    @app.route('/')
+    def index():
+        before = holder.snapshot().version
+        holder.update(lambda current: make_snapshot(current.version + 1))
+        return {'before': before, 'during': holder.snapshot().version,
+                'current': holder.current().version}
+
+    assert app.test_client().get('/').get_json() == {'before': 1, 'during': 1, 'current': 2}
+    assert app.test_client().get('/').get_json() == {'before': 2, 'during': 2, 'current': 3}
+
+def test_non_blocking_update_returns_current_while_another_builds():
+    holder = GraphHolder(make_snapshot(1))
+    building, release = threading.Event(), threading.Event()
+
+    def slow_build(current):
+        building.set()
+        release.wait()
+        return make_snapshot(2)
+
+    writer = threading.Thread(target=holder.update, args=(slow_build,))
+    writer.start()
+    building.wait()
+    skipped = holder.update(lambda current: make_snapshot(3), blocking=False)
+    assert skipped.version == 1
+    release.set()
+    writer.join()
+    assert holder.current().version == 2
@@ -0,0 +1,44 @@
+from graph_holder import GraphHolder, Snapshot
+from hot_reload import Reloader
+
+def make_reloader(versions):
+    """Reloader whose build() returns the next of `versions`, keeping the signature in step"""
+    holder = GraphHolder(Snapshot(None, versions[0], signature=0))
+    swapped = []
+    warmed = []
+    queue = list(versions[1:])
+
+    def build(current):
+        version = queue.pop(0)
+        if version == current.version:
+            return current.replace(signature=current.signature + 1)
+        return Snapshot(None, version, signature=current.signature + 1)
+
+    reloader = Reloader(holder, build, warm=warmed.append, on_swap=swapped.append)
+    return holder, reloader, swapped, warmed
+
+def test_changed_content_is_swapped_and_counted():
+    holder, reloader, swapped, warmed = make_reloader(['v1', 'v2'])
+    snapshot = reloader.reload()
+    assert snapshot.version == 'v2' and holder.current() is snapshot
+    assert reloader.reloads == 1
+    assert swapped == [snapshot] and warmed == [snapshot]
+
+def test_touch_only_updates_the_signature():
+    holder, reloader, swapped, warmed = make_reloader(['v1', 'v1'])
+    before = holder.current()
+    snapshot = reloader.reload()
+    assert snapshot.version == 'v1' and snapshot.signature == 1
+    assert snapshot.last_modified == before.last_modified
+    assert reloader.reloads == 0
+    assert swapped == [] and warmed == []
+
+def test_failed_build_keeps_the_current_snapshot():
+    holder = GraphHolder(Snapshot(None, 'v1'))
+
+    def build(current):
+        raise OSError("unreadable")
+
+    reloader = Reloader(holder, build)
+    assert reloader.reload().version == 'v1'
+    assert reloader.failures == 1 and reloader.last_error.startswith('OSError')
@@ -0,0 +1,18 @@
+import pytest
+
+@pytest.mark.parametrize('url', ['/', '/player/Shaheen_Shah_Afridi', '/data'])
+def test_head_and_get_share_the_etag(publish_app, url):
+    client = publish_app.app.test_client()
+    head = client.head(url)
+    get = client.get(url)
+    assert head.status_code == get.status_code == 200
+    assert head.headers['ETag'] == get.headers['ETag']
+    revalidated = client.get(url, headers={'If-None-Match': head.headers['ETag']})
+    assert revalidated.status_code == 304
+
+def test_etag_varies_with_accept(publish_app):
+    client = publish_app.app.test_client()
+    turtle = client.get('/player/Shaheen_Shah_Afridi', headers={'Accept': 'text/turtle'})
+    jsonld = client.get('/player/Shaheen_Shah_Afridi', headers={'Accept': 'application/ld+json'})
+    assert turtle.headers['ETag'] != jsonld.headers['ETag']
+    assert 'Accept' in turtle.headers['Vary']
@@ -0,0 +1,67 @@
+import csv
+import os
+
+from improved_converter_enhanced import DATASET_URI, convert_csv_incremental, convert_csv_to_ntriples_streaming
+
+from conftest import REPO
+
+def read_rows():
+    with open(os.path.join(REPO, "bowlingAvg_clean.csv"), encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+def write_csv(path, fieldnames, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def lines(path):
+    with open(path, encoding='utf-8') as f:
+        return f.readlines()
+
+def data_lines(path):
+    """Lines other than the dataset's provenance (which has a creation timestamp)"""
+    return {line for line in lines(path) if not line.startswith(DATASET_URI.n3())}
+
+def full_rebuild(csv_file, tmp_path):
+    output = str(tmp_path / "full.nt")
+    convert_csv_to_ntriples_streaming(csv_file, output)
+    return data_lines(output)
+
+def test_incremental_matches_full_rebuild(tmp_path):
+    fieldnames, rows = read_rows()
+    csv_file = str(tmp_path / "stats.csv")
+    output = str(tmp_path / "stats.nt")
+
+    write_csv(csv_file, fieldnames, rows[:150])
+    convert_csv_incremental(csv_file, output)
+    before = lines(output)
+
+    # Drop some rows, change others and add new ones, including a second
+    # team's row for players already present
+    edited = [dict(row) for row in rows[10:150] if int(row['Unnamed: 0']) % 7]
+    for row in edited[::5]:
+        row['Wkts'] = str(float(row['Wkts']) + 1)
+    edited += rows[150:200]
+    write_csv(csv_file, fieldnames, edited)
+    result = convert_csv_incremental(csv_file, output)
+
+    after = lines(output)
+    assert after == sorted(set(after))
+    assert data_lines(output) == full_rebuild(csv_file, tmp_path)
+    # Provenance is written on the first run and kept
+    assert set(after) - data_lines(output) == {line for line in before if line.startswith(DATASET_URI.n3())}
+    # The patch turns the previous output into the new one
+    assert (set(before) - result['removed']) | result['added'] == set(after)
+
+def test_unchanged_input_writes_empty_patch(tmp_path):
+    fieldnames, rows = read_rows()
+    csv_file = str(tmp_path / "stats.csv")
+    output = str(tmp_path / "stats.nt")
+    write_csv(csv_file, fieldnames, rows[:50])
+    convert_csv_incremental(csv_file, output)
+    first = lines(output)
+    result = convert_csv_incremental(csv_file, output)
+    assert result == {'added': set(), 'removed': set()}
+    assert lines(output) == first
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+from rdflib import Graph, Literal, Namespace
+
+from query_guard import QueryGuard, QueryTimeout, ServerBusy, TooManyRows, check_rows
+
+EX = Namespace("http://example.org/")
+
+def make_graph(n):
+    g = Graph()
+    for i in range(n):
+        g.add((EX[f"s{i}"], EX.p, Literal(i)))
+    return g
+
+def busy_loop():
+    while True:
+        pass
+
+def test_row_limit_raises_413():
+    guard = QueryGuard(max_rows=10)
+    g = make_graph(20)
+    with pytest.raises(TooManyRows) as raised:
+        guard.run(lambda: check_rows(g.query("SELECT ?s WHERE { ?s ?p ?o }"), guard.max_rows))
+    assert raised.value.status == 413
+    assert guard.stats()['killed']['rows'] == 1
+    assert guard.run(lambda: check_rows(g.query("SELECT ?s WHERE { ?s ?p ?o } LIMIT 10"), guard.max_rows)) is None
+
+def test_timeout_raises_503_and_stops_evaluation():
+    guard = QueryGuard(timeout=0.2)
+    start = time.perf_counter()
+    with pytest.raises(QueryTimeout) as raised:
+        guard.run(busy_loop)
+    assert raised.value.status == 503
+    assert time.perf_counter() - start < 5
+    assert guard.stats()['killed']['timeout'] == 1
+    assert guard.stats()['running'] == 0
+
+def swallowing_loop(seconds):
+    # Like rdflib's literal casting: the work runs inside `except Exception`
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        try:
+            while time.perf_counter() < end:
+                int("not a number")
+        except Exception:
+            pass
+
+def test_timeout_is_not_swallowed_by_except_exception():
+    guard = QueryGuard(timeout=0.2)
+    start = time.perf_counter()
+    with pytest.raises(QueryTimeout):
+        guard.run(lambda: swallowing_loop(5))
+    assert time.perf_counter() - start < 4
+
+def test_timeout_inside_a_literal_casting_filter():
+    g = make_graph(150)
+    query = """PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
+        SELECT (COUNT(*) AS ?n) WHERE {
+            ?a ?p ?x . ?b ?q ?y .
+            FILTER(xsd:integer(STR(?x)) + xsd:double(STR(?y)) < 0)
+        }"""
+    guard = QueryGuard(timeout=0.3)
+    start = time.perf_counter()
+    with pytest.raises(QueryTimeout):
+        guard.run(lambda: list(g.query(query)))
+    assert time.perf_counter() - start < 4
+    assert guard.stats()['killed']['timeout'] == 1
+
+def test_busy_raises_503_when_no_slot_frees_up():
+    guard = QueryGuard(max_concurrent=1, queue_wait=0.05)
+    started, release = threading.Event(), threading.Event()
+
+    def hold():
+        started.set()
+        release.wait()
+
+    worker = threading.Thread(target=guard.run, args=(hold,))
+    worker.start()
+    started.wait()
+    with pytest.raises(ServerBusy) as raised:
+        guard.run(lambda: None)
+    release.set()
+    worker.join()
+    assert raised.value.status == 503
+    assert guard.stats()['killed']['busy'] == 1
+    assert guard.stats()['completed'] == 1
+
+def test_endpoint_timeout_returns_503(publish_app, monkeypatch):
+    monkeypatch.setattr(publish_app.QUERY_GUARD, 'timeout', 0.2)
+    publish_app.SPARQL_CACHE.invalidate()
+    response = publish_app.app.test_client().post(
+        '/sparql', data="SELECT (COUNT(*) AS ?n) WHERE { ?a ?b ?c . ?d ?e ?f . ?g ?h ?i }",
+        content_type='application/sparql-query')
+    assert response.status_code == 503
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+ALL_TRIPLES = "SELECT ?s ?p ?o WHERE { ?s ?p ?o }"
+
+@pytest.fixture
+def client(publish_app, monkeypatch):
+    publish_app.SPARQL_CACHE.invalidate()
+    return publish_app.app.test_client()
+
+def post(client, query, accept='application/sparql-results+json'):
+    return client.post('/sparql', data=query, headers={'Content-Type': 'application/sparql-query',
+                                                       'Accept': accept})
+
+def test_select_streams_rows(client):
+    response = post(client, "SELECT ?s WHERE { ?s ?p ?o } LIMIT 3")
+    assert response.status_code == 200
+    assert len(response.get_json()['results']['bindings']) == 3
+
+def test_row_limit_returns_413(client, publish_app, monkeypatch):
+    monkeypatch.setattr(publish_app.QUERY_GUARD, 'max_rows', 10)
+    response = post(client, ALL_TRIPLES)
+    assert response.status_code == 413
+
+@pytest.mark.parametrize('accept', ['text/csv', 'text/tab-separated-values'])
+def test_row_limit_returns_413_for_text_formats(client, publish_app, monkeypatch, accept):
+    monkeypatch.setattr(publish_app.QUERY_GUARD, 'max_rows', 10)
+    assert post(client, ALL_TRIPLES, accept).status_code == 413
+
+def test_invalid_query_returns_400(client):
+    assert post(client, "SELECT WHERE {").status_code == 400
+
+@pytest.mark.parametrize('accept', ['text/csv', 'text/tab-separated-values'])
+def test_text_formats_declare_charset_once(client, accept):
+    response = post(client, "SELECT ?s WHERE { ?s ?p ?o } LIMIT 3", accept)
+    assert response.headers['Content-Type'] == f'{accept}; charset=utf-8'
+
+def test_concurrent_queries_all_parse(client, publish_app):
+    from concurrent.futures import ThreadPoolExecutor
+    queries = [f"SELECT ?s WHERE {{ ?s ?p ?o }} LIMIT {n}" for n in range(1, 41)]
+
+    def status(query):
+        response = post(publish_app.app.test_client(), query)
+        response.get_data()  # frees the query slot
+        return response.status_code
+
+    with ThreadPoolExecutor(publish_app.QUERY_GUARD.max_concurrent) as pool:
+        statuses = list(pool.map(status, queries))
+    assert statuses == [200] * len(queries)
+
+@pytest.mark.parametrize('accept', ['application/sparql-results+json', 'text/csv', 'text/tab-separated-values'])
+def test_row_limit_past_the_first_batch_returns_413(client, publish_app, monkeypatch, accept):
+    from sparql_stream import BATCH_ROWS
+    monkeypatch.setattr(publish_app.QUERY_GUARD, 'max_rows', BATCH_ROWS * 4)
+    assert post(client, ALL_TRIPLES, accept).status_code == 413
+
+def test_streamed_result_ends_with_an_error_trailer(client, publish_app, monkeypatch):
+    from sparql_stream import BATCH_ROWS
+    monkeypatch.setattr(publish_app.QUERY_GUARD, 'max_rows', BATCH_ROWS * 4)
+    monkeypatch.setattr(publish_app, 'SPARQL_BUFFER_ROWS', BATCH_ROWS)
+    response = post(client, ALL_TRIPLES)
+    assert response.status_code == 200
+    document = json.loads(response.get_data())
+    assert document['error']['status'] == 413
+    assert len(document['results']['bindings']) <= BATCH_ROWS * 4
+
+    response = post(client, ALL_TRIPLES, 'text/csv')
+    assert response.status_code == 200
+    assert response.get_data().decode('utf-8').splitlines()[-1].startswith('#error 413 ')
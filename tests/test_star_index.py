@@ -0,0 +1,14 @@
+from rdflib import Graph, Literal, Variable
+
+from star_index import CRICKET, StarIndex
+
+def test_plans_are_bounded_lru():
+    index = StarIndex(Graph())
+    index.MAX_PLANS = 3
+    shapes = [[(Variable('s'), CRICKET.forPlayer, Variable('p')),
+               (Variable('s'), CRICKET.wickets, Literal(n))] for n in range(5)]
+    plans = [index.plan(shape) for shape in shapes]
+    assert all(plan is not None for plan in plans)
+    assert len(index._plans) == 3
+    assert index.plan(shapes[-1]) is plans[-1]
+    assert tuple(shapes[0]) not in index._plans
@@ -2,31 +2,33 @@
 Validate that the RDF dataset can answer all Competency Questions
 """
 
-from rdflib import Graph
 import os
 
+from graph_snapshot import load_graph_cached
+from star_index import attach_star_index
+
 def load_graph():
     """Load the RDF graph"""
-    g = Graph()
     
     # Try to load the best available file
     if os.path.exists("bowling_stats_enhanced_linked.ttl"):
-        g.parse("bowling_stats_enhanced_linked.ttl", format="turtle")
+        g = load_graph_cached("bowling_stats_enhanced_linked.ttl")
         print("Loaded: bowling_stats_enhanced_linked.ttl")
     elif os.path.exists("bowling_stats_enhanced.ttl"):
-        g.parse("bowling_stats_enhanced.ttl", format="turtle")
+        g = load_graph_cached("bowling_stats_enhanced.ttl")
         print("Loaded: bowling_stats_enhanced.ttl")
     elif os.path.exists("bowling_stats_linked.ttl"):
-        g.parse("bowling_stats_linked.ttl", format="turtle")
+        g = load_graph_cached("bowling_stats_linked.ttl")
         print("Loaded: bowling_stats_linked.ttl")
     elif os.path.exists("bowling_stats.ttl"):
-        g.parse("bowling_stats.ttl", format="turtle")
+        g = load_graph_cached("bowling_stats.ttl")
         print("Loaded: bowling_stats.ttl")
     else:
         print("ERROR: No RDF file found!")
         return None
     
     print(f"  Total triples: {len(g)}\n")
+    attach_star_index(g)
     return g
 
 def test_competency_questions(g):
@@ -5,15 +5,16 @@ Creates a network diagram of your ontology
 
 import networkx as nx
 import matplotlib.pyplot as plt
-from rdflib import Graph, Namespace
+from rdflib import Namespace
 from rdflib.namespace import RDF, RDFS, OWL
 
+from graph_snapshot import load_graph_cached
+
 def visualize_ontology_structure():
     """Visualize the ontology class hierarchy"""
     
     print("Loading ontology...")
-    g = Graph()
-    g.parse("cricket_ontology_enhanced.ttl", format="turtle")
+    g = load_graph_cached("cricket_ontology_enhanced.ttl")
     
     # Create directed graph
     G = nx.DiGraph()
@@ -66,8 +67,7 @@ def visualize_data_relationships():
     """Visualize relationships in the actual data"""
     
     print("\nLoading data...")
-    g = Graph()
-    g.parse("bowling_stats_enhanced_linked.ttl", format="turtle")
+    g = load_graph_cached("bowling_stats_enhanced_linked.ttl")
     
     CRICKET = Namespace("http://example.org/cricket/ontology#")
     
@@ -139,8 +139,7 @@ def visualize_external_links():
     """Visualize external links to DBpedia/Wikidata"""
     
     print("\nVisualizing external links...")
-    g = Graph()
-    g.parse("bowling_stats_enhanced_linked.ttl", format="turtle")
+    g = load_graph_cached("bowling_stats_enhanced_linked.ttl")
     
     G = nx.DiGraph()
     
@@ -227,12 +226,10 @@ def print_graph_statistics():
     print("=" * 80)
     
     # Load ontology
-    g_onto = Graph()
-    g_onto.parse("cricket_ontology_enhanced.ttl", format="turtle")
+    g_onto = load_graph_cached("cricket_ontology_enhanced.ttl")
     
     # Load data
-    g_data = Graph()
-    g_data.parse("bowling_stats_enhanced_linked.ttl", format="turtle")
+    g_data = load_graph_cached("bowling_stats_enhanced_linked.ttl")
     
     # Count classes
     classes = len(list(g_onto.subjects(RDF.type, OWL.Class)))